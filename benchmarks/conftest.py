@@ -0,0 +1,61 @@
+#
+# Copyright (c) 2026 by QA Cafe.
+# All Rights Reserved.
+#
+
+import tracemalloc
+
+import pytest
+
+from cdrouter import CDRouter
+
+from .stub import StubServer
+
+pytest.importorskip('pytest_benchmark')
+
+RESULTS = 1000
+LOG_LINES = 5000
+ALERTS = 1000
+METRICS = 1000
+
+@pytest.fixture(scope='session')
+def stub():
+    with StubServer(results=RESULTS, log_lines=LOG_LINES, alerts=ALERTS, metrics=METRICS) as s:
+        yield s
+
+@pytest.fixture(scope='session')
+def slow_stub():
+    # a few milliseconds per request, roughly a CDRouter system on the
+    # local network, so concurrent fetching shows up in the timings
+    with StubServer(latency=0.005, results=RESULTS, log_lines=LOG_LINES) as s:
+        yield s
+
+@pytest.fixture
+def c(stub):
+    return CDRouter(stub.url, token='benchmark')
+
+@pytest.fixture
+def slow_c(slow_stub):
+    return CDRouter(slow_stub.url, token='benchmark')
+
+def track_memory(benchmark, fn, *args, **kwargs):
+    """Benchmark ``fn``, then run it once more under tracemalloc and
+    record its peak allocation in bytes as ``extra_info['peak_bytes']``
+    of the saved benchmark."""
+    result = benchmark(fn, *args, **kwargs)
+    tracemalloc.start()
+    try:
+        fn(*args, **kwargs)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    benchmark.extra_info['peak_bytes'] = peak
+    return result
+
+def track_throughput(benchmark, count, unit='records'):
+    """Record ``count`` items per round as ``extra_info`` of the saved
+    benchmark, along with the resulting items per second."""
+    benchmark.extra_info[unit] = count
+    stats = getattr(benchmark, 'stats', None)
+    if stats is not None and stats.stats.mean:
+        benchmark.extra_info[unit+'_per_second'] = count / stats.stats.mean
@@ -0,0 +1,73 @@
+#!/usr/bin/env python
+#
+# Copyright (c) 2026 by QA Cafe.
+# All Rights Reserved.
+#
+
+"""Measure the memory used per object by high-volume CDRouter models.
+
+Each model is compared against an equivalent class without
+``__slots__``, i.e. with a per-instance ``__dict__``.  No CDRouter
+system is needed.
+
+    python benchmarks/memory.py [-n COUNT]
+"""
+
+import argparse
+from datetime import datetime
+import gc
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from cdrouter.alerts import Alert # pylint: disable=wrong-import-position
+from cdrouter.metrics import Bandwidth, Latency, GraphMetric # pylint: disable=wrong-import-position
+from cdrouter.results import Result # pylint: disable=wrong-import-position
+from cdrouter.testresults import Line # pylint: disable=wrong-import-position
+
+NOW = datetime(2022, 8, 21, 22, 23, 6)
+
+SAMPLES = [
+    (Line, {'raw': 'raw', 'line': 54, 'prefix': 'INFO', 'name': 'cdrouter',
+            'timestamp': '22:23:06.123', 'message': 'message'}),
+    (Alert, {'id': 20220821222306, 'idx': 1, 'created': NOW, 'seq': 2, 'sid': 2100498,
+             'signature': 'GPL ATTACK_RESPONSE id check returned root'}),
+    (Bandwidth, {'timestamp': NOW, 'metric': 'bandwidth', 'bandwidth': 941.2,
+                 'bandwidth_units': 'Mbps', 'streams': 1}),
+    (Latency, {'timestamp': NOW, 'metric': 'latency', 'total_latency': 1.5,
+               'total_latency_units': 'ms'}),
+    (GraphMetric, {'timestamp': NOW, 'metric': 'throughput', 'value': 941.2,
+                   'units': 'Mbps', 'streams': 1}),
+    (Result, {'id': 20220821222306, 'created': NOW, 'updated': NOW, 'status': 'completed',
+              'tests': 4, 'pass': 3, 'fail': 1, 'tags': ['foo']}),
+]
+
+def unslotted(cls):
+    """Return a copy of model class ``cls`` without ``__slots__``."""
+    return type(cls.__name__, (object,), {'__init__': cls.__init__})
+
+def measure(cls, kwargs, count):
+    gc.collect()
+    tracemalloc.start()
+    objs = [cls(**kwargs) for _ in range(count)]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del objs
+    return size / count
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure per-object memory use of CDRouter models.')
+    parser.add_argument('-n', '--count', type=int, default=100000, help='objects to create per model')
+    args = parser.parse_args()
+
+    print('{:<12} {:>8} {:>10} {:>10} {:>8}'.format('model', 'fields', '__dict__', '__slots__', 'saved'))
+    for cls, kwargs in SAMPLES:
+        before = measure(unslotted(cls), kwargs, args.count)
+        after = measure(cls, kwargs, args.count)
+        print('{:<12} {:>8} {:>9.0f}B {:>9.0f}B {:>7.0%}'.format(
+            cls.__name__, len(cls.__slots__), before, after, 1 - after / before))
+
+if __name__ == '__main__':
+    main()
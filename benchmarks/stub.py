@@ -0,0 +1,273 @@
+#
+# Copyright (c) 2026 by QA Cafe.
+# All Rights Reserved.
+#
+
+"""Local stub of the CDRouter Web API for offline benchmarks.
+
+The stub replays recorded records rather than talking to a CDRouter
+system: results and test results come from the export in
+``tests/testdata/example.gz``, log lines, alerts and metrics from the
+JSON files in ``benchmarks/fixtures/``.  Each collection is served
+with as many records as asked for, renumbered as needed, so that list
+sizes can be scaled without recording more data.
+
+    from benchmarks.stub import StubServer
+
+    with StubServer(results=1000, log_lines=5000) as stub:
+        c = CDRouter(stub.url)
+
+By default the stub behaves like a system with Automatic Login
+enabled.  With ``auth='token'`` it answers requests without a valid
+API token with a 401 and hands out tokens from ``POST /authenticate``.
+Every request is counted in ``requests``.
+"""
+
+from collections import Counter
+import copy
+import gzip
+import json
+import os
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+FIXTURES = os.path.join(HERE, 'fixtures')
+EXPORT = os.path.join(HERE, '..', 'tests', 'testdata', 'example.gz')
+
+TIMESTAMP = '2022-08-21T22:23:06.458665-04:00'
+
+def load_fixture(name):
+    """Load a JSON file from ``benchmarks/fixtures/``."""
+    with open(os.path.join(FIXTURES, name), 'rb') as fd:
+        return json.load(fd)
+
+def load_export(path=EXPORT):
+    """Get the raw bytes and data line of a recorded export."""
+    with open(path, 'rb') as fd:
+        raw = fd.read()
+    with gzip.open(path, 'rb') as gz:
+        gz.readline()
+        data = json.loads(gz.readline())
+    return raw, data
+
+class Fixtures(object):
+    """Recorded records, scaled to the requested counts."""
+    def __init__(self, results=100, tests=None, log_lines=1000, alerts=100, metrics=100):
+        self.export, data = load_export()
+        recorded = data['results'][0]
+        result = recorded['result']
+        recorded_tests = [t['test'] for t in recorded['tests']]
+        if tests is None:
+            tests = len(recorded_tests)
+
+        first = int(result['id'])
+        self.results = []
+        for i in range(results):
+            r = dict(result, id=str(first - i))
+            self.results.append(r)
+
+        self.tests = []
+        for i in range(tests):
+            t = dict(recorded_tests[i % len(recorded_tests)], seq=str(i+1))
+            self.tests.append(t)
+
+        self.lines = []
+        recorded_lines = load_fixture('log.json')
+        for i in range(log_lines):
+            l = dict(recorded_lines[i % len(recorded_lines)], line=i+1)
+            self.lines.append(l)
+
+        alert = load_fixture('alert.json')
+        self.alerts = [dict(alert, idx=str(i+1)) for i in range(alerts)]
+        metric = load_fixture('metric.json')
+        self.metrics = [dict(metric, seq=str(i+1)) for i in range(metrics)]
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    server_version = 'cdrouter-stub'
+    # headers and body are written separately, so with Nagle's
+    # algorithm each response waits on the client's delayed ACK
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args): # pylint: disable=redefined-builtin
+        pass
+
+    def _count(self):
+        # count the request, then check that it is authorized,
+        # answering with a 401 if not
+        path = urlparse(self.path).path
+        with self.server.lock:
+            self.server.requests[(self.command, path)] += 1
+        if self.server.auth != 'token' or path == '/authenticate':
+            return True
+        authorization = self.headers.get('authorization', '')
+        if authorization.startswith('Bearer ') and authorization[len('Bearer '):] in self.server.tokens:
+            return True
+        self._error(401, 'unauthorized')
+        return False
+
+    def _send(self, body, content_type='application/json', headers=None):
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        self.send_response(200)
+        self.send_header('content-type', content_type)
+        self.send_header('content-length', str(len(body)))
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _json(self, obj):
+        self._send(json.dumps(obj, separators=(',', ':')).encode('utf-8'))
+
+    def _error(self, code, msg):
+        body = json.dumps({'timestamp': TIMESTAMP, 'error': msg}).encode('utf-8')
+        self.send_response(code)
+        self.send_header('content-type', 'application/json')
+        self.send_header('content-length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _page(self, records, query):
+        limit = int(query.get('limit', ['25'])[0])
+        page = int(query.get('page', ['1'])[0])
+        total = len(records)
+        last = max(1, (total + limit - 1) // limit)
+        links = {'first': 1, 'last': last, 'current': page, 'total': total, 'limit': limit}
+        if page < last:
+            links['next'] = page + 1
+        if page > 1:
+            links['prev'] = page - 1
+        data = records[(page-1)*limit:page*limit]
+        self._json({'timestamp': TIMESTAMP, 'data': data, 'links': links})
+
+    def _log(self, query):
+        lines = self.server.fixtures.lines
+        offset = int(query.get('offset', ['0'])[0])
+        limit = query.get('limit', ['250'])[0]
+        limit = len(lines) if limit == 'none' else int(limit)
+        self._json({'timestamp': TIMESTAMP, 'data': {
+            'offset': offset, 'limit': limit, 'total': len(lines),
+            'lines': lines[offset:offset+limit],
+        }})
+
+    def do_POST(self): # pylint: disable=invalid-name
+        if not self._count():
+            return None
+        url = urlparse(self.path)
+        self.rfile.read(int(self.headers.get('content-length') or 0))
+        if url.path != '/authenticate':
+            return self._error(404, 'no such resource')
+        query = parse_qs(url.query)
+        if query.get('password') != [StubServer.PASSWORD]:
+            return self._error(401, 'invalid username or password')
+        with self.server.lock:
+            token = 'token-{}'.format(len(self.server.issued) + 1)
+            self.server.issued.append(token)
+            self.server.tokens.add(token)
+        return self._json({'timestamp': TIMESTAMP, 'data': {'id': '1', 'name': query['username'][0], 'token': token}})
+
+    def do_GET(self): # pylint: disable=invalid-name
+        if not self._count():
+            return None
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        path = url.path[len('/api/v1/'):] if url.path.startswith('/api/v1/') else url.path
+        fixtures = self.server.fixtures
+
+        if path == 'system/hostname/':
+            return self._json({'timestamp': TIMESTAMP, 'data': {'hostname': 'cdrouter-stub'}})
+        if path == 'results/':
+            if query.get('bulk') == ['export']:
+                return self._send(fixtures.export, content_type='application/x-gzip', headers={
+                    'content-disposition': 'attachment; filename="results.gz"',
+                })
+            return self._page(fixtures.results, query)
+
+        m = re.match(r'^results/(\d+)/(?:(tests|alerts|metrics)/(?:(\d+)/(log)/)?)?$', path)
+        if m is None:
+            return self._error(404, 'no such resource')
+        rid, collection, _, log = m.groups()
+        if log:
+            return self._log(query)
+        if collection == 'tests':
+            return self._page(fixtures.tests, query)
+        if collection == 'alerts':
+            return self._page(fixtures.alerts, query)
+        if collection == 'metrics':
+            return self._page(fixtures.metrics, query)
+        for r in fixtures.results:
+            if r['id'] == rid:
+                return self._json({'timestamp': TIMESTAMP, 'data': copy.copy(r)})
+        return self._error(404, 'no such result')
+
+class StubServer(object):
+    """CDRouter Web API stub listening on a local port, serving requests
+    from a thread pool in the background.
+
+    :param latency: (optional) Seconds to sleep before answering each
+        request as a float, to mimic a remote CDRouter system.
+    :param auth: (optional) `None` to accept every request, like a
+        system with Automatic Login enabled, or ``'token'`` to answer
+        requests without a valid API token with a 401.
+    :param counts: Record counts passed to :class:`Fixtures`.
+    """
+    #: Password ``POST /authenticate`` accepts, for any username.
+    PASSWORD = 'benchmark'
+
+    def __init__(self, latency=0, auth=None, **counts):
+        self.fixtures = Fixtures(**counts)
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+        self.httpd.daemon_threads = True
+        self.httpd.fixtures = self.fixtures
+        self.httpd.latency = latency
+        self.httpd.auth = auth
+        self.httpd.lock = threading.Lock()
+        self.httpd.requests = Counter()
+        self.httpd.tokens = {'benchmark'}
+        self.httpd.issued = []
+        self.thread = None
+
+    @property
+    def requests(self):
+        """Counter of `(method, path)` tuples to the number of requests received."""
+        return self.httpd.requests
+
+    @property
+    def issued(self):
+        """Tokens handed out by ``POST /authenticate`` as a string list."""
+        return self.httpd.issued
+
+    def reset(self):
+        """Clear ``requests``."""
+        with self.httpd.lock:
+            self.httpd.requests.clear()
+
+    def expire(self):
+        """Revoke every API token, as if they had expired."""
+        with self.httpd.lock:
+            self.httpd.tokens.clear()
+
+    @property
+    def url(self):
+        """Base URL to pass to :class:`cdrouter.CDRouter`."""
+        return 'http://127.0.0.1:{}'.format(self.httpd.server_address[1])
+
+    def start(self):
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *args):
+        self.stop()
@@ -0,0 +1,74 @@
+#
+# Copyright (c) 2026 by QA Cafe.
+# All Rights Reserved.
+#
+
+import pytest
+
+from cdrouter import CDRouter
+from cdrouter.cdrouter import AUTH_MODE_AUTOMATIC, AUTH_MODE_TOKEN
+
+from .stub import StubServer
+
+HOSTNAME = ('GET', '/api/v1/system/hostname/')
+RESULTS = ('GET', '/api/v1/results/')
+AUTHENTICATE = ('POST', '/authenticate')
+
+@pytest.fixture
+def token_stub():
+    with StubServer(auth='token', results=10) as s:
+        yield s
+
+def calls(fn):
+    # wrap fn to count how many times the benchmark calls it
+    def wrapper(*args, **kwargs):
+        wrapper.count += 1
+        return fn(*args, **kwargs)
+    wrapper.count = 0
+    return wrapper
+
+@pytest.fixture(autouse=True)
+def no_env_token(monkeypatch):
+    monkeypatch.delenv('CDROUTER_API_TOKEN', raising=False)
+
+def test_automatic_login(benchmark, stub):
+    c = CDRouter(stub.url)
+    stub.reset()
+    c.results.list(limit=10)
+    assert c.auth_mode == AUTH_MODE_AUTOMATIC
+    assert stub.requests == {HOSTNAME: 1, RESULTS: 1}
+
+    # once Automatic Login is known to be enabled, each call costs a
+    # single request
+    stub.reset()
+    fn = calls(c.results.list)
+    benchmark(fn, limit=10)
+    assert stub.requests == {RESULTS: fn.count}
+
+def test_token(benchmark, token_stub):
+    c = CDRouter(token_stub.url, username='admin', password=StubServer.PASSWORD)
+    c.results.list(limit=10)
+    assert c.auth_mode == AUTH_MODE_TOKEN
+    assert token_stub.requests == {HOSTNAME: 1, AUTHENTICATE: 1, RESULTS: 1}
+
+    token_stub.reset()
+    fn = calls(c.results.list)
+    benchmark(fn, limit=10)
+    assert token_stub.requests == {RESULTS: fn.count}
+
+def test_token_expired(token_stub):
+    c = CDRouter(token_stub.url, username='admin', password=StubServer.PASSWORD)
+    c.results.list(limit=10)
+    assert token_stub.issued == ['token-1']
+
+    # an expired token costs one 401, one authentication and the retry
+    token_stub.expire()
+    token_stub.reset()
+    c.results.list(limit=10)
+    assert token_stub.issued == ['token-1', 'token-2']
+    assert c.token == 'token-2'
+    assert token_stub.requests == {AUTHENTICATE: 1, RESULTS: 2}
+
+    token_stub.reset()
+    c.results.list(limit=10)
+    assert token_stub.requests == {RESULTS: 1}
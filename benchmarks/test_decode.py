@@ -0,0 +1,55 @@
+#
+# Copyright (c) 2026 by QA Cafe.
+# All Rights Reserved.
+#
+
+import pytest
+import requests
+
+from cdrouter import CDRouter
+from cdrouter.alerts import AlertSchema
+from cdrouter.metrics import MetricSchema
+from cdrouter.results import ResultSchema
+from cdrouter.testresults import LogSchema
+
+from .conftest import track_memory, track_throughput
+
+def fetch(url, path, params):
+    resp = requests.get(url+'/api/v1/'+path, params=params)
+    resp.raise_for_status()
+    return resp
+
+@pytest.fixture(scope='module')
+def pages(stub):
+    # one recorded response per collection, decoded repeatedly so the
+    # timings leave out the HTTP round trip
+    return {
+        'results': (ResultSchema(), fetch(stub.url, 'results/', {'limit': 1000}), True),
+        'alerts': (AlertSchema(), fetch(stub.url, 'results/1/alerts/', {'limit': 1000}), True),
+        'metrics': (MetricSchema(), fetch(stub.url, 'results/1/metrics/', {'limit': 1000}), True),
+        'log': (LogSchema(), fetch(stub.url, 'results/1/tests/1/log/', {'limit': 1000}), None),
+    }
+
+MODES = {
+    'fast': {},
+    'validate': {'validate': True},
+    'raw': {'raw': True},
+    'stdlib-json': {'json_backend': 'json'},
+}
+
+@pytest.mark.parametrize('collection', ['results', 'alerts', 'metrics', 'log'])
+@pytest.mark.parametrize('mode', list(MODES))
+def test_decode(benchmark, stub, pages, collection, mode):
+    benchmark.group = 'decode-'+collection
+    c = CDRouter(stub.url, token='benchmark', **MODES[mode])
+    schema, resp, many = pages[collection]
+
+    def decode():
+        return c.decode(schema, resp, many=many, links=many is True)
+    data = track_memory(benchmark, decode)
+
+    if many:
+        data = data[0]
+    elif collection == 'log':
+        data = data['lines'] if mode == 'raw' else data.lines
+    track_throughput(benchmark, len(data))
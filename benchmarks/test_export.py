@@ -0,0 +1,35 @@
+#
+# Copyright (c) 2026 by QA Cafe.
+# All Rights Reserved.
+#
+
+import io
+
+import pytest
+
+from .conftest import track_memory, track_throughput
+
+IDS = list(range(1, 101))
+
+@pytest.mark.parametrize('chunk_size', [None, 25])
+def test_bulk_export(benchmark, c, tmp_path, chunk_size):
+    benchmark.group = 'bulk_export'
+    c.bulk_chunk_size = chunk_size
+    dest = str(tmp_path / 'export.gz')
+
+    def export():
+        return c.results.bulk_export(IDS, dest=dest)
+    track_memory(benchmark, export)
+    with open(dest, 'rb') as fd:
+        track_throughput(benchmark, len(fd.read()), unit='bytes')
+
+def test_bulk_export_memory(benchmark, c):
+    benchmark.group = 'bulk_export'
+    c.bulk_chunk_size = None
+
+    def export():
+        fd, _ = c.results.bulk_export(IDS)
+        return fd
+    fd = track_memory(benchmark, export)
+    assert isinstance(fd, io.BytesIO)
+    track_throughput(benchmark, len(fd.getvalue()), unit='bytes')
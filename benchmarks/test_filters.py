@@ -0,0 +1,39 @@
+#
+# Copyright (c) 2026 by QA Cafe.
+# All Rights Reserved.
+#
+
+import requests
+
+from cdrouter.filters import Field as field
+
+from .conftest import track_memory, track_throughput
+
+def build():
+    return [
+        str(field('id').eq(20220821222306)),
+        str(field('status').not_().eq('running')),
+        str(field('starred').eq(True)),
+        str(field('fail').gt(0)),
+        str(field('created').ge('2022-08-21T00:00:00')),
+        str(field('package_name').match('^(dhcp|ipv6)-', ignorecase=True)),
+        str(field('tags').contains('nightly', 'regression', 'lab1')),
+        str(field('tags').overlaps(*range(20))),
+        str(field('result', 'name').ne('final')),
+    ]
+
+def test_build_filters(benchmark):
+    benchmark.group = 'filters'
+    filters = track_memory(benchmark, build)
+    track_throughput(benchmark, len(filters), unit='filters')
+
+def test_encode_filters(benchmark):
+    benchmark.group = 'filters'
+    filters = build()
+
+    def encode():
+        req = requests.Request('GET', 'http://localhost/api/v1/results/',
+                               params={'filter': filters, 'type': 'inter', 'limit': 100})
+        return req.prepare().url
+    track_memory(benchmark, encode)
+    track_throughput(benchmark, len(filters), unit='filters')
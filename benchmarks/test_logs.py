@@ -0,0 +1,26 @@
+#
+# Copyright (c) 2026 by QA Cafe.
+# All Rights Reserved.
+#
+
+import pytest
+
+from .conftest import LOG_LINES, track_memory, track_throughput
+
+@pytest.mark.parametrize('concurrency', [None, 4, 8])
+def test_iter_list_log(benchmark, slow_c, concurrency):
+    benchmark.group = 'iter_list_log'
+
+    def iterate():
+        return sum(1 for _ in slow_c.tests.iter_list_log(1, 1, concurrency=concurrency))
+    assert track_memory(benchmark, iterate) == LOG_LINES
+    track_throughput(benchmark, LOG_LINES, unit='lines')
+
+@pytest.mark.parametrize('limit', [250, 1000])
+def test_iter_list_log_limit(benchmark, c, limit):
+    benchmark.group = 'iter_list_log-limit'
+
+    def iterate():
+        return sum(1 for _ in c.tests.iter_list_log(1, 1, limit=limit))
+    assert track_memory(benchmark, iterate) == LOG_LINES
+    track_throughput(benchmark, LOG_LINES, unit='lines')
@@ -0,0 +1,27 @@
+#
+# Copyright (c) 2026 by QA Cafe.
+# All Rights Reserved.
+#
+
+import pytest
+
+from .conftest import RESULTS, track_memory, track_throughput
+
+@pytest.mark.parametrize('prefetch', [None, 4, 8])
+@pytest.mark.parametrize('limit', [25, 100])
+def test_iter_results(benchmark, slow_c, limit, prefetch):
+    benchmark.group = 'iter_list-results-limit-{}'.format(limit)
+
+    def iterate():
+        return sum(1 for _ in slow_c.results.iter_list(limit=limit, prefetch=prefetch))
+    assert track_memory(benchmark, iterate) == RESULTS
+    track_throughput(benchmark, RESULTS)
+
+@pytest.mark.parametrize('limit', [25, 1000])
+def test_list_results(benchmark, c, limit):
+    benchmark.group = 'list-results'
+
+    def page():
+        return c.results.list(limit=limit)
+    data, _ = track_memory(benchmark, page)
+    track_throughput(benchmark, len(data))
@@ -8,3 +8,5 @@
 __version__ = "0.9.9"
 
 from .cdrouter import CDRouter
+from .aio import AsyncCDRouter
+from .fleet import CDRouterFleet
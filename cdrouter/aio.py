@@ -0,0 +1,576 @@
+#
+# Copyright (c) 2026 by QA Cafe.
+# All Rights Reserved.
+#
+
+"""Module for accessing the CDRouter Web API from asyncio."""
+
+import asyncio
+from collections import deque
+import inspect
+from itertools import islice
+import os
+from threading import local
+from urllib.parse import urljoin
+
+import requests
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+from requests_toolbelt.utils.user_agent import user_agent
+
+from . import __version__
+from .cdr_error import CDRouterError
+from . import cdr_json
+from .cdr_retry import RetryPolicy
+from .cdrouter import CDRouter, AUTH_MODE_AUTOMATIC, AUTH_MODE_TOKEN, AUTH_MODE_EXPIRED, _getuser_default, _getpass_default
+from .alerts import AlertsService
+from .configs import ConfigsService
+from .devices import DevicesService
+from .attachments import AttachmentsService
+from .jobs import JobsService
+from .packages import PackagesService
+from .results import ResultsService
+from .testresults import TestResultsService, _log_lines, _log_offset, _log_total, _log_window
+from .annotations import AnnotationsService
+from .captures import CapturesService
+from .highlights import HighlightsService
+from .imports import ImportsService
+from .exports import ExportsService
+from .history import HistoryService
+from .system import SystemService
+from .tags import TagsService
+from .testsuites import TestsuitesService
+from .users import UsersService, UserSchema
+
+class _Pending(BaseException):
+    """Raised by a :class:`_Transcript` when a service method makes a
+    request that has not been performed yet.  Derives from
+    BaseException so that service code catching ``Exception`` lets it
+    through.
+    """
+    def __init__(self, request): # pylint: disable=super-init-not-called
+        self.request = request
+
+class _Transcript(CDRouter):
+    """Stand-in for a :class:`cdrouter.CDRouter` object which answers
+    requests from a list of already-performed responses.
+
+    Service methods are plain blocking code, so AsyncCDRouter runs
+    them against a transcript: the first request with no recorded
+    response raises :class:`_Pending`, AsyncCDRouter performs it on
+    the event loop, appends the response and runs the method again.
+    Most service methods make a single request, so this usually
+    means one replay per call.
+    """
+    def __init__(self, client, responses): # pylint: disable=super-init-not-called
+        self.base = client.base
+        self.token = client.token
+        self.insecure = client.insecure
+        self.retries = client.retries
+        self.validate = client.validate
+        self.loads = client.loads
+        self.raw = client.raw
+        # replays must make requests one at a time, so bulk calls
+        # are never split
+        self.bulk_chunk_size = None
+        self.bulk_workers = 1
+        # responses are read in full before being replayed
+        self.retry_policy = RetryPolicy(total=0)
+        self.timeout = client.timeout
+        self.keep_alive = True
+        self.cache = None
+        self.instruments = []
+        self._local = local()
+        self.responses = responses
+        self.index = 0
+
+    def _req(self, path, method='GET', json=None, data=None, params=None, headers=None, files=None, stream=None): # pylint: disable=redefined-outer-name
+        if self.index < len(self.responses):
+            resp = self.responses[self.index]
+            self.index += 1
+            self.raise_for_status(resp)
+            return resp
+        raise _Pending({'path': path, 'method': method, 'json': json, 'data': data,
+                        'params': params, 'headers': headers, 'files': files})
+
+    def upload(self, path, fd, filename, progress=None):
+        # aiohttp streams files itself, progress is not reported
+        return self.post(path, files={'file': (filename, fd)})
+
+#: Methods of each service that AsyncService can run.  They make a
+#: fixed, small number of requests and have no other side effects, so
+#: replaying them against a :class:`_Transcript` is safe.  Generators,
+#: methods which run a scheduler or a thread pool, and methods
+#: returning objects which make requests later, such as
+#: ``testsuites.catalog``, are left out.
+SUPPORTED = {
+    AlertsService: ('all_stats', 'get', 'list'),
+    ConfigsService: ('bulk_copy', 'bulk_delete', 'bulk_edit', 'bulk_edit_testvars', 'bulk_export', 'bulk_upgrade',
+                     'check_config', 'create', 'create_testvar_group', 'delete', 'delete_testvar',
+                     'delete_testvar_group', 'edit', 'edit_shares', 'edit_testvar', 'export', 'get', 'get_by_name',
+                     'get_interfaces', 'get_networks', 'get_new', 'get_plaintext', 'get_shares', 'get_testvar',
+                     'list', 'list_testvars', 'lock', 'unlock', 'upgrade_config'),
+    DevicesService: ('bulk_copy', 'bulk_delete', 'bulk_edit', 'bulk_export', 'connect', 'create', 'delete',
+                     'disconnect', 'edit', 'edit_shares', 'export', 'get', 'get_by_name', 'get_connection',
+                     'get_shares', 'list', 'lock', 'power_off', 'power_on', 'unlock'),
+    AttachmentsService: ('create', 'delete', 'download', 'edit', 'get', 'list', 'thumbnail'),
+    JobsService: ('bulk_delete', 'bulk_launch', 'delete', 'edit', 'get', 'get_interfaces', 'launch', 'list'),
+    PackagesService: ('analyze', 'bulk_copy', 'bulk_delete', 'bulk_edit', 'bulk_export', 'create', 'delete', 'edit',
+                      'edit_shares', 'export', 'get', 'get_by_name', 'get_interfaces', 'get_shares', 'list', 'lock',
+                      'testlist_expanded', 'unlock'),
+    ResultsService: ('all_stats', 'bulk_delete', 'bulk_edit', 'bulk_export', 'delete', 'diff_stats',
+                     'download_logdir_archive', 'edit', 'edit_shares', 'export', 'get', 'get_logdir_file',
+                     'get_shares', 'get_test_metric', 'get_test_metric_arrays', 'get_test_metric_csv',
+                     'get_test_metric_frame', 'list', 'list_csv', 'list_logdir', 'list_metrics', 'list_metrics_arrays',
+                     'list_metrics_frame', 'lock', 'pause', 'pause_end_of_loop', 'pause_end_of_test', 'progress_stats',
+                     'set_stats', 'single_stats', 'stop', 'stop_end_of_loop', 'stop_end_of_test', 'summary_stats',
+                     'unlock', 'unpause', 'updates'),
+    TestResultsService: ('edit', 'get', 'get_log_plaintext', 'get_test_metric', 'get_test_metric_arrays',
+                         'get_test_metric_csv', 'get_test_metric_frame', 'list', 'list_csv', 'list_log',
+                         'list_metrics'),
+    AnnotationsService: ('create', 'create_or_edit', 'delete', 'edit', 'get', 'list'),
+    CapturesService: ('download', 'get', 'list', 'send_to_cloudshark'),
+    HighlightsService: ('create', 'create_or_edit', 'delete', 'edit', 'get', 'list'),
+    ImportsService: ('commit', 'delete', 'get', 'get_commit_request', 'list', 'stage_import_from_file',
+                     'stage_import_from_filesystem', 'stage_import_from_url'),
+    ExportsService: ('bulk_export',),
+    HistoryService: ('list',),
+    SystemService: ('check_for_lounge_upgrade', 'diagnostics', 'edit_preferences', 'get_preferences', 'hostname',
+                    'in_use_interfaces', 'info', 'interfaces', 'latest_lounge_release', 'lounge_update_license',
+                    'lounge_upgrade', 'manual_update_license', 'manual_upgrade', 'poweroff', 'reboot', 'restart',
+                    'shutdown', 'space', 'time'),
+    TagsService: ('delete', 'edit', 'get', 'list'),
+    TestsuitesService: ('get_error', 'get_group', 'get_label', 'get_module', 'get_test', 'get_testvar',
+                        'info', 'list_errors', 'list_groups', 'list_labels', 'list_modules', 'list_tests',
+                        'list_testvars', 'search', 'update'),
+    UsersService: ('bulk_copy', 'bulk_delete', 'bulk_edit', 'change_password', 'change_token', 'create', 'delete',
+                   'edit', 'get', 'get_by_name', 'list', 'lock', 'unlock'),
+}
+
+async def _imap_ordered(fn, iterable, limit):
+    # async counterpart of cdr_concurrent.imap_ordered: awaits
+    # fn(item) for each item with at most limit calls in flight,
+    # yielding results in order.  The next call is only started as a
+    # result is yielded, so a slow consumer never has more than limit
+    # results held in memory.
+    limit = max(1, int(limit))
+    it = iter(iterable)
+    pending = deque(asyncio.ensure_future(fn(item)) for item in islice(it, limit))
+    try:
+        while pending:
+            result = await pending.popleft()
+            for item in islice(it, 1):
+                pending.append(asyncio.ensure_future(fn(item)))
+            yield result
+    finally:
+        for task in pending:
+            task.cancel()
+
+class AsyncService(object):
+    """Awaitable wrapper around a CDRouter service class.  Every method of
+    the wrapped service is available as a coroutine method taking the
+    same arguments and returning the same models, for example ``await
+    c.results.get(id)``.  ``iter_list`` and ``iter_list_log`` are
+    async generators to be used with ``async for``.
+
+    Only the methods listed in ``SUPPORTED`` are available.  Getting
+    any other method, for example the generator ``iter_csv`` or
+    ``jobs.submit``, which runs a scheduler thread, raises
+    `NotImplementedError`, as does passing ``dest`` to a method which
+    downloads a file; await the call without it and write the
+    returned ``io.BytesIO`` instead.
+
+    :param client: :class:`aio.AsyncCDRouter <aio.AsyncCDRouter>` object
+    :param cls: Service class to wrap, for example :class:`results.ResultsService <results.ResultsService>`.
+    """
+    def __init__(self, client, cls):
+        self.client = client
+        self.cls = cls
+
+    def __getattr__(self, name):
+        attr = getattr(self.cls, name)
+        if not callable(attr) or name.startswith('_'):
+            return attr
+        if name not in SUPPORTED.get(self.cls, ()):
+            raise NotImplementedError('{}.{} is not supported by AsyncCDRouter, use a CDRouter object, '
+                                      'for example in a thread with asyncio.to_thread'.format(self.cls.__name__, name))
+        signature = inspect.signature(attr)
+
+        async def method(*args, **kwargs):
+            if 'dest' in signature.parameters and signature.bind(None, *args, **kwargs).arguments.get('dest') is not None:
+                raise NotImplementedError('dest is not supported by AsyncCDRouter, write the returned io.BytesIO instead')
+            return await self.client.run(lambda t: getattr(self.cls(t), name)(*args, **kwargs))
+        method.__name__ = name
+        method.__doc__ = attr.__doc__
+        return method
+
+    async def iter_list(self, *args, prefetch=None, **kwargs):
+        """Get all pages of a ``list`` call as an async generator.
+
+        :param args: Arguments that ``list`` takes.
+        :param prefetch: (optional) After the first page, fetch the remaining pages using up to this many concurrent requests as an int.
+        :param kwargs: Optional arguments that ``list`` takes.
+        """
+        list_fn = self.__getattr__('list')
+
+        data, links = await list_fn(*args, **kwargs)
+        for d in data:
+            yield d
+        if links.next is None:
+            return
+
+        if prefetch and links.last is not None:
+            async def fetch(page):
+                data, _ = await list_fn(*args, **dict(kwargs, page=page))
+                return data
+
+            pages = _imap_ordered(fetch, range(links.next, links.last+1), prefetch)
+            try:
+                async for data in pages:
+                    for d in data:
+                        yield d
+            finally:
+                await pages.aclose()
+            return
+
+        while links.next is not None:
+            kwargs.update({'page': links.next})
+            data, links = await list_fn(*args, **kwargs)
+            for d in data:
+                yield d
+
+    async def iter_list_log(self, id, seq, *args, concurrency=None, **kwargs): # pylint: disable=invalid-name,redefined-builtin
+        """Get all lines of a test result's log as an async generator.
+
+        :param id: Result ID as an int.
+        :param seq: TestResult sequence ID as an int.
+        :param args: Arguments that ``list_log`` takes.
+        :param concurrency: (optional) After the first call, fetch the rest of the log using up to this many concurrent requests as an int, see :class:`testresults.TestResultsService <testresults.TestResultsService>`.
+        :param kwargs: Optional arguments that ``list_log`` takes.
+        """
+        list_log = self.__getattr__('list_log')
+        raw = self.client.raw
+        if 'limit' not in kwargs:
+            kwargs['limit'] = 250
+
+        window = _log_window(args, kwargs) if concurrency else None
+        if window is not None:
+            logs = await list_log(id, seq, **kwargs)
+            lines = _log_lines(logs, raw)
+            if not lines:
+                return
+            for l in lines:
+                yield l
+            offset = _log_offset(lines, raw)
+
+            total = _log_total(logs, raw)
+            if total is not None:
+                async def fetch(offset):
+                    return _log_lines(await list_log(id, seq, **dict(kwargs, offset=offset)), raw)
+
+                windows = _imap_ordered(fetch, range(offset, total, window), concurrency)
+                try:
+                    async for lines in windows:
+                        for l in lines:
+                            yield l
+                        if lines:
+                            offset = _log_offset(lines, raw)
+                finally:
+                    await windows.aclose()
+            kwargs.update({'offset': offset})
+
+        while True:
+            logs = await list_log(id, seq, *args, **kwargs)
+            lines = _log_lines(logs, raw)
+            if not lines:
+                break
+            for l in lines:
+                yield l
+            kwargs.update({'offset': _log_offset(lines, raw)})
+
+class AsyncCDRouter(object):
+    """Service for accessing the CDRouter Web API from asyncio.
+    AsyncCDRouter has the same services as :class:`cdrouter.CDRouter
+    <cdrouter.CDRouter>` (``results``, ``tests``, ``jobs``, ``alerts``,
+    ...), wrapped in :class:`aio.AsyncService <aio.AsyncService>` so
+    each method is awaitable and returns the same models.  Requests
+    are made with aiohttp, which must be installed (``pip install
+    cdrouter[async]``).
+
+    Usage::
+
+      from cdrouter import AsyncCDRouter
+
+      async def main():
+          async with AsyncCDRouter('http://localhost') as c:
+              r = await c.results.get(20220821222306)
+              async for t in c.tests.iter_list(r.id):
+                  print(t.name, t.result)
+
+    :param base: Base HTTP or HTTPS URL for CDRouter system as a
+        string, optionally including a port.
+    :param token: (optional) CDRouter API token as a string.  If
+        omitted, value will be taken from CDROUTER_API_TOKEN
+        environment variable.
+    :param username: (optional) Username as string.
+    :param password: (optional) Password as string.
+    :param _getuser: (optional) Function called as ``_getuser(base)``
+        if a username is required but ``username`` is `None`.
+    :param _getpass: (optional) Function called as ``_getpass(base,
+        username)`` if a password is required but ``password`` is
+        `None`.
+    :param retries: (optional) The number of times to retry
+        authentication with the CDRouter system before giving up as
+        an int.
+    :param insecure: (optional) If bool `True` and `base` is an HTTPS
+        URL, skip certificate verification.
+    :param validate: (optional) If bool `True`, decode responses with
+        marshmallow, validating every field.
+    :param json_backend: (optional) JSON parser for response bodies,
+        see :class:`cdrouter.CDRouter <cdrouter.CDRouter>`.
+    :param raw: (optional) If bool `True`, return parsed JSON dicts and
+        lists instead of model objects.
+    :param limit: (optional) Maximum number of simultaneous
+        connections to the CDRouter system as an int.
+    :param timeout: (optional) Seconds to wait for each request as a
+        float, a `(connect, read)` tuple of floats, or `None` to wait
+        forever.
+    """
+    BASE = CDRouter.BASE
+
+    def __init__(self, base, token=None, username=None, password=None, _getuser=_getuser_default, _getpass=_getpass_default, retries=3, insecure=False, validate=False, json_backend=None, raw=False, limit=100, timeout=600.0):
+        try:
+            import aiohttp # pylint: disable=import-outside-toplevel
+        except ImportError as ie:
+            raise ImportError('AsyncCDRouter requires aiohttp, install it with "pip install cdrouter[async]"') from ie
+        self.aiohttp = aiohttp
+
+        self.base = base.rstrip('/')
+        self.token = token or os.environ.get('CDROUTER_API_TOKEN')
+        self.username = username
+        self.password = password
+        self._getuser = _getuser
+        self._getpass = _getpass
+        self.retries = retries
+        self.insecure = insecure
+        self.validate = validate
+        self.json_backend = json_backend
+        self.loads = cdr_json.get_backend(json_backend)
+        self.raw = raw
+        self.limit = limit
+        self.timeout = timeout
+
+        #: Learned auth mode of the CDRouter system, see :class:`cdrouter.CDRouter <cdrouter.CDRouter>`.
+        self.auth_mode = AUTH_MODE_TOKEN if self.token is not None else None
+        self._authenticated = False
+
+        self.session = None
+        self._auth_lock = None
+
+        #: :class:`aio.AsyncService <aio.AsyncService>` wrapping :class:`alerts.AlertsService <alerts.AlertsService>`
+        self.alerts = AsyncService(self, AlertsService)
+        #: :class:`aio.AsyncService <aio.AsyncService>` wrapping :class:`configs.ConfigsService <configs.ConfigsService>`
+        self.configs = AsyncService(self, ConfigsService)
+        #: :class:`aio.AsyncService <aio.AsyncService>` wrapping :class:`devices.DevicesService <devices.DevicesService>`
+        self.devices = AsyncService(self, DevicesService)
+        #: :class:`aio.AsyncService <aio.AsyncService>` wrapping :class:`attachments.AttachmentsService <attachments.AttachmentsService>`
+        self.attachments = AsyncService(self, AttachmentsService)
+        #: :class:`aio.AsyncService <aio.AsyncService>` wrapping :class:`jobs.JobsService <jobs.JobsService>`
+        self.jobs = AsyncService(self, JobsService)
+        #: :class:`aio.AsyncService <aio.AsyncService>` wrapping :class:`packages.PackagesService <packages.PackagesService>`
+        self.packages = AsyncService(self, PackagesService)
+        #: :class:`aio.AsyncService <aio.AsyncService>` wrapping :class:`results.ResultsService <results.ResultsService>`
+        self.results = AsyncService(self, ResultsService)
+        #: :class:`aio.AsyncService <aio.AsyncService>` wrapping :class:`testresults.TestResultsService <testresults.TestResultsService>`
+        self.tests = AsyncService(self, TestResultsService)
+        #: :class:`aio.AsyncService <aio.AsyncService>` wrapping :class:`annotations.AnnotationsService <annotations.AnnotationsService>`
+        self.annotations = AsyncService(self, AnnotationsService)
+        #: :class:`aio.AsyncService <aio.AsyncService>` wrapping :class:`captures.CapturesService <captures.CapturesService>`
+        self.captures = AsyncService(self, CapturesService)
+        #: :class:`aio.AsyncService <aio.AsyncService>` wrapping :class:`highlights.HighlightsService <highlights.HighlightsService>`
+        self.highlights = AsyncService(self, HighlightsService)
+        #: :class:`aio.AsyncService <aio.AsyncService>` wrapping :class:`imports.ImportsService <imports.ImportsService>`
+        self.imports = AsyncService(self, ImportsService)
+        #: :class:`aio.AsyncService <aio.AsyncService>` wrapping :class:`exports.ExportsService <exports.ExportsService>`
+        self.exports = AsyncService(self, ExportsService)
+        #: :class:`aio.AsyncService <aio.AsyncService>` wrapping :class:`history.HistoryService <history.HistoryService>`
+        self.history = AsyncService(self, HistoryService)
+        #: :class:`aio.AsyncService <aio.AsyncService>` wrapping :class:`system.SystemService <system.SystemService>`
+        self.system = AsyncService(self, SystemService)
+        #: :class:`aio.AsyncService <aio.AsyncService>` wrapping :class:`tags.TagsService <tags.TagsService>`
+        self.tags = AsyncService(self, TagsService)
+        #: :class:`aio.AsyncService <aio.AsyncService>` wrapping :class:`testsuites.TestsuitesService <testsuites.TestsuitesService>`
+        self.testsuites = AsyncService(self, TestsuitesService)
+        #: :class:`aio.AsyncService <aio.AsyncService>` wrapping :class:`users.UsersService <users.UsersService>`
+        self.users = AsyncService(self, UsersService)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    async def close(self):
+        """Close the underlying aiohttp session."""
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    async def run(self, fn):
+        """Run blocking service code against this client.  ``fn`` is called
+        with a :class:`cdrouter.CDRouter <cdrouter.CDRouter>`-like
+        object and is re-run each time it makes a request that has not
+        been performed yet, so it must not have side effects other
+        than its requests.
+
+        :param fn: Function taking a single argument.
+        :return: Return value of ``fn``.
+        """
+        responses = []
+        while True:
+            try:
+                return fn(_Transcript(self, responses))
+            except _Pending as p:
+                responses.append(await self._req(**p.request))
+
+    # base request methods
+    def _session(self):
+        if self.session is None:
+            self.session = self.aiohttp.ClientSession(
+                connector=self.aiohttp.TCPConnector(limit=self.limit, ssl=(False if self.insecure else None)),
+                timeout=self._client_timeout())
+        return self.session
+
+    def _client_timeout(self):
+        if isinstance(self.timeout, tuple):
+            connect, read = self.timeout
+            return self.aiohttp.ClientTimeout(total=None, sock_connect=connect, sock_read=read)
+        return self.aiohttp.ClientTimeout(total=self.timeout)
+
+    @staticmethod
+    def _params(params):
+        # encode like requests does: drop None values, repeat keys
+        # for list values and str() everything else
+        if params is None:
+            return []
+        pairs = []
+        for k, v in params.items():
+            if v is None:
+                continue
+            if isinstance(v, (str, bytes)) or not hasattr(v, '__iter__'):
+                v = [v]
+            pairs.extend((k, str(x)) for x in v if x is not None)
+        return pairs
+
+    async def _send(self, path, method='GET', json=None, data=None, params=None, headers=None, files=None, token=None): # pylint: disable=redefined-outer-name
+        if headers is None:
+            headers = {}
+        headers = dict(headers)
+        headers.update({'user-agent': user_agent('cdrouter.py', __version__)})
+        if token is not None:
+            headers['authorization'] = 'Bearer ' + token
+
+        if files:
+            data = self.aiohttp.FormData()
+            for name, (filename, fd) in files.items():
+                data.add_field(name, fd, filename=filename)
+
+        url = urljoin(self.base+self.BASE, path)
+        async with self._session().request(method, url, params=self._params(params), headers=headers,
+                                           json=json, data=data) as r:
+            content = await r.read()
+
+            resp = requests.Response()
+            resp.status_code = r.status
+            resp.reason = r.reason
+            resp.headers = CaseInsensitiveDict(r.headers)
+            resp.encoding = get_encoding_from_headers(resp.headers)
+            resp.url = str(r.url)
+            resp._content = content # pylint: disable=protected-access
+            resp._content_consumed = True # pylint: disable=protected-access
+            return resp
+
+    async def _learn_token(self):
+        if self._auth_lock is None:
+            self._auth_lock = asyncio.Lock()
+
+        async with self._auth_lock:
+            if self.token is None and self.auth_mode is None:
+                # if API request with no token returns a 401, automatic
+                # login is disabled and user needs to authenticate
+                resp = await self._send('system/hostname/')
+                if resp.status_code != 401:
+                    self.auth_mode = AUTH_MODE_AUTOMATIC
+
+        if self.token is None and self.auth_mode != AUTH_MODE_AUTOMATIC:
+            await self.authenticate(self.retries)
+        return self.token
+
+    def _unauthorized(self, token):
+        # update auth_mode after a 401 response to a request made
+        # with token, returns bool True if it should be retried
+        if token is None:
+            self.auth_mode = None
+            return True
+        if token != self.token:
+            return True
+        self.auth_mode = AUTH_MODE_EXPIRED
+        if self._authenticated:
+            self.token = None
+            return True
+        return False
+
+    async def _req(self, path, method='GET', json=None, data=None, params=None, headers=None, files=None): # pylint: disable=redefined-outer-name
+        for attempt in range(2):
+            token = self.token
+            if token is None and self.auth_mode != AUTH_MODE_AUTOMATIC:
+                token = await self._learn_token()
+
+            resp = await self._send(path, method=method, json=json, data=data, params=params, headers=headers, files=files, token=token)
+            if resp.status_code != 401 or attempt > 0 or files or not self._unauthorized(token):
+                break
+
+        CDRouter.raise_for_status(resp)
+        return resp
+
+    async def authenticate(self, retries=3):
+        """Set API token by authenticating via username/password.
+
+        :param retries: Number of authentication retries to make before giving up as an int.
+        :return: Learned API token
+        :rtype: string
+        """
+        if self._auth_lock is None:
+            self._auth_lock = asyncio.Lock()
+
+        async with self._auth_lock:
+            if self.token is not None:
+                return self.token
+
+            username = self.username or self._getuser(self.base)
+            password = self.password
+
+            attempts = 1 + retries
+
+            while attempts > 0:
+                if password is None:
+                    password = self._getpass(self.base, username)
+
+                try:
+                    resp = await self._send(self.base+'/authenticate', method='POST', params={'username': username, 'password': password})
+                    CDRouter.raise_for_status(resp)
+
+                    u = await self.run(lambda t, resp=resp: t.decode(UserSchema(), resp, raw=False))
+
+                    if u.token is not None:
+                        self.token = u.token
+                        self.auth_mode = AUTH_MODE_TOKEN
+                        self._authenticated = True
+                        break
+                except CDRouterError as cde:
+                    password = None
+                    attempts -= 1
+                    if attempts == 0:
+                        raise cde
+
+        return self.token
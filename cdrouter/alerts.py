@@ -41,6 +41,11 @@ class Alert(object):
     :param src_ip: (optional) Alert source IP as a string.
     :param src_port: (optional) Alert source port as an int.
     """
+    __slots__ = ('id', 'idx', 'created', 'updated', 'seq', 'loop', 'test_name', 'test_description',
+                 'category', 'description', 'dest_ip', 'dest_port', 'interface', 'payload',
+                 'payload_ascii', 'payload_hex', 'proto', 'references', 'rev', 'rule', 'rule_set',
+                 'severity', 'sid', 'signature', 'src_ip', 'src_port')
+
     def __init__(self, **kwargs):
         self.id = kwargs.get('id', None)
         self.idx = kwargs.get('idx', None)
@@ -327,6 +332,7 @@ class AlertsService(object):
         :param id: Result ID as an int.
         :param args: Arguments that ``list`` takes.
         :param kwargs: Optional arguments that ``list`` takes.
+        :param prefetch: (optional) After the first page, fetch the remaining pages using up to this many concurrent requests as an int.
         :return: :class:`alerts.Alert <alerts.Alert>` list
 
         """
@@ -96,6 +96,7 @@ class AttachmentsService(object):
         :param id: Device ID as an int.
         :param args: Arguments that ``list`` takes.
         :param kwargs: Optional arguments that ``list`` takes.
+        :param prefetch: (optional) After the first page, fetch the remaining pages using up to this many concurrent requests as an int.
         :return: :class:`attachments.Attachment <attachments.Attachment>` list
 
         """
@@ -114,18 +115,18 @@ class AttachmentsService(object):
         resp = self.service.get_id(self._base(id), attid)
         return self.service.decode(schema, resp)
 
-    def create(self, id, fd, filename='attachment-name'): # pylint: disable=invalid-name,redefined-builtin
+    def create(self, id, fd, filename='attachment-name', progress=None): # pylint: disable=invalid-name,redefined-builtin
         """Add an attachment to a device.
 
         :param id: Device ID as an int.
         :param fd: File-like object to upload.
         :param filename: (optional) Name to use for new attachment as a string.
+        :param progress: (optional) Function called as ``progress(nbytes, total)`` as the file is uploaded, see :func:`cdrouter.CDRouter.upload <cdrouter.CDRouter.upload>`.
         :return: :class:`attachments.Attachment <attachments.Attachment>` object
         :rtype: attachments.Attachment
         """
         schema = AttachmentSchema()
-        resp = self.service.post(self._base(id),
-                                 files={'file': (filename, fd)})
+        resp = self.service.upload(self._base(id), fd, filename, progress=progress)
         return self.service.decode(schema, resp)
 
     def download(self, id, attid): # pylint: disable=invalid-name,redefined-builtin
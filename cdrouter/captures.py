@@ -5,12 +5,19 @@
 
 """Module for accessing CDRouter Captures."""
 
+from collections import namedtuple
 import io
+import os
+import time
 
+from requests.exceptions import RequestException
 from requests_toolbelt.downloadutils import stream
 from marshmallow import Schema, post_load, EXCLUDE
 from marshmallow import fields as mfields
 
+from .cdr_concurrent import imap_ordered
+from .testresults import TestResultSchema
+
 class Capture(object):
     """Model for CDRouter Captures.
 
@@ -59,6 +66,56 @@ class CloudSharkSchema(Schema):
     def post_load(self, data, **kwargs): # pylint: disable=unused-argument
         return CloudShark(**data)
 
+class CaptureFile(namedtuple('CaptureFile', ['seq', 'interface', 'path', 'nbytes', 'skipped', 'error'])):
+    """Named tuple for one capture of a :func:`captures.CapturesService.download_all
+    <captures.CapturesService.download_all>` call.
+
+    :param seq: TestResult sequence ID as an int.
+    :param interface: Interface name as string, or `None` if listing the test result's captures failed.
+    :param path: Path of the PCAP file on disk as a string, or `None` if the download failed.
+    :param nbytes: Bytes downloaded as an int, `0` if skipped.
+    :param skipped: Bool `True` if the file was already present with the same size.
+    :param error: Exception raised, or `None` if the capture was downloaded or skipped.
+    """
+
+class CaptureReport(object):
+    """Class representing the outcome of a :func:`captures.CapturesService.download_all
+    <captures.CapturesService.download_all>` call.
+
+    :param files: :class:`captures.CaptureFile <captures.CaptureFile>` list, in test result order.
+    :param elapsed: Seconds the call took as a float.
+    """
+    def __init__(self, files, elapsed):
+        self.files = files
+        self.elapsed = elapsed
+
+    @property
+    def downloaded(self):
+        """:class:`captures.CaptureFile <captures.CaptureFile>` list of the captures downloaded."""
+        return [x for x in self.files if x.error is None and not x.skipped]
+
+    @property
+    def skipped(self):
+        """:class:`captures.CaptureFile <captures.CaptureFile>` list of the captures already present."""
+        return [x for x in self.files if x.skipped]
+
+    @property
+    def errors(self):
+        """:class:`captures.CaptureFile <captures.CaptureFile>` list of the captures that failed."""
+        return [x for x in self.files if x.error is not None]
+
+    @property
+    def nbytes(self):
+        """Bytes downloaded as an int."""
+        return sum(x.nbytes for x in self.files)
+
+    @property
+    def throughput(self):
+        """Bytes downloaded per second as a float."""
+        if not self.elapsed:
+            return 0.0
+        return self.nbytes / self.elapsed
+
 class CapturesService(object):
     """Service for accessing CDRouter Captures."""
 
@@ -115,6 +172,94 @@ class CapturesService(object):
         b.seek(0)
         return (b, self.service.filename(resp))
 
+    def download_all(self, id, dest, filter=None, type=None, inline=False, workers=4, progress=None): # pylint: disable=invalid-name,redefined-builtin
+        """Download the captures of every test result of a result to a
+        directory, as ``dest/<seq>/<filename>``.  Test results'
+        captures are listed, then downloaded, using up to ``workers``
+        concurrent requests, with each file streamed straight to disk.
+        Files already present with the size the CDRouter system sends
+        are skipped, so an interrupted call can be run again.
+
+        A capture that fails to download does not stop the others;
+        failures are reported in the returned
+        :class:`captures.CaptureReport <captures.CaptureReport>`.
+
+        Usage::
+
+          report = c.captures.download_all(r.id, 'pcaps', filter=[field('result').eq('fail')])
+          print('{} files, {:.1f} MB/s'.format(len(report.downloaded), report.throughput / 1e6))
+          for f in report.errors:
+              print(f.seq, f.interface, f.error)
+
+        :param id: Result ID as an int.
+        :param dest: Directory to write to as a string, created if missing.
+        :param filter: (optional) Filters selecting test results as a string list.
+        :param type: (optional) `union` or `inter` as string.
+        :param inline: (optional) Use inline version of capture files.
+        :param workers: (optional) Maximum number of concurrent requests as an int.
+        :param progress: (optional) Function called with each
+            :class:`captures.CaptureFile <captures.CaptureFile>` as
+            it completes.
+        :return: :class:`captures.CaptureReport <captures.CaptureReport>` object
+        :rtype: captures.CaptureReport
+        """
+        start = time.monotonic()
+
+        # test results and captures are always decoded into models,
+        # even if the client returns raw dicts
+        def list_tests(page=None):
+            resp = self.service.list('results/'+str(id)+'/tests/', filter, type, page=page)
+            return self.service.decode(TestResultSchema(), resp, many=True, links=True, raw=False)
+        seqs = [t.seq for t in self.service.iter_list(list_tests)]
+
+        def discover(seq):
+            try:
+                resp = self.service.list(self._base(id, seq))
+                caps = self.service.decode(CaptureSchema(exclude=('id', 'seq')), resp, many=True, raw=False)
+                return [(seq, x.interface, None) for x in caps]
+            except RequestException as e:
+                return [(seq, None, e)]
+
+        def fetch(item):
+            seq, intf, error = item
+            if error is None:
+                f = self._download_to(id, seq, intf, dest, inline)
+            else:
+                f = CaptureFile(seq, intf, None, 0, False, error)
+            if progress is not None:
+                progress(f)
+            return f
+
+        items = [x for caps in imap_ordered(discover, seqs, workers) for x in caps]
+        files = list(imap_ordered(fetch, items, workers))
+        return CaptureReport(files, time.monotonic() - start)
+
+    def _download_to(self, id, seq, intf, dest, inline): # pylint: disable=invalid-name,redefined-builtin
+        part = None
+        try:
+            resp = self.service.get_id(self._base(id, seq), intf, params={'format': 'cap', 'inline': inline}, stream=True)
+            filename = os.path.basename(self.service.filename(resp, '{}.pcap'.format(intf)))
+            d = os.path.join(dest, str(seq))
+            os.makedirs(d, exist_ok=True)
+            path = os.path.join(d, filename)
+
+            size = resp.headers.get('content-length')
+            if size is not None and os.path.isfile(path) and os.path.getsize(path) == int(size):
+                resp.close()
+                return CaptureFile(seq, intf, path, 0, True, None)
+
+            # written under another name until complete, so that an
+            # interrupted download is never taken for a finished one
+            part = path + '.part'
+            self.service.download(resp, dest=part)
+            nbytes = os.path.getsize(part)
+            os.replace(part, path)
+            return CaptureFile(seq, intf, path, nbytes, False, None)
+        except (RequestException, OSError) as e:
+            if part is not None and os.path.exists(part):
+                os.remove(part)
+            return CaptureFile(seq, intf, None, 0, False, e)
+
     def send_to_cloudshark(self, id, seq, intf, inline=False): # pylint: disable=invalid-name,redefined-builtin
         """Send a capture to a CloudShark Appliance. Both
         cloudshark_appliance_url and cloudshark_appliance_token must
@@ -0,0 +1,209 @@
+#
+# Copyright (c) 2026 by QA Cafe.
+# All Rights Reserved.
+#
+
+"""Module for caching CDRouter Web API responses."""
+
+from collections import OrderedDict
+import copy
+from threading import Lock
+import time
+
+import requests
+
+#: Default TTLs in seconds of :class:`cdr_cache.ResponseCache
+#: <cdr_cache.ResponseCache>`, keyed by path prefix.
+DEFAULT_TTLS = {
+    'testsuites/': 3600,
+    'configs/': 300,
+    'packages/': 300,
+}
+
+class _Entry(object):
+    def __init__(self, resp, expires):
+        self.status_code = resp.status_code
+        self.headers = copy.copy(resp.headers)
+        self.content = resp.content
+        self.encoding = resp.encoding
+        self.url = resp.url
+        self.reason = resp.reason
+        self.expires = expires
+
+    @property
+    def validators(self):
+        headers = {}
+        if 'etag' in self.headers:
+            headers['if-none-match'] = self.headers['etag']
+        if 'last-modified' in self.headers:
+            headers['if-modified-since'] = self.headers['last-modified']
+        return headers
+
+    def response(self):
+        resp = requests.Response()
+        resp.status_code = self.status_code
+        resp.headers = copy.copy(self.headers)
+        resp._content = self.content # pylint: disable=protected-access
+        resp._content_consumed = True # pylint: disable=protected-access
+        resp.encoding = self.encoding
+        resp.url = self.url
+        resp.reason = self.reason
+        return resp
+
+class ResponseCache(object):
+    """LRU cache of GET responses for a :class:`cdrouter.CDRouter
+    <cdrouter.CDRouter>` object, passed as its ``cache`` argument.
+
+    A cached response is returned without contacting the CDRouter
+    system until its TTL expires.  After that, if the response had an
+    ``ETag`` or ``Last-Modified`` header, the request is made with
+    ``If-None-Match``/``If-Modified-Since`` and a ``304 Not
+    Modified`` answer renews the cached response.
+
+    Any other request made by the client, for example an ``edit``,
+    ``delete`` or ``bulk_*`` call, drops cached responses for its
+    path, for paths below it and for the collections above it, so
+    that editing ``configs/5/`` drops ``configs/5/``,
+    ``configs/5/testvars/`` and ``configs/``.  Changes made by other
+    clients, or side effects on other resources, are only seen once
+    the TTL expires.
+
+    Usage::
+
+      from cdrouter import CDRouter
+      from cdrouter.cdr_cache import ResponseCache
+
+      c = CDRouter('http://localhost', cache=ResponseCache())
+      # or with custom TTLs
+      c = CDRouter('http://localhost', cache=ResponseCache(ttls={
+          'testsuites/': 86400,
+          'devices/': 60,
+      }))
+
+    :param ttl: (optional) Seconds a response is fresh for as an int
+        or float, for paths not matching ``ttls``.  If `0` or `None`,
+        such responses are not cached.
+    :param ttls: (optional) Dict of path prefix strings, for example
+        ``'testsuites/'``, to TTLs overriding ``ttl``.  The longest
+        matching prefix wins.  Defaults to ``DEFAULT_TTLS``, caching
+        testsuite metadata for an hour and configs and packages for
+        five minutes.
+    :param maxsize: (optional) Maximum number of cached responses as an int.
+    :param maxbytes: (optional) Responses larger than this many bytes
+        are not cached, as an int.
+    """
+    def __init__(self, ttl=0, ttls=None, maxsize=256, maxbytes=4*1024*1024):
+        if ttls is None:
+            ttls = DEFAULT_TTLS
+        self.ttl = ttl
+        self.ttls = sorted(ttls.items(), key=lambda x: len(x[0]), reverse=True)
+        self.maxsize = maxsize
+        self.maxbytes = maxbytes
+        self.entries = OrderedDict()
+        self.lock = Lock()
+
+        #: Count of responses answered from the cache without a request as an int.
+        self.hits = 0
+        #: Count of responses renewed by a ``304 Not Modified`` answer as an int.
+        self.revalidations = 0
+        #: Count of requests not answered from the cache as an int.
+        self.misses = 0
+
+    @staticmethod
+    def _path(path):
+        return path.lstrip('/')
+
+    @staticmethod
+    def _key(path, params):
+        items = []
+        for k, v in sorted((params or {}).items()):
+            if v is not None:
+                items.append((k, repr(v)))
+        return (ResponseCache._path(path), tuple(items))
+
+    def ttl_for(self, path):
+        """Get the TTL for a path.
+
+        :param path: Request path as a string, for example ``'testsuites/1/tests/'``.
+        :return: TTL in seconds, or `None` if responses for ``path`` are not cached.
+        """
+        path = self._path(path)
+        for prefix, ttl in self.ttls:
+            if path.startswith(prefix):
+                return ttl or None
+        return self.ttl or None
+
+    def lookup(self, path, params):
+        """Get a cached response.
+
+        :param path: Request path as a string.
+        :param params: Request parameters as a dict.
+        :return: Tuple `(resp, headers)`.  ``resp`` is a fresh cached
+            `requests.Response` or `None`, ``headers`` a dict of
+            conditional request headers to send if ``resp`` is `None`.
+        """
+        if self.ttl_for(path) is None:
+            return None, {}
+        key = self._key(path, params)
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None, {}
+            self.entries.move_to_end(key)
+            if entry.expires > time.monotonic():
+                self.hits += 1
+                return entry.response(), {}
+            self.misses += 1
+            return None, entry.validators
+
+    def store(self, path, params, resp):
+        """Cache a response, or renew the cached response if ``resp`` is
+        a ``304 Not Modified`` answer.
+
+        :param path: Request path as a string.
+        :param params: Request parameters as a dict.
+        :param resp: `requests.Response` object
+        :return: `requests.Response` to hand to the caller, or `None`
+            if ``resp`` is a ``304 Not Modified`` answer for a
+            response no longer cached, in which case the request must
+            be made again without conditional headers.
+        """
+        ttl = self.ttl_for(path)
+        if ttl is None:
+            return None if resp.status_code == 304 else resp
+        key = self._key(path, params)
+        expires = time.monotonic() + ttl
+
+        with self.lock:
+            if resp.status_code == 304:
+                entry = self.entries.get(key)
+                if entry is None:
+                    return None
+                entry.expires = expires
+                self.revalidations += 1
+                return entry.response()
+
+            if resp.status_code != 200 or len(resp.content) > self.maxbytes:
+                return resp
+
+            self.entries[key] = _Entry(resp, expires)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+        return resp
+
+    def invalidate(self, path=None):
+        """Drop cached responses for a path, the paths below it and the
+        collections above it.
+
+        :param path: (optional) Request path as a string.  If `None`, drop all cached responses.
+        """
+        with self.lock:
+            if path is None:
+                self.entries.clear()
+                return
+            path = self._path(path)
+            for key in list(self.entries):
+                if key[0].startswith(path) or path.startswith(key[0]):
+                    del self.entries[key]
@@ -0,0 +1,115 @@
+#
+# Copyright (c) 2026 by QA Cafe.
+# All Rights Reserved.
+#
+
+"""Module for decoding CDRouter Web API list responses into columns.
+
+Rather than building a model object per row, each field of a schema
+becomes a NumPy array holding that field for every row.  numpy is
+required (``pip install cdrouter[numpy]``), and pandas for data frames
+(``pip install cdrouter[pandas]``).
+
+Columns are typed by their schema field: ``DateTime`` fields become
+``datetime64[us]`` arrays in UTC (missing or invalid values are
+``NaT``), ``Float`` fields become ``float64`` arrays (missing values
+are ``nan``), ``Int`` fields become ``int64`` arrays, or ``float64``
+if any value is missing, and lists of numbers become 2-D arrays when
+every row has the same length.  All other fields are ``object``
+arrays.
+"""
+
+from datetime import datetime, timedelta
+
+from marshmallow import fields
+
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+def _numpy():
+    try:
+        import numpy # pylint: disable=import-outside-toplevel,import-error
+    except ImportError as ie:
+        raise ImportError('array loaders require numpy, install it with "pip install cdrouter[numpy]"') from ie
+    return numpy
+
+def _pandas():
+    try:
+        import pandas # pylint: disable=import-outside-toplevel,import-error
+    except ImportError as ie:
+        raise ImportError('frame loaders require pandas, install it with "pip install cdrouter[pandas]"') from ie
+    return pandas
+
+def _datetime_column(np, field, values):
+    parse = fields.DateTime.DESERIALIZATION_FUNCS.get(field.format or field.DEFAULT_FORMAT)
+    out = np.empty(len(values), dtype='int64')
+    nat = np.iinfo('int64').min
+    for i, value in enumerate(values):
+        try:
+            dt = parse(value)
+            offset = dt.utcoffset()
+            if offset is not None:
+                dt = dt.replace(tzinfo=None) - offset
+            out[i] = (dt - _EPOCH) // _MICROSECOND
+        except (TypeError, AttributeError, ValueError, OverflowError):
+            out[i] = nat
+    return out.view('datetime64[us]')
+
+def _number_column(np, values, dtype):
+    if None in values:
+        return np.array([np.nan if v is None else v for v in values], dtype='float64')
+    return np.array(values, dtype=dtype)
+
+def _list_column(np, field, values):
+    if isinstance(field.inner, (fields.Integer, fields.Float)):
+        try:
+            return np.array(values, dtype='int64' if isinstance(field.inner, fields.Integer) else 'float64')
+        except (TypeError, ValueError):
+            # ragged or missing rows
+            pass
+    out = np.empty(len(values), dtype=object)
+    out[:] = values
+    return out
+
+def _column(np, field, values):
+    if isinstance(field, fields.DateTime):
+        return _datetime_column(np, field, values)
+    if isinstance(field, fields.Float):
+        return _number_column(np, values, 'float64')
+    if isinstance(field, fields.Integer):
+        return _number_column(np, values, 'int64')
+    if isinstance(field, fields.List):
+        return _list_column(np, field, values)
+    out = np.empty(len(values), dtype=object)
+    out[:] = values
+    return out
+
+def arrays(schema, rows):
+    """Decode ``rows`` into a dict of columns according to ``schema``.
+
+    :param schema: marshmallow ``Schema`` object.
+    :param rows: Parsed JSON dicts as a list.
+    :return: Dict of field names to `numpy.ndarray` columns.
+    """
+    np = _numpy()
+    columns = {}
+    for name, field in schema.load_fields.items():
+        key = field.data_key if field.data_key is not None else name
+        attr = field.attribute if field.attribute is not None else name
+        columns[attr] = _column(np, field, [row.get(key) for row in rows])
+    return columns
+
+def frame(schema, rows):
+    """Decode ``rows`` into a data frame according to ``schema``.
+
+    :param schema: marshmallow ``Schema`` object.
+    :param rows: Parsed JSON dicts as a list.
+    :return: `pandas.DataFrame` with one column per field.
+    """
+    pd = _pandas()
+    columns = arrays(schema, rows)
+    for name, column in columns.items():
+        if column.ndim > 1:
+            # one list per cell
+            columns[name] = list(column)
+    return pd.DataFrame(columns)
@@ -0,0 +1,37 @@
+#
+# Copyright (c) 2026 by QA Cafe.
+# All Rights Reserved.
+#
+
+"""Module for running CDRouter Web API requests concurrently."""
+
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+
+def imap_ordered(fn, iterable, workers):
+    """Call ``fn`` on each item of ``iterable`` using a pool of at most
+    ``workers`` threads, yielding return values in the order of
+    ``iterable``.  At most ``workers`` calls are in flight at any one
+    time, so results that complete early are held until their turn
+    comes.
+
+    :param fn: Function to call with a single item.
+    :param iterable: Items to pass to ``fn``.
+    :param workers: Maximum number of concurrent calls as an int.
+    """
+    workers = max(1, int(workers))
+    it = iter(iterable)
+    pending = deque()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        try:
+            for item in islice(it, workers):
+                pending.append(pool.submit(fn, item))
+            while pending:
+                result = pending.popleft().result()
+                for item in islice(it, 1):
+                    pending.append(pool.submit(fn, item))
+                yield result
+        finally:
+            for f in pending:
+                f.cancel()
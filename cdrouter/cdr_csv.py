@@ -0,0 +1,116 @@
+#
+# Copyright (c) 2026 by QA Cafe.
+# All Rights Reserved.
+#
+
+"""Module for streaming CSV list responses from the CDRouter Web API.
+
+Rows are parsed as the response body arrives, so the first rows are
+available before the download finishes and memory use does not grow
+with the number of rows.  Typed rows are named tuples whose values
+are converted according to the columns' schema fields, like the
+models of a JSON ``list`` call: ``Int``, ``Float``, ``Bool`` and
+``DateTime`` columns become ints, floats, bools and datetimes, and
+empty cells become `None`.  Columns not in the schema, and list or
+nested columns, are left as strings.
+"""
+
+from collections import namedtuple
+import csv
+import io
+import re
+
+from marshmallow import fields
+from marshmallow.exceptions import ValidationError
+
+from .cdr_decoder import _converter
+
+def _encoding(resp):
+    # CSV responses without a charset are UTF-8, not the ISO-8859-1
+    # requests assumes for text/* types
+    m = re.search(r'charset=["\']?([\w-]+)', resp.headers.get('content-type', ''))
+    if m is not None:
+        return m.group(1)
+    return 'utf-8'
+
+def _cell_converter(field):
+    if field is None or isinstance(field, (fields.List, fields.Dict, fields.Nested)):
+        return None
+    convert = _converter(field)
+
+    def cell(value):
+        if value == '':
+            return None
+        try:
+            return convert(value)
+        except (TypeError, ValueError, ValidationError):
+            return value
+    return cell
+
+def row_type(schema, header, name='Row'):
+    """Get a function which converts a CSV row into a named tuple.
+
+    :param schema: marshmallow ``Schema`` object whose fields type the columns.
+    :param header: Column names as a string list.
+    :param name: (optional) Name of the named tuple class as a string.
+    :return: Function taking a string list and returning a named tuple.
+        Its ``cls`` attribute is the named tuple class, whose fields
+        are the schema's field names for columns in ``schema``, for
+        example ``passed`` for the ``pass`` column, else the column
+        names, renamed to ``_0``, ``_1``, ... if not valid identifiers.
+    """
+    by_key = {}
+    for key, field in schema.load_fields.items():
+        by_key[field.data_key if field.data_key is not None else key] = (key, field)
+    # columns in the schema are named like the model's attributes, so
+    # that 'pass' becomes 'passed'
+    names = [by_key[column][0] if column in by_key else column for column in header]
+    cls = namedtuple(name, names, rename=True)
+    converters = [(i, _cell_converter(by_key.get(column, (None, None))[1])) for i, column in enumerate(header)]
+    converters = [(i, convert) for i, convert in converters if convert is not None]
+
+    def make(row):
+        row = list(row)
+        for i, convert in converters:
+            if i < len(row):
+                row[i] = convert(row[i])
+        if len(row) < len(header):
+            row.extend([None] * (len(header) - len(row)))
+        return cls(*row[:len(header)])
+    make.cls = cls
+    return make
+
+def iter_rows(resp, schema=None, name='Row'):
+    """Parse a streaming CSV response row by row, closing it once all
+    rows are read or the generator is closed.
+
+    :param resp: Streaming response as a ``requests.Response`` object.
+    :param schema: (optional) marshmallow ``Schema`` object.  If set,
+        rows are named tuples converted according to ``schema``,
+        else dicts of column names to strings.
+    :param name: (optional) Name of the named tuple class as a string.
+    :return: Generator of dicts or named tuples.
+    """
+    try:
+        if resp.raw is None:
+            # body already read, for example by AsyncCDRouter
+            text = io.StringIO(resp.content.decode(_encoding(resp)), newline='')
+        else:
+            resp.raw.decode_content = True
+            # else urllib3 reports the body closed once read, which
+            # TextIOWrapper takes as an error rather than EOF
+            resp.raw.auto_close = False
+            text = io.TextIOWrapper(resp.raw, encoding=_encoding(resp), newline='')
+        reader = csv.reader(text)
+        header = next(reader, None)
+        if header is None:
+            return
+        if schema is not None:
+            make = row_type(schema, header, name=name)
+            for row in reader:
+                yield make(row)
+            return
+        for row in reader:
+            yield dict(zip(header, row))
+    finally:
+        resp.close()
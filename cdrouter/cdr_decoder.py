@@ -0,0 +1,188 @@
+#
+# Copyright (c) 2026 by QA Cafe.
+# All Rights Reserved.
+#
+
+"""Module for quickly decoding CDRouter Web API responses into models.
+
+marshmallow validates every field of every object it loads, which
+dominates the time spent decoding large ``list`` responses.  This
+module compiles a marshmallow schema into a plain function which
+applies the same conversions (``Int``, ``Float``, ``Bool``,
+``DateTime`` with its ``datetime.min`` fallback, ``List``, ``Dict``
+and ``Nested`` fields, ``data_key``/``attribute`` renames and
+``load_default`` values) and then calls the schema's ``post_load``
+hook to construct the model.  Values are converted but not
+validated; :class:`cdrouter.CDRouter <cdrouter.CDRouter>` objects
+created with ``validate=True`` use marshmallow instead.
+"""
+
+from datetime import datetime
+
+from marshmallow import fields, missing
+from marshmallow.decorators import POST_LOAD
+from marshmallow.exceptions import ValidationError
+
+from .cdr_datetime import DateTime
+
+_decoders = {}
+
+def _identity(value):
+    return value
+
+def _int(value):
+    if value is None:
+        return None
+    return int(value)
+
+def _float(value):
+    if value is None:
+        return None
+    return float(value)
+
+def _bool_converter(field):
+    truthy = field.truthy
+    falsy = field.falsy
+
+    def convert(value):
+        if value is None or value is True or value is False:
+            return value
+        if not truthy:
+            return bool(value)
+        if value in truthy:
+            return True
+        if value in falsy:
+            return False
+        return field.deserialize(value)
+    return convert
+
+def _datetime_converter(field):
+    func = fields.DateTime.DESERIALIZATION_FUNCS.get(field.format or field.DEFAULT_FORMAT)
+    fallback = isinstance(field, DateTime)
+    if func is None:
+        return lambda value: field.deserialize(value)
+
+    def convert(value):
+        if value is None:
+            return None
+        try:
+            return func(value)
+        except (TypeError, AttributeError, ValueError):
+            if fallback:
+                return datetime.min
+            raise
+    return convert
+
+def _nested_converter(field):
+    state = {}
+
+    # compiled on first use, so that self-referencing schemas do not
+    # recurse forever
+    def convert(value):
+        if value is None:
+            return None
+        if 'decode' not in state:
+            schema = field.schema
+            state['decode'] = compile_schema(schema)
+            state['many'] = bool(field.many or schema.many)
+        decode = state['decode']
+        if state['many']:
+            return [decode(v) for v in value]
+        return decode(value)
+    return convert
+
+def _converter(field):
+    # pylint: disable=too-many-return-statements
+    if isinstance(field, fields.Nested):
+        return _nested_converter(field)
+    if isinstance(field, fields.DateTime):
+        return _datetime_converter(field)
+    if isinstance(field, fields.List):
+        inner = _converter(field.inner)
+        return lambda value: None if value is None else [inner(v) for v in value]
+    if isinstance(field, fields.Dict):
+        if field.value_field is None:
+            return _identity
+        inner = _converter(field.value_field)
+        return lambda value: None if value is None else {k: inner(v) for k, v in value.items()}
+    if isinstance(field, fields.Boolean):
+        return _bool_converter(field)
+    if isinstance(field, fields.Integer):
+        return _int
+    if isinstance(field, fields.Float):
+        return _float
+    if isinstance(field, fields.String) or type(field) is fields.Raw: # pylint: disable=unidiomatic-typecheck
+        return _identity
+    # custom field types keep their own deserialization
+    return lambda value: field.deserialize(value)
+
+def _compile(schema):
+    # (input key, output key, converter, load_default)
+    plan = []
+    for name, field in schema.load_fields.items():
+        key = field.data_key if field.data_key is not None else name
+        attr = field.attribute if field.attribute is not None else name
+        plan.append((key, attr, _converter(field), field.load_default))
+
+    post_load = None
+    for key, entries in getattr(schema, '_hooks', {}).items():
+        # marshmallow < 3.20 keys hooks by (tag, many) and stores
+        # names, newer versions key by tag and store (name, many,
+        # kwargs) tuples
+        tag = key[0] if isinstance(key, tuple) else key
+        for entry in entries:
+            name = entry[0] if isinstance(entry, tuple) else entry
+            if tag != POST_LOAD or name != 'post_load':
+                # schema does more than construct a model, let
+                # marshmallow handle it
+                return lambda data: schema.load(data, many=False)
+            post_load = getattr(schema, name)
+
+    def decode(data):
+        out = {}
+        for key, attr, convert, load_default in plan:
+            value = data.get(key, missing)
+            if value is missing:
+                if load_default is missing:
+                    continue
+                value = load_default() if callable(load_default) else load_default
+                out[attr] = value
+                continue
+            try:
+                out[attr] = convert(value)
+            except (TypeError, ValueError) as e:
+                raise ValidationError(str(e), field_name=key) from e
+        if post_load is not None:
+            return post_load(out)
+        return out
+    return decode
+
+def compile_schema(schema):
+    """Get a function which decodes a single dict into a model according
+    to ``schema``.  Compiled functions are cached per schema class and
+    ``only``/``exclude`` options.
+
+    :param schema: marshmallow ``Schema`` object.
+    :return: Function taking a dict and returning a model.
+    """
+    key = (type(schema), frozenset(schema.only) if schema.only is not None else None, frozenset(schema.exclude))
+    decode = _decoders.get(key)
+    if decode is None:
+        decode = _compile(schema)
+        _decoders[key] = decode
+    return decode
+
+def decode(schema, data, many=None):
+    """Decode ``data`` into models according to ``schema``.
+
+    :param schema: marshmallow ``Schema`` object.
+    :param data: Parsed JSON dict, or list of dicts if ``many`` is bool `True`.
+    :param many: (optional) Decode a list if bool `True`, defaults to ``schema.many``.
+    :return: Model or model list.
+    """
+    fn = compile_schema(schema)
+    if many is None:
+        many = schema.many
+    if many:
+        return [fn(d) for d in data]
+    return fn(data)
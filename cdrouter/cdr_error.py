@@ -9,3 +9,12 @@ from requests.exceptions import HTTPError
 
 class CDRouterError(HTTPError):
     """Class for representing CDRouter Web API errors."""
+
+class BulkError(CDRouterError):
+    """Class for representing a bulk request which was split into
+    chunks, one or more of which failed.  The outcome of every chunk
+    is available as ``report``, a :class:`cdrouter.BulkReport
+    <cdrouter.BulkReport>` object."""
+    def __init__(self, *args, **kwargs):
+        self.report = kwargs.pop('report', None)
+        super().__init__(*args, **kwargs)
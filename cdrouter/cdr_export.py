@@ -0,0 +1,91 @@
+#
+# Copyright (c) 2026 by QA Cafe.
+# All Rights Reserved.
+#
+
+"""Module for combining CDRouter export archives.
+
+An export is a gzip stream holding a JSON line listing the names of
+the exported resources, a JSON line holding the configs, devices,
+packages and results themselves, then a tar archive of result files.
+"""
+
+from collections import OrderedDict
+import gzip
+import json
+import tarfile
+
+def _key(item):
+    if isinstance(item, dict) and 'id' in item:
+        return ('id', str(item['id']))
+    return ('json', json.dumps(item, sort_keys=True))
+
+def _extend(merged, part):
+    # concatenate list values, skipping items already present, for
+    # example a config shared by results in different chunks
+    for name, value in part.items():
+        if not isinstance(value, list):
+            merged.setdefault(name, value)
+            continue
+        items = merged.setdefault(name, [])
+        seen = merged.setdefault(('seen', name), set())
+        for item in value:
+            key = _key(item)
+            if key not in seen:
+                seen.add(key)
+                items.append(item)
+
+def _dumps(merged):
+    value = OrderedDict((k, v) for k, v in merged.items() if not isinstance(k, tuple))
+    return json.dumps(value, separators=(',', ':')).encode('utf-8') + b'\n'
+
+class _Writer(object):
+    def __init__(self, fd, progress):
+        self.fd = fd
+        self.progress = progress
+        self.nbytes = 0
+
+    def write(self, b):
+        n = self.fd.write(b)
+        self.nbytes += len(b)
+        if self.progress is not None:
+            self.progress(self.nbytes, None)
+        return n
+
+    def flush(self):
+        flush = getattr(self.fd, 'flush', None)
+        if flush is not None:
+            flush()
+
+def merge(srcs, fd, progress=None):
+    """Combine export archives into one, in order.  Only the JSON
+    lines of the exports are held in memory, result files are copied
+    from one tar archive to the other.
+
+    :param srcs: Readable binary file-like objects holding exports, positioned at their start.
+    :param fd: Writable binary file-like object to write the combined export to.
+    :param progress: (optional) Function called as ``progress(nbytes, None)`` as compressed bytes are written.
+    """
+    names = OrderedDict()
+    data = OrderedDict()
+    streams = []
+    for src in srcs:
+        gz = gzip.GzipFile(fileobj=src, mode='rb')
+        _extend(names, json.loads(gz.readline()))
+        _extend(data, json.loads(gz.readline()))
+        streams.append(gz)
+
+    with gzip.GzipFile(filename='', fileobj=_Writer(fd, progress), mode='wb', compresslevel=6) as out:
+        out.write(_dumps(names))
+        out.write(_dumps(data))
+        with tarfile.open(fileobj=out, mode='w|', format=tarfile.PAX_FORMAT) as tar:
+            seen = set()
+            for gz in streams:
+                if not gz.peek(1):
+                    continue
+                with tarfile.open(fileobj=gz, mode='r|') as part:
+                    for member in part:
+                        if member.name in seen:
+                            continue
+                        seen.add(member.name)
+                        tar.addfile(member, part.extractfile(member) if member.isreg() else None)
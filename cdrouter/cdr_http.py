@@ -0,0 +1,71 @@
+#
+# Copyright (c) 2026 by QA Cafe.
+# All Rights Reserved.
+#
+
+"""Module for tuning the HTTP connections of a CDRouter client."""
+
+import socket
+
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
+
+#: Socket options urllib3 sets on every connection, which disable
+#: Nagle's algorithm (``TCP_NODELAY``).
+DEFAULT_SOCKET_OPTIONS = list(HTTPConnection.default_socket_options)
+
+def keepalive_options(idle=60, interval=10, count=6):
+    """Get socket options enabling TCP keepalive probes, so that
+    connections left idle in the pool, or waiting on a slow response,
+    are noticed when the CDRouter system or a firewall in between
+    drops them.  Options the platform does not support are left out.
+
+    :param idle: (optional) Seconds a connection is idle before the first probe as an int.
+    :param interval: (optional) Seconds between probes as an int.
+    :param count: (optional) Number of unanswered probes before the connection is dropped as an int.
+    :return: List of `(level, option, value)` tuples for :class:`cdr_http.PoolAdapter <cdr_http.PoolAdapter>`.
+    """
+    options = [(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)]
+    # TCP_KEEPALIVE is macOS's name for TCP_KEEPIDLE
+    idle_option = getattr(socket, 'TCP_KEEPIDLE', getattr(socket, 'TCP_KEEPALIVE', None))
+    if idle_option is not None:
+        options.append((socket.IPPROTO_TCP, idle_option, idle))
+    if hasattr(socket, 'TCP_KEEPINTVL'):
+        options.append((socket.IPPROTO_TCP, socket.TCP_KEEPINTVL, interval))
+    if hasattr(socket, 'TCP_KEEPCNT'):
+        options.append((socket.IPPROTO_TCP, socket.TCP_KEEPCNT, count))
+    return options
+
+class PoolAdapter(HTTPAdapter):
+    """Transport adapter for a :class:`cdrouter.CDRouter
+    <cdrouter.CDRouter>` session, an ``HTTPAdapter`` which also sets
+    socket options on every new connection.
+
+    :param socket_options: (optional) List of `(level, option, value)`
+        tuples to set on each socket, replacing
+        ``DEFAULT_SOCKET_OPTIONS``.
+    :param kwargs: Arguments that ``requests.adapters.HTTPAdapter``
+        takes, for example ``pool_connections``, ``pool_maxsize`` and
+        ``pool_block``.
+    """
+    __attrs__ = HTTPAdapter.__attrs__ + ['socket_options']
+
+    def __init__(self, socket_options=None, **kwargs):
+        if socket_options is None:
+            socket_options = DEFAULT_SOCKET_OPTIONS
+        self.socket_options = list(socket_options)
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs): # pylint: disable=arguments-differ
+        kwargs['socket_options'] = self.socket_options
+        super().init_poolmanager(*args, **kwargs)
+
+    def proxy_manager_for(self, *args, **kwargs): # pylint: disable=arguments-differ
+        kwargs['socket_options'] = self.socket_options
+        return super().proxy_manager_for(*args, **kwargs)
+
+    def __setstate__(self, state):
+        # HTTPAdapter rebuilds its pool manager as it is unpickled,
+        # which needs socket_options
+        self.socket_options = state.get('socket_options', DEFAULT_SOCKET_OPTIONS)
+        super().__setstate__(state)
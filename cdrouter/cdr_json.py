@@ -0,0 +1,56 @@
+#
+# Copyright (c) 2026 by QA Cafe.
+# All Rights Reserved.
+#
+
+"""Module for parsing CDRouter Web API response bodies.
+
+Responses are parsed straight from their bytes, skipping the decode
+to text done by ``requests.Response.json``.  orjson or pysimdjson are
+used if installed (``pip install cdrouter[fastjson]``), otherwise the
+standard library's json module.
+"""
+
+import json
+
+#: Names of the JSON backends in order of preference.
+BACKENDS = ('orjson', 'simdjson', 'json')
+
+def _orjson():
+    import orjson # pylint: disable=import-outside-toplevel,import-error
+    return orjson.loads
+
+def _simdjson():
+    import simdjson # pylint: disable=import-outside-toplevel,import-error
+    return simdjson.loads
+
+def _json():
+    return json.loads
+
+_loaders = {
+    'orjson': _orjson,
+    'simdjson': _simdjson,
+    'json': _json,
+}
+
+def get_backend(backend=None):
+    """Get a function which parses a JSON document from bytes.
+
+    :param backend: (optional) Name of a JSON backend as a string, one
+        of ``BACKENDS``, or a function taking bytes and returning the
+        parsed document.  If `None`, the first installed backend in
+        ``BACKENDS`` is used.
+    :return: Function taking bytes and returning parsed JSON.
+    """
+    if callable(backend):
+        return backend
+    if backend is not None:
+        if backend not in _loaders:
+            raise ValueError('unknown JSON backend {}, must be one of {}'.format(backend, ', '.join(BACKENDS)))
+        return _loaders[backend]()
+    for name in BACKENDS:
+        try:
+            return _loaders[name]()
+        except ImportError:
+            pass
+    return json.loads
@@ -0,0 +1,146 @@
+#
+# Copyright (c) 2026 by QA Cafe.
+# All Rights Reserved.
+#
+
+"""Module for retrying failed CDRouter Web API requests."""
+
+from email.utils import parsedate_to_datetime
+import random
+import time
+
+from requests.exceptions import ConnectionError as RequestsConnectionError, ConnectTimeout, Timeout
+
+#: Response status codes retried by default, sent by a CDRouter
+#: system's web server while the system is restarting or too busy to
+#: answer.
+DEFAULT_STATUSES = (502, 503, 504)
+
+#: Methods retried by default, which can be sent again without side effects.
+DEFAULT_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+class RetryPolicy(object):
+    """Policy for retrying requests made by a :class:`cdrouter.CDRouter
+    <cdrouter.CDRouter>` object, passed as its ``retry_policy``
+    argument.
+
+    A request is retried if it fails to connect, its connection is
+    reset, it times out or its response status is one of
+    ``statuses``, waiting an exponentially growing, randomized delay
+    between attempts.  Only idempotent requests are retried: ``GET``
+    requests such as ``get``, ``list`` and ``export`` calls, and the
+    bulk actions named in ``bulk``.  Requests of other methods are
+    only retried if they failed to connect, since they then never
+    reached the CDRouter system.
+
+    Downloads interrupted after the response started, for example an
+    export, are resumed from the last byte written with a ``Range``
+    request.  If the CDRouter system answers with the whole file
+    instead, the download restarts if it is written to a path or an
+    ``io.BytesIO`` and fails otherwise.
+
+    Usage::
+
+      from cdrouter import CDRouter
+      from cdrouter.cdr_retry import RetryPolicy
+
+      c = CDRouter('http://localhost', retry_policy=RetryPolicy(total=8, max_backoff=60))
+      # also retry bulk edits and deletes, which are safe to repeat
+      c = CDRouter('http://localhost', retry_policy=RetryPolicy(bulk=('edit', 'delete')))
+      # never retry
+      c = CDRouter('http://localhost', retry_policy=RetryPolicy(total=0))
+
+    :param total: (optional) Maximum number of retries per request as an int.
+    :param backoff: (optional) Delay in seconds before the first
+        retry as a float, doubled for each further retry.
+    :param max_backoff: (optional) Maximum delay in seconds between
+        attempts as a float.
+    :param jitter: (optional) If bool `True`, each delay is drawn
+        uniformly between zero and its exponential value, so that
+        many clients retrying against a busy system spread out.
+    :param statuses: (optional) Response status codes to retry as an int list.
+    :param methods: (optional) Request methods to retry as a string list.
+    :param bulk: (optional) Bulk actions to also retry as a string
+        list, for example ``('edit', 'delete')``.  Bulk actions are
+        ``POST`` requests, so none are retried by default.
+    :param retry_after: (optional) If bool `True`, wait as long as a
+        response's ``Retry-After`` header asks, up to ``max_backoff``.
+    :param resume: (optional) If bool `False`, interrupted downloads fail instead of resuming.
+    """
+    def __init__(self, total=3, backoff=0.5, max_backoff=30.0, jitter=True, statuses=DEFAULT_STATUSES,
+                 methods=DEFAULT_METHODS, bulk=(), retry_after=True, resume=True):
+        self.total = total
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.statuses = frozenset(statuses)
+        self.methods = frozenset(m.upper() for m in methods)
+        self.bulk = frozenset(bulk)
+        self.retry_after = retry_after
+        self.resume = resume
+
+    def idempotent(self, method, params=None):
+        """Check if a request can be sent again without side effects.
+
+        :param method: Request method as a string.
+        :param params: (optional) Request parameters as a dict.
+        :rtype: bool
+        """
+        if method.upper() in self.methods:
+            return True
+        return (params or {}).get('bulk') in self.bulk
+
+    def should_retry(self, attempt, method, params=None, resp=None, error=None):
+        """Check if a request should be sent again.
+
+        :param attempt: Number of retries already made as an int.
+        :param method: Request method as a string.
+        :param params: (optional) Request parameters as a dict.
+        :param resp: (optional) `requests.Response` object received.
+        :param error: (optional) Exception raised instead of a response.
+        :rtype: bool
+        """
+        if attempt >= self.total:
+            return False
+        if error is not None:
+            if isinstance(error, ConnectTimeout):
+                return True
+            if not isinstance(error, (RequestsConnectionError, Timeout)):
+                return False
+            return self.idempotent(method, params)
+        if resp is not None and resp.status_code in self.statuses:
+            return self.idempotent(method, params)
+        return False
+
+    def delay(self, attempt, resp=None):
+        """Get the number of seconds to wait before a retry.
+
+        :param attempt: Number of retries already made as an int.
+        :param resp: (optional) `requests.Response` object being retried.
+        :rtype: float
+        """
+        if self.retry_after and resp is not None:
+            wait = _retry_after(resp.headers.get('retry-after'))
+            if wait is not None:
+                return min(wait, self.max_backoff)
+        wait = min(self.backoff * (2 ** attempt), self.max_backoff)
+        if self.jitter:
+            wait = random.uniform(0, wait)
+        return wait
+
+    def sleep(self, attempt, resp=None):
+        """Wait before a retry, see ``delay``."""
+        time.sleep(self.delay(attempt, resp=resp))
+
+def _retry_after(value):
+    # Retry-After is either a number of seconds or an HTTP date
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
@@ -4,21 +4,32 @@
 #
 
 from builtins import input
+from collections import namedtuple
+from contextlib import contextmanager
 import getpass
 import io
 import os
 import re
-from threading import Lock
+import tempfile
+import time
+from threading import Lock, local
 import requests
-from requests_toolbelt.downloadutils import stream
-from requests_toolbelt import sessions
+from requests_toolbelt import sessions, MultipartEncoder, MultipartEncoderMonitor
 from requests_toolbelt.utils.user_agent import user_agent
 from requests.packages.urllib3.exceptions import InsecureRequestWarning # pylint: disable=import-error
-from requests.exceptions import HTTPError
+from requests.exceptions import ChunkedEncodingError, ConnectionError as RequestsConnectionError, HTTPError, RequestException, Timeout
+from requests.structures import CaseInsensitiveDict
 from marshmallow import Schema, fields, post_load, EXCLUDE
 
 from . import __version__
-from .cdr_error import CDRouterError
+from .cdr_error import CDRouterError, BulkError
+from .cdr_concurrent import imap_ordered
+from . import cdr_export
+from .cdr_http import PoolAdapter
+from .cdr_retry import RetryPolicy
+from .instrumentation import RequestRecord
+from . import cdr_decoder
+from . import cdr_json
 from .cdr_datetime import DateTime
 from .alerts import AlertsService
 from .configs import ConfigsService
@@ -132,6 +143,46 @@ class ShareSchema(Schema):
     def post_load(self, data, **kwargs): # pylint: disable=unused-argument
         return Share(**data)
 
+class BulkChunk(namedtuple('BulkChunk', ['items', 'result', 'error'])):
+    """Named tuple for one request of a bulk call split into chunks.
+
+    :param items: IDs or other items sent in this request as a list.
+    :param result: Return value for this request, or `None` if it failed.
+    :param error: Exception raised by this request, or `None` if it succeeded.
+    """
+
+class BulkReport(object):
+    """Class representing the outcome of a bulk call, which is sent as
+    one request per ``bulk_chunk_size`` IDs.
+
+    :param chunks: :class:`cdrouter.BulkChunk <cdrouter.BulkChunk>` list, in the order of the IDs.
+    """
+    def __init__(self, chunks):
+        self.chunks = chunks
+
+    @property
+    def results(self):
+        """Return values of the requests that succeeded as a list."""
+        return [x.result for x in self.chunks if x.error is None]
+
+    @property
+    def errors(self):
+        """:class:`cdrouter.BulkChunk <cdrouter.BulkChunk>` list of the requests that failed."""
+        return [x for x in self.chunks if x.error is not None]
+
+    @property
+    def failed(self):
+        """Items of the requests that failed as a list."""
+        return [item for x in self.errors for item in x.items]
+
+#: Auth mode for a CDRouter system with Automatic Login enabled, no
+#: API token is needed.
+AUTH_MODE_AUTOMATIC = 'automatic'
+#: Auth mode for a CDRouter system which requires an API token.
+AUTH_MODE_TOKEN = 'token'
+#: Auth mode after the CDRouter system rejected the API token in use.
+AUTH_MODE_EXPIRED = 'expired'
+
 class Auth(requests.auth.AuthBase): # pylint: disable=too-few-public-methods
     """Class for authorizing CDRouter Web API requests."""
 
@@ -142,21 +193,25 @@ class Auth(requests.auth.AuthBase): # pylint: disable=too-few-public-methods
         if r.method == 'POST' and r.path_url.startswith('/authenticate'):
             return r
 
-        self.c.lock.acquire()
-        token = self.c.token
-        self.c.lock.release()
+        with self.c.lock:
+            token = self.c.token
+            auth_mode = self.c.auth_mode
 
-        if token is None:
-            # if API request with no token returns a 401, automatic
-            # login is disabled and user needs to authenticate
-            resp = requests.get(self.c.base + self.c.BASE + 'system/hostname/', verify=(not self.c.insecure), timeout=10.0)
+        if token is None and auth_mode != AUTH_MODE_AUTOMATIC:
+            if auth_mode is None:
+                # if API request with no token returns a 401, automatic
+                # login is disabled and user needs to authenticate.
+                # The answer is cached in auth_mode until a request
+                # gets a 401.
+                resp = self.c.session.get('system/hostname/', verify=(not self.c.insecure), timeout=10.0)
 
-            if resp.status_code == 401:
-                self.c.authenticate(self.c.retries)
+                if resp.status_code != 401:
+                    auth_mode = AUTH_MODE_AUTOMATIC
+                    with self.c.lock:
+                        self.c.auth_mode = auth_mode
 
-                self.c.lock.acquire()
-                token = self.c.token
-                self.c.lock.release()
+            if auth_mode != AUTH_MODE_AUTOMATIC:
+                token = self.c.authenticate(self.c.retries)
 
         if token is not None:
             r.headers['authorization'] = 'Bearer ' + token
@@ -209,11 +264,100 @@ class CDRouter(object):
         URL, skip certificate verification and allow insecure
         connections to the CDRouter system.
 
+    :param validate: (optional) If bool `True`, decode responses with
+        marshmallow, validating every field.  By default responses
+        are decoded by functions compiled from the same schemas (see
+        ``cdrouter.cdr_decoder``), which apply the same conversions
+        several times faster but do not validate.
+
+    :param json_backend: (optional) JSON parser for response bodies,
+        ``'orjson'``, ``'simdjson'``, ``'json'`` or a function taking
+        bytes.  By default the fastest installed parser is used, see
+        ``cdrouter.cdr_json``.
+
+    :param cache: (optional) :class:`cdr_cache.ResponseCache
+        <cdr_cache.ResponseCache>` object used to cache GET responses,
+        for example of testsuite metadata.  Responses are not cached by
+        default.
+
+    :param raw: (optional) If bool `True`, service methods return the
+        parsed JSON dicts and lists instead of model objects.  Useful
+        when data is only forwarded elsewhere.  ``list`` calls still
+        return a :class:`cdrouter.Links <cdrouter.Links>` object.
+
+    :param bulk_chunk_size: (optional) Maximum number of IDs sent per
+        request by ``bulk_*`` calls as an int.  Larger ID lists are
+        split into several requests, avoiding URL length limits and
+        server timeouts.  If `None` or `0`, IDs are never split.
+
+    :param bulk_workers: (optional) Maximum number of concurrent
+        requests used when a ``bulk_*`` call is split as an int.
+
+    :param instruments: (optional) List of
+        :class:`instrumentation.Instrument <instrumentation.Instrument>`
+        objects whose hooks are called around every request and
+        decoded response, for example a
+        :class:`instrumentation.RequestMetrics
+        <instrumentation.RequestMetrics>` object keeping latency
+        histograms.  Instruments can also be added to ``instruments``
+        later.
+
+    :param timeout: (optional) Seconds to wait for the CDRouter system
+        to accept a connection and to send each part of a response,
+        as a float, a `(connect, read)` tuple of floats, or `None` to
+        wait forever.  Can be overridden for some calls with
+        ``request_timeout``.
+
+    :param pool_connections: (optional) Number of hosts to keep pooled
+        connections for as an int.
+
+    :param pool_maxsize: (optional) Maximum number of connections kept
+        open to the CDRouter system as an int.  Should be at least the
+        number of threads sharing the client, else connections beyond
+        it are closed after each request.
+
+    :param pool_block: (optional) If bool `True`, requests wait for a
+        pooled connection to be free instead of opening a connection
+        beyond ``pool_maxsize``.
+
+    :param keep_alive: (optional) If bool `False`, close each
+        connection after its request instead of reusing it.
+
+    :param retry_policy: (optional) :class:`cdr_retry.RetryPolicy
+        <cdr_retry.RetryPolicy>` object deciding which failed requests
+        are retried and how long to wait in between.  By default,
+        ``GET`` requests answered with a 502, 503 or 504 status, or
+        whose connection fails or times out, are retried three times
+        with exponential backoff, and interrupted downloads are
+        resumed.  Pass ``RetryPolicy(total=0)`` to never retry.
+
+    :param socket_options: (optional) List of `(level, option, value)`
+        tuples set on each new connection, replacing
+        ``cdr_http.DEFAULT_SOCKET_OPTIONS`` which sets
+        ``TCP_NODELAY``.  For example, pass
+        ``DEFAULT_SOCKET_OPTIONS + keepalive_options()`` to also
+        enable TCP keepalive probes, see
+        :func:`cdr_http.keepalive_options <cdr_http.keepalive_options>`.
+
+    A CDRouter object can be shared by many threads, which then share
+    its pooled connections, auth state, ``cache`` and
+    ``instruments``.  Service methods and ``request_timeout`` do not
+    keep per-call state on the object.
+
+    The auth mode of the CDRouter system is learned from the first
+    request and stored in ``auth_mode``, so that requests made without
+    a token do not each need to check whether Automatic Login is
+    enabled.  The mode is re-learned whenever a request gets a 401
+    response.
+
     """
     BASE = '/api/v1/'
+    #: Chunk size in bytes used when streaming downloads.
+    CHUNK_SIZE = 64 * 1024
 
-    def __init__(self, base, token=None, username=None, password=None, _getuser=_getuser_default, _getpass=_getpass_default, retries=3, insecure=False):
+    def __init__(self, base, token=None, username=None, password=None, _getuser=_getuser_default, _getpass=_getpass_default, retries=3, insecure=False, validate=False, json_backend=None, raw=False, cache=None, bulk_chunk_size=500, bulk_workers=4, instruments=None, timeout=600.0, pool_connections=10, pool_maxsize=32, pool_block=False, keep_alive=True, socket_options=None, retry_policy=None):
         self.lock = Lock()
+        self._local = local()
 
         self.base = base.rstrip('/')
         self.token = token or os.environ.get('CDROUTER_API_TOKEN')
@@ -223,12 +367,37 @@ class CDRouter(object):
         self._getpass = _getpass
         self.retries = retries
         self.insecure = insecure
+        self.validate = validate
+        self.json_backend = json_backend
+        self.loads = cdr_json.get_backend(json_backend)
+        self.raw = raw
+        self.cache = cache
+        self.bulk_chunk_size = bulk_chunk_size
+        self.bulk_workers = bulk_workers
+        self.instruments = list(instruments or [])
+        self.timeout = timeout
+        self.keep_alive = keep_alive
+        if retry_policy is None:
+            retry_policy = RetryPolicy()
+        self.retry_policy = retry_policy
+
+        #: Learned auth mode of the CDRouter system as a string,
+        #: ``AUTH_MODE_AUTOMATIC``, ``AUTH_MODE_TOKEN`` or
+        #: ``AUTH_MODE_EXPIRED``, or `None` if not yet known.
+        self.auth_mode = AUTH_MODE_TOKEN if self.token is not None else None
+        # bool True if token was learned via authenticate() and so
+        # can be learned again if it expires
+        self._authenticated = False
 
         if insecure:
             # disable annoying InsecureRequestWarning
             requests.packages.urllib3.disable_warnings(InsecureRequestWarning) # pylint: disable=no-member
 
         self.session = sessions.BaseUrlSession(base_url=self.base+self.BASE)
+        adapter = PoolAdapter(socket_options=socket_options, pool_connections=pool_connections,
+                              pool_maxsize=pool_maxsize, pool_block=pool_block)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
 
         #: :class:`alerts.AlertsService <alerts.AlertsService>` object
         self.alerts = AlertsService(self)
@@ -267,6 +436,33 @@ class CDRouter(object):
         #: :class:`users.UsersService <users.UsersService>` object
         self.users = UsersService(self)
 
+    @contextmanager
+    def request_timeout(self, timeout):
+        """Override ``timeout`` for the calls made by the current thread
+        inside a ``with`` block, for example to fail fast when
+        polling or to wait longer for a large export.  Other threads
+        sharing the client are unaffected.
+
+        Usage::
+
+          with c.request_timeout(5):
+              c.system.hostname()
+
+        :param timeout: Seconds as a float, a `(connect, read)` tuple of floats, or `None` to wait forever.
+        """
+        stack = self._local.__dict__.setdefault('timeouts', [])
+        stack.append(timeout)
+        try:
+            yield
+        finally:
+            stack.pop()
+
+    def _timeout(self):
+        stack = getattr(self._local, 'timeouts', None)
+        if stack:
+            return stack[-1]
+        return self.timeout
+
     # base request methods
     def _req(self, path, method='GET', json=None, data=None, params=None, headers=None, files=None, stream=None): # pylint: disable=redefined-outer-name
         if params is None:
@@ -276,13 +472,140 @@ class CDRouter(object):
         if files is None:
             files = {}
         headers.update({'user-agent': user_agent('cdrouter.py', __version__)})
-        resp = self.session.request(method, path, params=params, headers=headers, files=files, stream=stream,
-                                    json=json, data=data, verify=(not self.insecure), auth=Auth(c=self), timeout=600.0)
+        if not self.keep_alive:
+            headers['connection'] = 'close'
+
+        record = None
+        if self.instruments:
+            record = RequestRecord(method, path)
+            if getattr(self._local, 'resuming', False):
+                record.retries += 1
+            for i in self.instruments:
+                i.before_request(record)
+
+        try:
+            resp = self._send(record, path, method, json, data, params, headers, files, stream)
+        except Exception as e:
+            if record is not None:
+                record.finish(getattr(e, 'response', None), error=e)
+                for i in self.instruments:
+                    i.after_request(record)
+            raise
+
+        if record is not None:
+            record.finish(resp)
+            # picked up by decode
+            resp.cdr_record = record
+            for i in self.instruments:
+                i.after_request(record)
+        return resp
+
+    def _send(self, record, path, method, json, data, params, headers, files, stream): # pylint: disable=redefined-outer-name
+        cached = self.cache is not None and method == 'GET' and not stream
+        mutating = self.cache is not None and method != 'GET'
+        if cached:
+            hit, validators = self.cache.lookup(path, params)
+            if hit is not None:
+                if record is not None:
+                    record.cache = 'hit'
+                return hit
+            if validators:
+                resp = self._send_uncached(record, path, method, json, data, params, dict(headers, **validators), files, stream)
+                if record is not None and resp.status_code == 304:
+                    record.cache = 'revalidated'
+                hit = self.cache.store(path, params, resp)
+                if hit is not None:
+                    return hit
+                # the cached response was evicted meanwhile, so ask
+                # for the whole response again
+                if record is not None:
+                    record.cache = None
+                    record.retries += 1
+        elif mutating:
+            self.cache.invalidate(path)
+
+        try:
+            resp = self._send_uncached(record, path, method, json, data, params, headers, files, stream)
+        finally:
+            if mutating:
+                # again, in case a GET made while the request was in
+                # flight cached the old response
+                self.cache.invalidate(path)
+        if cached:
+            stored = self.cache.store(path, params, resp)
+            if stored is not None:
+                resp = stored
+        return resp
+
+    def _send_uncached(self, record, path, method, json, data, params, headers, files, stream): # pylint: disable=redefined-outer-name
+        retry = self.retry_policy
+        attempt = 0
+        while True:
+            try:
+                resp = self._attempt(record, path, method, json, data, params, headers, files, stream)
+            except RequestException as e:
+                if not retry.should_retry(attempt, method, params, error=e):
+                    raise
+                retry.sleep(attempt)
+            else:
+                if not retry.should_retry(attempt, method, params, resp=resp):
+                    break
+                resp.close()
+                retry.sleep(attempt, resp=resp)
+            attempt += 1
+            if record is not None:
+                record.retries += 1
+
+        if stream:
+            # picked up by download to resume an interrupted body
+            resp.cdr_request = (path, params, headers)
+        if record is not None:
+            record.sent(resp)
         self.raise_for_status(resp)
         return resp
 
-    def get(self, path, params=None, stream=None): # pylint: disable=redefined-outer-name
-        return self._req(path, method='GET', params=params, stream=stream)
+    def _attempt(self, record, path, method, json, data, params, headers, files, stream): # pylint: disable=redefined-outer-name
+        timeout = self._timeout()
+        resp = self.session.request(method, path, params=params, headers=headers, files=files, stream=stream,
+                                    json=json, data=data, verify=(not self.insecure), auth=Auth(c=self), timeout=timeout)
+        # an upload's body has been read and cannot be sent again
+        replayable = not files and not hasattr(data, 'read')
+        if resp.status_code == 401 and self._unauthorized(resp) and replayable:
+            resp.close()
+            if record is not None:
+                record.retries += 1
+            resp = self.session.request(method, path, params=params, headers=headers, files=files, stream=stream,
+                                        json=json, data=data, verify=(not self.insecure), auth=Auth(c=self), timeout=timeout)
+        return resp
+
+    def _unauthorized(self, resp):
+        # update auth_mode after a 401 response, returns bool True if
+        # the request should be retried
+        if resp.request is None or resp.request.path_url.startswith('/authenticate'):
+            return False
+
+        authorization = resp.request.headers.get('authorization')
+
+        with self.lock:
+            if authorization is None:
+                # Automatic Login has been disabled since auth_mode
+                # was learned
+                self.auth_mode = None
+                return True
+
+            if authorization != 'Bearer ' + str(self.token):
+                # another thread already replaced the token
+                return True
+
+            self.auth_mode = AUTH_MODE_EXPIRED
+            if self._authenticated:
+                self.token = None
+                return True
+
+        return False
+
+    def get(self, path, params=None, stream=None, headers=None): # pylint: disable=redefined-outer-name
+        return self._req(path, method='GET', params=params, stream=stream, headers=headers)
 
     def post(self, path, json=None, data=None, params=None, headers=None, files=None, stream=None): # pylint: disable=redefined-outer-name
         return self._req(path, method='POST', json=json, data=data, params=params, headers=headers, stream=stream, files=files)
@@ -294,7 +617,7 @@ class CDRouter(object):
         return self._req(path, method='DELETE', params=params)
 
     # cdrouter-specific request methods
-    def list(self, base, filter=None, type=None, sort=None, limit=None, page=None, format=None, detailed=None): # pylint: disable=redefined-builtin
+    def list(self, base, filter=None, type=None, sort=None, limit=None, page=None, format=None, detailed=None, stream=None): # pylint: disable=redefined-builtin
         if sort is not None:
             if not isinstance(sort, list):
                 sort = [sort]
@@ -302,16 +625,32 @@ class CDRouter(object):
         if detailed is not None:
             detailed = bool(detailed)
         return self.get(base, params={'filter': filter, 'type': type, 'sort': sort, 'limit': limit,
-                                      'page': page, 'format': format, 'detailed': detailed})
-
-    def iter_list(self, list_fn, *args, **kwargs):
-        while True:
+                                      'page': page, 'format': format, 'detailed': detailed}, stream=stream)
+
+    def iter_list(self, list_fn, *args, prefetch=None, **kwargs):
+        data, links = list_fn(*args, **kwargs)
+        for d in data:
+            yield d
+        if links.next is None:
+            return
+
+        if prefetch and links.last is not None:
+            # the first page tells us how many pages there are, so
+            # fetch the rest concurrently and yield them in order
+            def fetch(page):
+                data, _ = list_fn(*args, **dict(kwargs, page=page))
+                return data
+
+            for data in imap_ordered(fetch, range(links.next, links.last+1), prefetch):
+                for d in data:
+                    yield d
+            return
+
+        while links.next is not None:
+            kwargs.update({'page': links.next})
             data, links = list_fn(*args, **kwargs)
             for d in data:
                 yield d
-            if links.next is None:
-                break
-            kwargs.update({'page': links.next})
 
     def get_id(self, base, id, params=None, stream=None): # pylint: disable=invalid-name,redefined-builtin,redefined-outer-name
         return self.get(base+str(id)+'/', params=params, stream=stream)
@@ -342,48 +681,305 @@ class CDRouter(object):
                 filename = m.group(1)
         return filename
 
-    def export(self, base, id, format='gz', params=None): # pylint: disable=invalid-name,redefined-builtin
+    def upload(self, path, fd, filename, progress=None):
+        """Upload a file as the ``file`` field of a multipart ``POST``
+        request.  The request body is encoded as it is sent, reading
+        ``fd`` a block at a time, so memory use does not grow with the
+        size of the file.  File-like objects which cannot seek, and
+        so whose size is unknown, are read into memory first.
+
+        The request body size is recorded as the ``bytes_out`` of the
+        request's :class:`instrumentation.RequestRecord
+        <instrumentation.RequestRecord>`, which with its ``elapsed``
+        gives the upload throughput.
+
+        :param path: Request path as a string.
+        :param fd: Binary file-like object to upload.
+        :param filename: Filename to send as a string.
+        :param progress: (optional) Function called as ``progress(nbytes,
+            total)`` as the body is sent, where ``nbytes`` is the byte
+            count sent so far as an int and ``total`` is the request
+            body size as an int.  Counts include the multipart headers.
+        :rtype: requests.Response
+        """
+        seekable = getattr(fd, 'seekable', None)
+        if seekable is None or not seekable():
+            return self.post(path, files={'file': (filename, fd)})
+
+        body = MultipartEncoder(fields={'file': (filename, fd, 'application/octet-stream')})
+        if progress is not None:
+            body = MultipartEncoderMonitor(body, callback=lambda m: progress(m.bytes_read, m.len))
+        return self.post(path, data=body, headers={'content-type': body.content_type})
+
+    def download(self, resp, dest=None, progress=None):
+        """Stream a response body to ``dest`` in chunks of
+        ``CHUNK_SIZE`` bytes and close the response.
+
+        :param resp: Streaming response as a ``requests.Response`` object.
+        :param dest: (optional) Filepath as a string or writable binary
+            file-like object to write to.  If ``dest`` is a directory,
+            the file is written there using the filename sent by the
+            CDRouter system.  If `None`, the body is written to a new
+            ``io.BytesIO``.
+        :param progress: (optional) Function called as ``progress(nbytes,
+            total)`` after each chunk is written, where ``nbytes`` is
+            the byte count written so far as an int and ``total`` is
+            the response's Content-Length as an int or `None` if
+            unknown.
+        :rtype: tuple `(io.BytesIO, 'filename')`, `('path', 'filename')` or `(fd, 'filename')`
+        """
+        filename = self.filename(resp)
+        total = resp.headers.get('content-length')
+        if total is not None:
+            total = int(total)
+
+        fd = dest
+        if dest is None:
+            fd = io.BytesIO()
+        else:
+            fd, dest, _ = self._open_dest(dest, filename, resp=resp)
+
+        nbytes = 0
+        attempt = 0
+        try:
+            while True:
+                try:
+                    for chunk in resp.iter_content(chunk_size=self.CHUNK_SIZE):
+                        fd.write(chunk)
+                        nbytes += len(chunk)
+                        if progress is not None:
+                            progress(nbytes, total)
+                    if total is not None and nbytes < total and 'content-encoding' not in resp.headers:
+                        raise ChunkedEncodingError('response ended after {} of {} bytes'.format(nbytes, total), response=resp)
+                    break
+                except (ChunkedEncodingError, RequestsConnectionError, Timeout) as e:
+                    resp.close()
+                    resp = self._resume(resp, nbytes, attempt, e)
+                    attempt += 1
+                    if resp.status_code == 200 and nbytes > 0:
+                        # the CDRouter system ignored the Range header
+                        # and is sending the whole body again
+                        if fd is dest:
+                            resp.close()
+                            raise
+                        fd.seek(0)
+                        fd.truncate()
+                        nbytes = 0
+                        total = resp.headers.get('content-length')
+                        if total is not None:
+                            total = int(total)
+        finally:
+            resp.close()
+            if fd is not dest:
+                if dest is None:
+                    fd.seek(0)
+                else:
+                    fd.close()
+
+        if dest is None:
+            return (fd, filename)
+        return (dest, filename)
+
+    def _resume(self, resp, nbytes, attempt, error):
+        # request the rest of an interrupted streaming response,
+        # returns a 206 response starting nbytes into the body or a
+        # 200 response with the whole body, else raises error
+        retry = self.retry_policy
+        request = getattr(resp, 'cdr_request', None)
+        if request is None or not retry.resume or attempt >= retry.total:
+            raise error
+        path, params, headers = request
+        headers = CaseInsensitiveDict(headers)
+
+        # a ranged request's body starts at its range, not at the
+        # start of the file
+        start = 0
+        if 'range' in headers:
+            m = re.match(r'bytes=(\d+)-$', headers['range'])
+            if m is None:
+                raise error
+            start = int(m.group(1))
+        offset = start + nbytes
+        if offset > 0:
+            headers['range'] = 'bytes={}-'.format(offset)
+            # only resume if the body has not changed since
+            validator = resp.headers.get('etag') or resp.headers.get('last-modified')
+            if validator is not None:
+                headers['if-range'] = validator
+        retry.sleep(attempt)
+        # counted as a retry by instruments
+        self._local.resuming = True
+        try:
+            resumed = self._req(path, params=params, headers=dict(headers), stream=True)
+        except RequestException:
+            raise error # pylint: disable=raise-missing-from
+        finally:
+            self._local.resuming = False
+
+        if resumed.status_code == 206:
+            m = re.match(r'bytes (\d+)-', resumed.headers.get('content-range', ''))
+            if m is not None and int(m.group(1)) == offset:
+                return resumed
+        elif resumed.status_code == 200 and start == 0:
+            return resumed
+        resumed.close()
+        raise error
+
+    def _open_dest(self, dest, filename, resp=None):
+        # returns (fd, dest, opened), opened is bool True if fd was
+        # opened here and so must be closed by the caller
+        if callable(getattr(dest, 'write', None)):
+            return dest, dest, False
+        if os.path.isdir(dest):
+            if filename is None:
+                raise CDRouterError('no filename in response, cannot write to directory {}'.format(dest), response=resp)
+            dest = os.path.join(dest, os.path.basename(filename))
+        return open(dest, 'wb'), dest, True # pylint: disable=consider-using-with
+
+    def export(self, base, id, format='gz', params=None, dest=None, progress=None): # pylint: disable=invalid-name,redefined-builtin
         if params is None:
             params = {}
         params.update({'format': format})
         resp = self.get(base+str(id)+'/', params=params, stream=True)
-        b = io.BytesIO()
-        stream.stream_response_to_file(resp, path=b)
-        resp.close()
-        b.seek(0)
-        return (b, self.filename(resp))
+        return self.download(resp, dest=dest, progress=progress)
+
+    def bulk(self, fn, items, chunk_size=None, workers=None):
+        """Call ``fn`` with ``items`` split into lists of at most
+        ``chunk_size`` items, using up to ``workers`` concurrent calls.
+        Every chunk is tried even if some fail.
+
+        :param fn: Function taking a list of items, usually making a single request.
+        :param items: IDs or other items to split.
+        :param chunk_size: (optional) Maximum number of items per call as an int, defaults to ``bulk_chunk_size``.
+        :param workers: (optional) Maximum number of concurrent calls as an int, defaults to ``bulk_workers``.
+        :return: :class:`cdrouter.BulkReport <cdrouter.BulkReport>` object
+        :rtype: cdrouter.BulkReport
+        :raises BulkError: If ``items`` were split and any call raised a ``requests`` exception.
+        """
+        if chunk_size is None:
+            chunk_size = self.bulk_chunk_size
+        if workers is None:
+            workers = self.bulk_workers
+
+        items = list(items)
+        if not chunk_size or len(items) <= chunk_size:
+            # a single request fails as it always has
+            return BulkReport([BulkChunk(items, fn(items), None)])
 
-    def bulk_export(self, base, ids, params=None):
+        def run(chunk):
+            try:
+                return BulkChunk(chunk, fn(chunk), None)
+            except RequestException as e:
+                return BulkChunk(chunk, None, e)
+
+        chunks = [items[i:i+chunk_size] for i in range(0, len(items), chunk_size)]
+        report = BulkReport(list(imap_ordered(run, chunks, workers)))
+        errors = report.errors
+        if errors:
+            raise BulkError('{} of {} bulk requests failed, first error: {}'.format(len(errors), len(chunks), errors[0].error),
+                            report=report, response=getattr(errors[0].error, 'response', None))
+        return report
+
+    def bulk_ids(self, fn, ids, chunk_size=None, workers=None):
+        """Call ``fn`` with ``ids`` like ``bulk``, but return the return
+        value of ``fn`` as is if ``ids`` fit in a single call.
+
+        :param fn: Function taking a list of IDs and making a single request.
+        :param ids: IDs to split.
+        :param chunk_size: (optional) Maximum number of IDs per call as an int, defaults to ``bulk_chunk_size``.
+        :param workers: (optional) Maximum number of concurrent calls as an int, defaults to ``bulk_workers``.
+        :return: Return value of ``fn``, or a :class:`cdrouter.BulkReport
+            <cdrouter.BulkReport>` object if ``ids`` were split.
+        :raises BulkError: If ``ids`` were split and any call raised a ``requests`` exception.
+        """
+        if chunk_size is None:
+            chunk_size = self.bulk_chunk_size
+        ids = list(ids)
+        if not chunk_size or len(ids) <= chunk_size:
+            return fn(ids)
+        return self.bulk(fn, ids, chunk_size=chunk_size, workers=workers)
+
+    def bulk_export(self, base, ids, params=None, dest=None, progress=None, chunk_size=None, workers=None):
         if params is None:
             params = {}
-        params.update({'bulk': 'export', 'ids': ','.join(map(str, ids))})
-        resp = self.get(base, params=params, stream=True)
-        b = io.BytesIO()
-        stream.stream_response_to_file(resp, path=b)
-        resp.close()
-        b.seek(0)
-        return (b, self.filename(resp))
-
-    def bulk_copy(self, base, resource, ids, schema):
-        resp = self.post(base, params={'bulk': 'copy'},
-                         json={resource: [{'id': str(x)} for x in ids]})
-        return self.decode(schema, resp, many=True)
 
-    def bulk_edit(self, base, resource, fields, ids=None, filter=None, type=None, all=False, testvars=None): # pylint: disable=redefined-builtin,redefined-outer-name
+        def export(ids):
+            p = dict(params, bulk='export', ids=','.join(map(str, ids)))
+            return self.get(base, params=p, stream=True)
+
+        ids = list(ids)
+        if chunk_size is None:
+            chunk_size = self.bulk_chunk_size
+        if not chunk_size or len(ids) <= chunk_size:
+            return self.download(export(ids), dest=dest, progress=progress)
+
+        # download each chunk's export to a temporary file, then
+        # stream them into one export
+        def fetch(ids):
+            fd = tempfile.TemporaryFile()
+            try:
+                _, filename = self.download(export(ids), dest=fd)
+            except BaseException:
+                fd.close()
+                raise
+            fd.seek(0)
+            return fd, filename
+
+        try:
+            report = self.bulk(fetch, ids, chunk_size=chunk_size, workers=workers)
+        except BulkError as be:
+            for fd, _ in be.report.results:
+                fd.close()
+            raise
+
+        filename = report.results[0][1]
+        fds = [fd for fd, _ in report.results]
+        try:
+            if dest is None:
+                out = io.BytesIO()
+                cdr_export.merge(fds, out, progress=progress)
+                out.seek(0)
+                return (out, filename)
+            fd, dest, opened = self._open_dest(dest, filename)
+            try:
+                cdr_export.merge(fds, fd, progress=progress)
+            finally:
+                if opened:
+                    fd.close()
+            return (dest, filename)
+        finally:
+            for fd in fds:
+                fd.close()
+
+    def bulk_copy(self, base, resource, ids, schema, chunk_size=None, workers=None):
+        def copy(ids):
+            resp = self.post(base, params={'bulk': 'copy'},
+                             json={resource: [{'id': str(x)} for x in ids]})
+            return self.decode(schema, resp, many=True)
+
+        report = self.bulk(copy, ids, chunk_size=chunk_size, workers=workers)
+        return [x for result in report.results for x in result]
+
+    def bulk_edit(self, base, resource, fields, ids=None, filter=None, type=None, all=False, testvars=None, chunk_size=None, workers=None): # pylint: disable=redefined-builtin,redefined-outer-name
+        params = {'bulk': 'edit', 'filter': filter, 'type': type, 'all': all}
         json = {'fields': fields}
-        if ids is not None or testvars is not None:
-            if ids is not None:
-                json[resource] = [{'id': str(x)} for x in ids]
-            if testvars is not None:
-                json['testvars'] = testvars
+        if testvars is not None:
+            json['testvars'] = testvars
+        if ids is None:
+            return self.post(base, params=params, json=json)
 
-        return self.post(base, params={'bulk': 'edit', 'filter': filter, 'type': type, 'all': all}, json=json)
+        def edit(ids):
+            return self.post(base, params=params, json=dict(json, **{resource: [{'id': str(x)} for x in ids]}))
+        return self.bulk_ids(edit, ids, chunk_size=chunk_size, workers=workers)
 
-    def bulk_delete(self, base, resource, ids=None, filter=None, type=None, all=False): # pylint: disable=redefined-builtin
-        json = None
-        if ids is not None:
-            json = {resource: [{'id': str(x)} for x in ids]}
-        return self.post(base, params={'bulk': 'delete', 'filter': filter, 'type': type, 'all': all}, json=json)
+    def bulk_delete(self, base, resource, ids=None, filter=None, type=None, all=False, chunk_size=None, workers=None): # pylint: disable=redefined-builtin
+        params = {'bulk': 'delete', 'filter': filter, 'type': type, 'all': all}
+        if ids is None:
+            return self.post(base, params=params)
+
+        def delete(ids):
+            return self.post(base, params=params, json={resource: [{'id': str(x)} for x in ids]})
+        return self.bulk_ids(delete, ids, chunk_size=chunk_size, workers=workers)
 
     @staticmethod
     def raise_for_status(resp):
@@ -408,21 +1004,58 @@ class CDRouter(object):
 
             raise CDRouterError(message, response=resp)
 
-    def decode(self, schema, resp, many=None, links=False):
-        json = resp.json()
-        resp_schema = ResponseSchema()
-        if many is True:
-            resp_schema = ListResponseSchema()
+    def decode(self, schema, resp, many=None, links=False, raw=None):
+        record = getattr(resp, 'cdr_record', None)
+        if record is None:
+            return self._decode(schema, resp, many=many, links=links, raw=raw)
+
+        start = time.perf_counter()
+        try:
+            return self._decode(schema, resp, many=many, links=links, raw=raw)
+        finally:
+            record.decode_time += time.perf_counter() - start
+            for i in self.instruments:
+                i.after_decode(record)
+
+    def _decode(self, schema, resp, many=None, links=False, raw=None):
+        json = self.loads(resp.content)
+
+        if raw is None:
+            raw = self.raw
+
+        if raw:
+            if not isinstance(json, dict) or json.get('data') is None:
+                raise CDRouterError('no data field in JSON response!', response=resp)
+
+            if many is True and links is True and json.get('links') is not None:
+                return (json['data'], cdr_decoder.decode(LinksSchema(), json['links']))
+
+            return json['data']
+
+        if self.validate:
+            resp_schema = ResponseSchema()
+            if many is True:
+                resp_schema = ListResponseSchema()
+
+            result = resp_schema.load(json, unknown=EXCLUDE)
+
+            if result.data is None:
+                raise CDRouterError('no data field in JSON response!', response=resp)
+
+            data = schema.load(result.data, unknown=EXCLUDE, many=many)
+
+            if many is True and links is True and result.links is not None:
+                return (data, result.links)
 
-        result = resp_schema.load(json, unknown=EXCLUDE)
+            return data
 
-        if result.data is None:
+        if json.get('data') is None:
             raise CDRouterError('no data field in JSON response!', response=resp)
 
-        data = schema.load(result.data, unknown=EXCLUDE, many=many)
+        data = cdr_decoder.decode(schema, json['data'], many=many)
 
-        if many is True and links is True and result.links is not None:
-            return (data, result.links)
+        if many is True and links is True and json.get('links') is not None:
+            return (data, cdr_decoder.decode(LinksSchema(), json['links']))
 
         return data
 
@@ -453,11 +1086,13 @@ class CDRouter(object):
                 resp = self.post(self.base+'/authenticate', params={'username': username, 'password': password})
 
                 schema = UserSchema()
-                u = self.decode(schema, resp)
+                u = self.decode(schema, resp, raw=False)
 
                 if u.token is not None:
                     with self.lock:
                         self.token = u.token
+                        self.auth_mode = AUTH_MODE_TOKEN
+                        self._authenticated = True
                     break
             except CDRouterError as cde:
                 password = None
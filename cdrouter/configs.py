@@ -271,6 +271,7 @@ class ConfigsService(object):
 
         :param args: Arguments that ``list`` takes.
         :param kwargs: Optional arguments that ``list`` takes.
+        :param prefetch: (optional) After the first page, fetch the remaining pages using up to this many concurrent requests as an int.
         :return: :class:`configs.Config <configs.Config>` list
 
         """
@@ -388,13 +389,15 @@ class ConfigsService(object):
         """
         return self.service.edit_shares(self.base, id, user_ids)
 
-    def export(self, id): # pylint: disable=invalid-name,redefined-builtin
+    def export(self, id, dest=None, progress=None): # pylint: disable=invalid-name,redefined-builtin
         """Export a config.
 
         :param id: Config ID as an int.
-        :rtype: tuple `(io.BytesIO, 'filename')`
+        :param dest: (optional) Filepath, directory or writable binary file-like object to stream the export to instead of an ``io.BytesIO``.
+        :param progress: (optional) Function called as ``progress(nbytes, total)`` as each chunk is written.
+        :rtype: tuple `(io.BytesIO, 'filename')`, or `(dest, 'filename')` if ``dest`` is set
         """
-        return self.service.export(self.base, id)
+        return self.service.export(self.base, id, dest=dest, progress=progress)
 
     def check_config(self, contents):
         """Process config contents with cdrouter-cli -check-config.
@@ -445,13 +448,15 @@ class ConfigsService(object):
                                  params={'process': 'interfaces'}, json={'contents': contents})
         return self.service.decode(schema, resp, many=True)
 
-    def bulk_export(self, ids):
+    def bulk_export(self, ids, dest=None, progress=None):
         """Bulk export a set of configs.
 
         :param ids: Int list of config IDs.
-        :rtype: tuple `(io.BytesIO, 'filename')`
+        :param dest: (optional) Filepath, directory or writable binary file-like object to stream the export to instead of an ``io.BytesIO``.
+        :param progress: (optional) Function called as ``progress(nbytes, total)`` as each chunk is written.
+        :rtype: tuple `(io.BytesIO, 'filename')`, or `(dest, 'filename')` if ``dest`` is set
         """
-        return self.service.bulk_export(self.base, ids)
+        return self.service.bulk_export(self.base, ids, dest=dest, progress=progress)
 
     def bulk_copy(self, ids):
         """Bulk copy a set of configs.
@@ -471,6 +476,10 @@ class ConfigsService(object):
         :param type: (optional) `union` or `inter` as string.
         :param all: (optional) Apply to all if bool `True`.
         :param testvars: (optional) :class:`configs.ConfigTestvars <configs.ConfigTestvars>` list
+        :return: `requests.Response` object, or a :class:`cdrouter.BulkReport
+            <cdrouter.BulkReport>` object if ``ids`` was split into one
+            request per ``bulk_chunk_size`` IDs.
+        :raises cdrouter.cdr_error.BulkError: If ``ids`` was split and any request failed.
         """
         schema = self.EDIT_SCHEMA
         _fields = self.service.encode(schema, _fields, skip_none=True)
@@ -489,13 +498,18 @@ class ConfigsService(object):
         :param type: (optional) `union` or `inter` as string.
         :param all: (optional) Apply to all if bool `True`.
         :param migrate: (optional) Migrate configs in addition to upgrading them if bool `True`.
+        :return: `requests.Response` object, or a :class:`cdrouter.BulkReport
+            <cdrouter.BulkReport>` object if ``ids`` was split into one
+            request per ``bulk_chunk_size`` IDs.
+        :raises cdrouter.cdr_error.BulkError: If ``ids`` was split and any request failed.
         """
-        json = {}
-        if ids is not None:
-            json[self.RESOURCE] = [{'id': str(x)} for x in ids]
+        params = {'bulk': 'upgrade', 'filter': filter, 'type': type, 'all': all, 'migrate': migrate}
+        if ids is None:
+            return self.service.post(self.base, params=params, json={})
 
-        return self.service.post(self.base,
-                                 params={'bulk': 'upgrade', 'filter': filter, 'type': type, 'all': all, 'migrate': migrate}, json=json)
+        def upgrade(ids):
+            return self.service.post(self.base, params=params, json={self.RESOURCE: [{'id': str(x)} for x in ids]})
+        return self.service.bulk_ids(upgrade, ids)
 
     def bulk_delete(self, ids=None, filter=None, type=None, all=False): # pylint: disable=redefined-builtin
         """Bulk delete a set of configs.
@@ -504,6 +518,10 @@ class ConfigsService(object):
         :param filter: (optional) String list of filters.
         :param type: (optional) `union` or `inter` as string.
         :param all: (optional) Apply to all if bool `True`.
+        :return: `requests.Response` object, or a :class:`cdrouter.BulkReport
+            <cdrouter.BulkReport>` object if ``ids`` was split into one
+            request per ``bulk_chunk_size`` IDs.
+        :raises cdrouter.cdr_error.BulkError: If ``ids`` was split and any request failed.
         """
         return self.service.bulk_delete(self.base, self.RESOURCE,
                                         ids=ids, filter=filter, type=type, all=all)
@@ -229,6 +229,7 @@ class DevicesService(object):
 
         :param args: Arguments that ``list`` takes.
         :param kwargs: Optional arguments that ``list`` takes.
+        :param prefetch: (optional) After the first page, fetch the remaining pages using up to this many concurrent requests as an int.
         :return: :class:`devices.Device <devices.Device>` list
 
         """
@@ -331,13 +332,15 @@ class DevicesService(object):
         """
         return self.service.edit_shares(self.base, id, user_ids)
 
-    def export(self, id): # pylint: disable=invalid-name,redefined-builtin
+    def export(self, id, dest=None, progress=None): # pylint: disable=invalid-name,redefined-builtin
         """Export a device.
 
         :param id: Device ID as an int.
-        :rtype: tuple `(io.BytesIO, 'filename')`
+        :param dest: (optional) Filepath, directory or writable binary file-like object to stream the export to instead of an ``io.BytesIO``.
+        :param progress: (optional) Function called as ``progress(nbytes, total)`` as each chunk is written.
+        :rtype: tuple `(io.BytesIO, 'filename')`, or `(dest, 'filename')` if ``dest`` is set
         """
-        return self.service.export(self.base, id)
+        return self.service.export(self.base, id, dest=dest, progress=progress)
 
     def get_connection(self, id): # pylint: disable=invalid-name,redefined-builtin
         """Get information on proxy connection to a device's management interface.
@@ -390,13 +393,15 @@ class DevicesService(object):
         resp = self.service.post(self.base+str(id)+'/power/off/')
         return self.service.decode(schema, resp)
 
-    def bulk_export(self, ids):
+    def bulk_export(self, ids, dest=None, progress=None):
         """Bulk export a set of devices.
 
         :param ids: Int list of device IDs.
-        :rtype: tuple `(io.BytesIO, 'filename')`
+        :param dest: (optional) Filepath, directory or writable binary file-like object to stream the export to instead of an ``io.BytesIO``.
+        :param progress: (optional) Function called as ``progress(nbytes, total)`` as each chunk is written.
+        :rtype: tuple `(io.BytesIO, 'filename')`, or `(dest, 'filename')` if ``dest`` is set
         """
-        return self.service.bulk_export(self.base, ids)
+        return self.service.bulk_export(self.base, ids, dest=dest, progress=progress)
 
     def bulk_copy(self, ids):
         """Bulk copy a set of devices.
@@ -415,6 +420,10 @@ class DevicesService(object):
         :param filter: (optional) String list of filters.
         :param type: (optional) `union` or `inter` as string.
         :param all: (optional) Apply to all if bool `True`.
+        :return: `requests.Response` object, or a :class:`cdrouter.BulkReport
+            <cdrouter.BulkReport>` object if ``ids`` was split into one
+            request per ``bulk_chunk_size`` IDs.
+        :raises cdrouter.cdr_error.BulkError: If ``ids`` was split and any request failed.
         """
         schema = DeviceSchema(exclude=('id', 'created', 'updated', 'result_id', 'attachments_dir'))
         _fields = self.service.encode(schema, _fields, skip_none=True)
@@ -428,6 +437,10 @@ class DevicesService(object):
         :param filter: (optional) String list of filters.
         :param type: (optional) `union` or `inter` as string.
         :param all: (optional) Apply to all if bool `True`.
+        :return: `requests.Response` object, or a :class:`cdrouter.BulkReport
+            <cdrouter.BulkReport>` object if ``ids`` was split into one
+            request per ``bulk_chunk_size`` IDs.
+        :raises cdrouter.cdr_error.BulkError: If ``ids`` was split and any request failed.
         """
         return self.service.bulk_delete(self.base, self.RESOURCE, ids=ids,
                                         filter=filter, type=type, all=all)
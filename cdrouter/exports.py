@@ -5,10 +5,6 @@
 
 """Module for accessing CDRouter Exports."""
 
-import io
-
-from requests_toolbelt.downloadutils import stream
-
 class ExportsService(object):
     """Service for accessing CDRouter Exports."""
 
@@ -19,7 +15,7 @@ class ExportsService(object):
         self.service = service
         self.base = self.BASE
 
-    def bulk_export(self, config_ids=None, device_ids=None, package_ids=None, result_ids=None, exclude_captures=False):
+    def bulk_export(self, config_ids=None, device_ids=None, package_ids=None, result_ids=None, exclude_captures=False, dest=None, progress=None):
         """Bulk export a set of configs, devices, packages and results.
 
         :param config_ids: (optional) Int list of config IDs.
@@ -27,7 +23,9 @@ class ExportsService(object):
         :param package_ids: (optional) Int list of package IDs.
         :param result_ids: (optional) Int list of result IDs.
         :param exclude_captures: (optional) Exclude capture files if bool `True`.
-        :rtype: tuple `(io.BytesIO, 'filename')`
+        :param dest: (optional) Filepath, directory or writable binary file-like object to stream the export to instead of an ``io.BytesIO``.
+        :param progress: (optional) Function called as ``progress(nbytes, total)`` as each chunk is written.
+        :rtype: tuple `(io.BytesIO, 'filename')`, or `(dest, 'filename')` if ``dest`` is set
         """
         if config_ids is None:
             config_ids = []
@@ -45,8 +43,4 @@ class ExportsService(object):
             'options': {'exclude_captures': exclude_captures}
         }
         resp = self.service.post(self.base, json=json, stream=True)
-        b = io.BytesIO()
-        stream.stream_response_to_file(resp, path=b)
-        resp.close()
-        b.seek(0)
-        return (b, self.service.filename(resp))
+        return self.service.download(resp, dest=dest, progress=progress)
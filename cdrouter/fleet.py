@@ -0,0 +1,203 @@
+#
+# Copyright (c) 2026 by QA Cafe.
+# All Rights Reserved.
+#
+
+"""Module for querying many CDRouter systems at once."""
+
+from collections import namedtuple, OrderedDict
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError, wait
+
+class FleetResult(namedtuple('FleetResult', ['data', 'errors'])):
+    """Named tuple for the outcome of running a call on every system of a
+    :class:`fleet.CDRouterFleet <fleet.CDRouterFleet>`.
+
+    :param data: Dict of system names to return values, for systems where the call succeeded.
+    :param errors: Dict of system names to exceptions, for systems where the call failed or timed out.
+    """
+
+class FleetRecord(namedtuple('FleetRecord', ['system', 'data'])):
+    """Named tuple for a record returned by :func:`fleet.CDRouterFleet.list
+    <fleet.CDRouterFleet.list>`.
+
+    :param system: Name of the system the record came from as a string.
+    :param data: Record, for example a :class:`results.Result <results.Result>` object.
+    """
+
+class FleetPage(namedtuple('FleetPage', ['data', 'errors'])):
+    """Named tuple for the merged list returned by :func:`fleet.CDRouterFleet.list
+    <fleet.CDRouterFleet.list>`.
+
+    :param data: :class:`fleet.FleetRecord <fleet.FleetRecord>` list
+    :param errors: Dict of system names to exceptions, for systems where listing failed or timed out.
+    """
+
+class FleetService(object):
+    """Wrapper running a service's methods on every system of a
+    :class:`fleet.CDRouterFleet <fleet.CDRouterFleet>`, so that
+    ``fleet.results.get(id)`` calls ``c.results.get(id)`` on each
+    system concurrently and returns a :class:`fleet.FleetResult
+    <fleet.FleetResult>`.
+
+    :param fleet: :class:`fleet.CDRouterFleet <fleet.CDRouterFleet>` object
+    :param name: Service attribute name, for example ``'results'``.
+    """
+    def __init__(self, fleet, name):
+        self.fleet = fleet
+        self.name = name
+
+    def __getattr__(self, attr):
+        if attr.startswith('_'):
+            raise AttributeError(attr)
+
+        def method(*args, **kwargs):
+            return self.fleet.call(lambda c: getattr(getattr(c, self.name), attr)(*args, **kwargs))
+        method.__name__ = attr
+        return method
+
+def _sort_key(sort):
+    # key function and direction for the first field of a CDRouter
+    # sort parameter such as '-created' or ['+name', '-id']
+    if isinstance(sort, (list, tuple)):
+        sort = sort[0]
+    reverse = sort.startswith('-')
+    name = sort.lstrip('+-')
+
+    def key(record):
+        value = record.get(name) if isinstance(record, dict) else getattr(record, name, None)
+        # None sorts first
+        return (value is not None, value)
+    return key, reverse
+
+class CDRouterFleet(object):
+    """Client for running the same CDRouter Web API calls on many
+    CDRouter systems concurrently.  Failures and timeouts are
+    reported per system rather than failing the whole call.
+
+    Usage::
+
+      from cdrouter import CDRouter
+      from cdrouter.fleet import CDRouterFleet
+      from cdrouter.filters import Field as field
+
+      fleet = CDRouterFleet({
+          'lab1': CDRouter('http://lab1', token=token),
+          'lab2': CDRouter('http://lab2', token=token),
+      }, timeout=30)
+
+      # scatter a single call
+      hostnames = fleet.system.hostname()
+      print(hostnames.data, hostnames.errors)
+
+      # gather a merged, sorted list
+      page = fleet.list('results', filter=[field('fail').gt(0)], sort='-created')
+      for r in page.data:
+          print(r.system, r.data.id)
+
+    :param systems: Dict of system names to :class:`cdrouter.CDRouter
+        <cdrouter.CDRouter>` objects, or a list of CDRouter objects
+        named by their ``base`` URLs.
+    :param workers: (optional) Maximum number of concurrent calls as an
+        int, defaults to two per system.
+    :param timeout: (optional) Seconds to wait for all systems to
+        answer a call as an int or float.  Systems that have not
+        answered are reported as having failed with
+        `concurrent.futures.TimeoutError`.  Each request a call makes
+        is also given this timeout, so that its worker is freed.
+    """
+    #: Names of the services each system is queried through.
+    SERVICES = ('alerts', 'configs', 'devices', 'attachments', 'jobs', 'packages', 'results', 'tests',
+                'annotations', 'captures', 'highlights', 'imports', 'exports', 'history', 'system',
+                'tags', 'testsuites', 'users')
+
+    def __init__(self, systems, workers=None, timeout=None):
+        if not isinstance(systems, dict):
+            systems = OrderedDict((c.base, c) for c in systems)
+        self.systems = OrderedDict(systems)
+        self.timeout = timeout
+        self.pool = ThreadPoolExecutor(max_workers=workers or max(1, 2*len(self.systems)))
+
+        for name in self.SERVICES:
+            setattr(self, name, FleetService(self, name))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        """Stop the fleet's worker threads, without waiting for calls
+        that timed out to finish."""
+        self.pool.shutdown(wait=False)
+
+    def call(self, fn, timeout=None):
+        """Call ``fn(c)`` for every system's :class:`cdrouter.CDRouter
+        <cdrouter.CDRouter>` object concurrently.
+
+        :param fn: Function taking a CDRouter object.
+        :param timeout: (optional) Seconds to wait as an int or float, overriding the fleet's ``timeout``.
+        :return: :class:`fleet.FleetResult <fleet.FleetResult>` object
+        :rtype: fleet.FleetResult
+        """
+        if timeout is None:
+            timeout = self.timeout
+
+        def run(c):
+            if timeout is None:
+                return fn(c)
+            # each request gives up after timeout too, else a system
+            # that stops answering would hold a worker until the
+            # client's own timeout, and enough such calls would leave
+            # none for the other systems
+            with c.request_timeout(timeout):
+                return fn(c)
+
+        futures = OrderedDict((self.pool.submit(run, c), name) for name, c in self.systems.items())
+        done, _ = wait(futures, timeout=timeout)
+
+        data = OrderedDict()
+        errors = OrderedDict()
+        for f, name in futures.items():
+            if f not in done:
+                f.cancel()
+                errors[name] = FutureTimeoutError('{} did not answer within {}s'.format(name, timeout))
+            elif f.exception() is not None:
+                errors[name] = f.exception()
+            else:
+                data[name] = f.result()
+        return FleetResult(data, errors)
+
+    def list(self, service, *args, sort=None, key=None, reverse=None, timeout=None, **kwargs):
+        """Get all records of a ``list`` call from every system, merged into
+        a single list in ``sort`` order.  Each system is paged through
+        with its service's ``iter_list`` concurrently.
+
+        :param service: Service attribute name, for example ``'results'`` or ``'tests'``.
+        :param args: Arguments that the service's ``list`` takes.
+        :param sort: (optional) Sort fields to apply as string list,
+            passed to each system.  The first field is also used to
+            merge the systems' lists, for example ``'-created'``.
+        :param key: (optional) Function taking a record and returning
+            its merge key, overriding ``sort``.
+        :param reverse: (optional) If bool `True`, ``key`` sorts in descending order.
+        :param timeout: (optional) Seconds to wait as an int or float, overriding the fleet's ``timeout``.
+        :param kwargs: Optional arguments that the service's ``list`` takes.
+        :return: :class:`fleet.FleetPage <fleet.FleetPage>` object
+        :rtype: fleet.FleetPage
+        """
+        if sort is not None:
+            kwargs['sort'] = sort
+            if key is None:
+                key, sort_reverse = _sort_key(sort)
+                if reverse is None:
+                    reverse = sort_reverse
+
+        result = self.call(lambda c: list(getattr(c, service).iter_list(*args, **kwargs)), timeout=timeout)
+
+        records = [FleetRecord(name, d) for name, data in result.data.items() for d in data]
+        if key is not None:
+            # each system's list is already sorted, which sorted()
+            # merges in linear time
+            records.sort(key=lambda r: key(r.data), reverse=bool(reverse))
+        return FleetPage(records, result.errors)
@@ -88,6 +88,7 @@ class HistoryService(object):
 
         :param args: Arguments that ``list`` takes.
         :param kwargs: Optional arguments that ``list`` takes.
+        :param prefetch: (optional) After the first page, fetch the remaining pages using up to this many concurrent requests as an int.
         :return: :class:`historys.History <historys.History>` list
 
         """
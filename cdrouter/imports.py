@@ -160,16 +160,16 @@ class ImportsService(object):
         resp = self.service.list(self.base)
         return self.service.decode(schema, resp, many=True)
 
-    def stage_import_from_file(self, fd, filename='upload.gz'):
+    def stage_import_from_file(self, fd, filename='upload.gz', progress=None):
         """Stage an import from a file upload.
 
         :param fd: File-like object to upload.
         :param filename: (optional) Filename to use for import as string.
+        :param progress: (optional) Function called as ``progress(nbytes, total)`` as the file is uploaded, see :func:`cdrouter.CDRouter.upload <cdrouter.CDRouter.upload>`.
         :return: :class:`imports.Import <imports.Import>` object
         """
         schema = ImportSchema()
-        resp = self.service.post(self.base,
-                                 files={'file': (filename, fd)})
+        resp = self.service.upload(self.base, fd, filename, progress=progress)
         return self.service.decode(schema, resp)
 
     def stage_import_from_filesystem(self, filepath):
@@ -0,0 +1,363 @@
+#
+# Copyright (c) 2026 by QA Cafe.
+# All Rights Reserved.
+#
+
+"""Module for instrumenting CDRouter Web API requests.
+
+A :class:`cdrouter.CDRouter <cdrouter.CDRouter>` object created with
+``instruments`` calls each instrument's hooks around every request it
+makes and every response it decodes, passing a
+:class:`instrumentation.RequestRecord
+<instrumentation.RequestRecord>` describing the request.
+:class:`instrumentation.RequestMetrics
+<instrumentation.RequestMetrics>` is a built-in instrument keeping
+latency histograms and counters per endpoint, which
+:func:`instrumentation.exposition <instrumentation.exposition>`
+renders in the Prometheus or OpenMetrics text format.
+"""
+
+from bisect import bisect_left
+from functools import lru_cache
+import re
+from threading import Lock
+import time
+
+#: Content type of the Prometheus text format.
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+#: Content type of the OpenMetrics text format.
+OPENMETRICS_CONTENT_TYPE = 'application/openmetrics-text; version=1.0.0; charset=utf-8'
+
+#: Default histogram bucket upper bounds in seconds.
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# resources whose members are not named by an ID
+_COLLECTIONS = {
+    'results', 'tests', 'alerts', 'configs', 'devices', 'attachments', 'jobs', 'packages',
+    'annotations', 'captures', 'highlights', 'imports', 'exports', 'history', 'tags',
+    'testsuites', 'users', 'groups', 'modules', 'labels', 'errors', 'testvars', 'metrics', 'logdir',
+}
+# name of the path parameter following a collection, if not {id}
+_PARAMS = {
+    'tests': 'seq',
+    'alerts': 'idx',
+    'annotations': 'seq',
+    'captures': 'interface',
+    'metrics': 'name',
+    'tags': 'name',
+    'groups': 'name',
+    'modules': 'name',
+    'labels': 'name',
+    'errors': 'name',
+    'testvars': 'name',
+    'logdir': 'name',
+}
+
+@lru_cache(maxsize=1024)
+def path_template(path):
+    """Get the endpoint of a request path, with the IDs and names of
+    resources replaced by placeholders, for example
+    ``'results/{id}/tests/{seq}/log/'`` for
+    ``'results/20220821222306/tests/4/log/'``.
+
+    :param path: Request path as a string.
+    :return: Path template as a string.
+    """
+    parts = path.strip('/').split('/')
+    out = []
+    prev = None
+    for part in parts:
+        if prev == 'logdir':
+            # logdir filenames may have directories of their own
+            out.append('{' + _PARAMS[prev] + '}')
+            break
+        if prev in _COLLECTIONS and part not in _COLLECTIONS:
+            name = _PARAMS.get(prev, 'id')
+            if prev == 'tests' and not part.isdigit():
+                # testsuite tests are named rather than numbered
+                name = 'name'
+            part = '{' + name + '}'
+            prev = None
+        else:
+            prev = part
+        out.append(part)
+    return '/'.join(out) + '/'
+
+class RequestRecord(object):
+    """Class describing a request made by a :class:`cdrouter.CDRouter
+    <cdrouter.CDRouter>` object, passed to instrument hooks.
+
+    :param method: HTTP method as a string.
+    :param path: Request path as a string, relative to the API base URL.
+    """
+    def __init__(self, method, path):
+        #: HTTP method as a string.
+        self.method = method
+        #: Request path as a string.
+        self.path = path
+        #: Endpoint of the request as a string, see :func:`instrumentation.path_template <instrumentation.path_template>`.
+        self.template = path_template(path)
+        #: HTTP status code as an int, or `None` if no response was received.
+        self.status = None
+        #: Request body size in bytes as an int.
+        self.bytes_out = 0
+        #: Response body size in bytes as an int, taken from the
+        #: Content-Length header for streamed responses.
+        self.bytes_in = 0
+        #: Seconds from the start of the request until the response was received, as a float.
+        self.elapsed = 0.0
+        #: Seconds the CDRouter system took to send the response headers, as a float.
+        self.server_time = 0.0
+        #: Seconds spent decoding the response into models, as a float.
+        self.decode_time = 0.0
+        #: Number of times the request was sent again, for example after an expired token, as an int.
+        self.retries = 0
+        #: ``'hit'`` if answered from the response cache,
+        #: ``'revalidated'`` if renewed by a ``304 Not Modified``
+        #: answer, otherwise `None`.
+        self.cache = None
+        #: Exception raised by the request, or `None`.
+        self.error = None
+        self.started = time.perf_counter()
+
+    def sent(self, resp):
+        # account for a response, including those answered again
+        if resp is None:
+            return
+        self.status = resp.status_code
+        request = getattr(resp, 'request', None)
+        body = getattr(request, 'body', None)
+        if isinstance(body, (bytes, str)):
+            self.bytes_out = len(body)
+        elif isinstance(getattr(body, 'len', None), int):
+            # streamed multipart upload
+            self.bytes_out = body.len
+        elapsed = getattr(resp, 'elapsed', None)
+        if elapsed is not None:
+            self.server_time = elapsed.total_seconds()
+
+    def finish(self, resp=None, error=None):
+        self.elapsed = time.perf_counter() - self.started
+        self.error = error
+        if resp is None:
+            return
+        self.status = resp.status_code
+        if getattr(resp, '_content_consumed', False) and resp._content: # pylint: disable=protected-access
+            self.bytes_in = len(resp._content) # pylint: disable=protected-access
+        else:
+            self.bytes_in = int(resp.headers.get('content-length') or 0)
+
+class Instrument(object):
+    """Base class for instruments, with hooks that do nothing.
+    Subclasses override the hooks they need.  Hooks are called from
+    the thread making the request."""
+
+    def before_request(self, record):
+        """Called before a request is sent.
+
+        :param record: :class:`instrumentation.RequestRecord <instrumentation.RequestRecord>` object
+        """
+
+    def after_request(self, record):
+        """Called after a request completed or failed.
+
+        :param record: :class:`instrumentation.RequestRecord <instrumentation.RequestRecord>` object
+        """
+
+    def after_decode(self, record):
+        """Called after a response was decoded, with ``decode_time`` set.
+
+        :param record: :class:`instrumentation.RequestRecord <instrumentation.RequestRecord>` object
+        """
+
+class Histogram(object):
+    """Class for a cumulative histogram of observed values.
+
+    :param buckets: (optional) Sorted bucket upper bounds as a float list.
+    """
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        #: Count per bucket as an int list, the last being for values above every bound.
+        self.counts = [0] * (len(self.buckets) + 1)
+        #: Sum of observed values as a float.
+        self.sum = 0.0
+        #: Count of observed values as an int.
+        self.count = 0
+
+    def observe(self, value):
+        """Add a value to the histogram.
+
+        :param value: Value as an int or float.
+        """
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self):
+        """Get the cumulative count of each bucket.
+
+        :return: List of `(bound, count)` tuples, ending with `(float('inf'), count)`.
+        """
+        out = []
+        total = 0
+        for bound, n in zip(self.buckets + (float('inf'),), self.counts):
+            total += n
+            out.append((bound, total))
+        return out
+
+    def quantile(self, q):
+        """Estimate a quantile, by linear interpolation within its bucket.
+
+        :param q: Quantile between 0 and 1 as a float, for example ``0.99``.
+        :return: Estimated value as a float, or `None` if nothing was observed.
+        """
+        if self.count == 0:
+            return None
+        rank = q * self.count
+        lower = 0.0
+        seen = 0
+        for bound, n in zip(self.buckets, self.counts):
+            if n and seen + n >= rank:
+                return lower + (bound - lower) * (rank - seen) / n
+            seen += n
+            lower = bound
+        return self.buckets[-1] if self.buckets else None
+
+class RequestMetrics(Instrument):
+    """Instrument keeping request counts, byte counts and latency
+    histograms per endpoint, keyed by HTTP method and path template.
+
+    Usage::
+
+      from cdrouter import CDRouter
+      from cdrouter.instrumentation import RequestMetrics, exposition
+
+      metrics = RequestMetrics()
+      c = CDRouter('http://localhost', instruments=[metrics])
+      ...
+      for (method, template), h in metrics.latency.items():
+          print(method, template, h.count, h.quantile(0.99))
+      print(exposition(metrics))
+
+    :param buckets: (optional) Histogram bucket upper bounds in seconds as a float list.
+    """
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.lock = Lock()
+        #: Dict of `(method, template)` to request duration :class:`instrumentation.Histogram <instrumentation.Histogram>` objects.
+        self.latency = {}
+        #: Dict of `(method, template)` to server time :class:`instrumentation.Histogram <instrumentation.Histogram>` objects.
+        self.server = {}
+        #: Dict of `(method, template)` to decode time :class:`instrumentation.Histogram <instrumentation.Histogram>` objects.
+        self.decode = {}
+        #: Dict of `(method, template, status)` to request counts,
+        #: status being an HTTP status code as a string, ``'cached'``
+        #: or ``'error'`` if no response was received.
+        self.requests = {}
+        #: Dict of `(method, template)` to request body byte counts.
+        self.bytes_out = {}
+        #: Dict of `(method, template)` to response body byte counts.
+        self.bytes_in = {}
+        #: Dict of `(method, template)` to retry counts.
+        self.retries = {}
+
+    def _histogram(self, histograms, key):
+        h = histograms.get(key)
+        if h is None:
+            h = histograms[key] = Histogram(self.buckets)
+        return h
+
+    def after_request(self, record):
+        key = (record.method, record.template)
+        if record.cache == 'hit':
+            status = 'cached'
+        elif record.status is None:
+            status = 'error'
+        else:
+            status = str(record.status)
+        with self.lock:
+            self.requests[key + (status,)] = self.requests.get(key + (status,), 0) + 1
+            self._histogram(self.latency, key).observe(record.elapsed)
+            if record.cache != 'hit' and record.status is not None:
+                self._histogram(self.server, key).observe(record.server_time)
+            self.bytes_out[key] = self.bytes_out.get(key, 0) + record.bytes_out
+            self.bytes_in[key] = self.bytes_in.get(key, 0) + record.bytes_in
+            if record.retries:
+                self.retries[key] = self.retries.get(key, 0) + record.retries
+
+    def after_decode(self, record):
+        with self.lock:
+            self._histogram(self.decode, (record.method, record.template)).observe(record.decode_time)
+
+    def reset(self):
+        """Forget everything recorded so far."""
+        with self.lock:
+            for d in (self.latency, self.server, self.decode, self.requests, self.bytes_out, self.bytes_in, self.retries):
+                d.clear()
+
+_ESCAPE = re.compile(r'[\\"\n]')
+
+def _labels(names, values, extra=None):
+    pairs = list(zip(names, values))
+    if extra is not None:
+        pairs.append(extra)
+    return '{' + ','.join('{}="{}"'.format(k, _ESCAPE.sub(lambda m: {'\\': '\\\\', '"': '\\"', '\n': '\\n'}[m.group(0)], str(v)))
+                          for k, v in pairs) + '}'
+
+def _number(value):
+    if value == float('inf'):
+        return '+Inf'
+    if isinstance(value, float):
+        return repr(value)
+    return str(value)
+
+def exposition(metrics, openmetrics=False, prefix='cdrouter'):
+    """Render a :class:`instrumentation.RequestMetrics
+    <instrumentation.RequestMetrics>` object in the Prometheus text
+    format, for example to serve from a ``/metrics`` endpoint with
+    content type ``PROMETHEUS_CONTENT_TYPE``.
+
+    :param metrics: :class:`instrumentation.RequestMetrics <instrumentation.RequestMetrics>` object
+    :param openmetrics: (optional) If bool `True`, render the
+        OpenMetrics text format instead, served with content type
+        ``OPENMETRICS_CONTENT_TYPE``.
+    :param prefix: (optional) Metric name prefix as a string.
+    :return: Text as a string.
+    """
+    lines = []
+    labels = ('method', 'path')
+
+    def header(name, kind, text):
+        lines.append('# HELP {} {}'.format(name, text))
+        lines.append('# TYPE {} {}'.format(name, kind))
+
+    def counter(name, text, values, names=labels):
+        if not values:
+            return
+        # OpenMetrics counters are declared without their _total suffix
+        header(name if openmetrics else name+'_total', 'counter', text)
+        for key, value in sorted(values.items()):
+            lines.append('{}_total{} {}'.format(name, _labels(names, key), _number(value)))
+
+    def histogram(name, text, histograms):
+        if not histograms:
+            return
+        header(name, 'histogram', text)
+        for key, h in sorted(histograms.items()):
+            for bound, count in h.cumulative():
+                lines.append('{}_bucket{} {}'.format(name, _labels(labels, key, ('le', _number(float(bound)))), count))
+            lines.append('{}_sum{} {}'.format(name, _labels(labels, key), _number(float(h.sum))))
+            lines.append('{}_count{} {}'.format(name, _labels(labels, key), h.count))
+
+    with metrics.lock:
+        counter(prefix+'_requests', 'CDRouter Web API requests.', metrics.requests, labels + ('status',))
+        histogram(prefix+'_request_duration_seconds', 'Time spent on CDRouter Web API requests.', metrics.latency)
+        histogram(prefix+'_server_duration_seconds', 'Time until the CDRouter system sent response headers.', metrics.server)
+        histogram(prefix+'_decode_duration_seconds', 'Time spent decoding CDRouter Web API responses.', metrics.decode)
+        counter(prefix+'_request_bytes', 'Bytes sent in CDRouter Web API request bodies.', metrics.bytes_out)
+        counter(prefix+'_response_bytes', 'Bytes received in CDRouter Web API response bodies.', metrics.bytes_in)
+        counter(prefix+'_retries', 'CDRouter Web API requests sent again.', metrics.retries)
+
+    if openmetrics:
+        lines.append('# EOF')
+    return '\n'.join(lines) + '\n'
@@ -6,10 +6,16 @@
 """Module for accessing CDRouter Jobs."""
 
 from collections import namedtuple
+from concurrent.futures import Future
+from threading import Condition, Thread, current_thread
 
 from marshmallow import Schema, fields, post_load, EXCLUDE
+from . import cdr_decoder
 from .cdr_datetime import DateTime
+from .cdr_error import CDRouterError
 from .configs import InterfacesSchema, TestvarSchema
+from .filters import Field as field
+from .results import ResultsService, ResultSchema, FINISHED
 
 class Options(object):
     """Model for CDRouter Job Options.
@@ -129,6 +135,157 @@ class Page(namedtuple('Page', ['data', 'links'])):
     :param links: :class:`cdrouter.Links <cdrouter.Links>` object
     """
 
+class JobFuture(Future):
+    """Future for a launched job, resolving to its final
+    :class:`results.Result <results.Result>` object once the result
+    has completed, stopped or failed.  Returned by
+    :func:`jobs.JobsService.submit <jobs.JobsService.submit>`.
+
+    Cancelling the future stops tracking the job but does not stop
+    the job itself.
+
+    :param job: :class:`jobs.Job <jobs.Job>` object
+    """
+    def __init__(self, job):
+        super().__init__()
+        #: :class:`jobs.Job <jobs.Job>` object, updated as the job is polled.
+        self.job = job
+        #: `concurrent.futures.Future` resolving to the
+        #: :class:`results.Result <results.Result>` object created
+        #: when the job starts running.
+        self.started = Future()
+
+def _resolve(future, result=None, exception=None):
+    if future.done():
+        return
+    if exception is not None:
+        future.set_exception(exception)
+    else:
+        future.set_result(result)
+
+class JobScheduler(object):
+    """Thread polling the jobs launched by
+    :func:`jobs.JobsService.submit <jobs.JobsService.submit>` and
+    their results, resolving their :class:`jobs.JobFuture
+    <jobs.JobFuture>` objects.  Rather than one request per job, each
+    poll lists up to ``batch`` jobs or results at once with a
+    ``union`` of ``id`` filters.  The thread exits when there is
+    nothing left to track.
+
+    :param service: :class:`cdrouter.CDRouter <cdrouter.CDRouter>` object
+    :param interval: (optional) Seconds between polls as an int or float.
+    :param batch: (optional) Maximum number of IDs per list request as an int.
+    :param max_errors: (optional) Number of polls in a row which may
+        fail before every tracked future is failed with the last
+        error, as an int.
+    """
+    def __init__(self, service, interval=1, batch=100, max_errors=5):
+        self.service = service
+        self.interval = interval
+        self.batch = batch
+        self.max_errors = max_errors
+        self.cond = Condition()
+        # job ID -> future of jobs without a result yet
+        self.pending = {}
+        # result ID -> future of running results
+        self.running = {}
+        self.thread = None
+
+    def add(self, future):
+        """Track a job's future.
+
+        :param future: :class:`jobs.JobFuture <jobs.JobFuture>` object
+        """
+        with self.cond:
+            if future.job.result_id is not None:
+                self.running[future.job.result_id] = future
+            else:
+                self.pending[future.job.id] = future
+            if self.thread is None:
+                self.thread = Thread(target=self._run, daemon=True)
+                self.thread.start()
+
+    def _list(self, base, schema, ids, detailed=None):
+        # list up to batch resources by ID with a single request
+        found = {}
+        for i in range(0, len(ids), self.batch):
+            chunk = ids[i:i+self.batch]
+            resp = self.service.list(base, filter=[str(field('id').eq(x)) for x in chunk], type='union',
+                                     limit=len(chunk), detailed=detailed)
+            data, _ = self.service.decode(schema, resp, many=True, links=True, raw=False)
+            for d in data:
+                found[d.id] = d
+        return found
+
+    def poll(self):
+        """Poll the tracked jobs and results once."""
+        with self.cond:
+            pending = dict((k, f) for k, f in self.pending.items() if not f.cancelled())
+            self.pending = dict(pending)
+
+        if pending:
+            jobs = self._list(JobsService.BASE, JobSchema(), sorted(pending))
+            with self.cond:
+                for id, f in pending.items(): # pylint: disable=invalid-name,redefined-builtin
+                    j = jobs.get(id)
+                    if j is None:
+                        del self.pending[id]
+                        _resolve(f.started, exception=CDRouterError('job {} no longer exists'.format(id)))
+                        _resolve(f, exception=CDRouterError('job {} no longer exists'.format(id)))
+                    elif j.result_id is not None:
+                        del self.pending[id]
+                        f.job = j
+                        self.running[j.result_id] = f
+
+        with self.cond:
+            running = dict((k, f) for k, f in self.running.items() if not f.cancelled())
+            self.running = dict(running)
+
+        if running:
+            results = self._list(ResultsService.BASE, ResultSchema(), sorted(running), detailed=True)
+            with self.cond:
+                for id, f in running.items(): # pylint: disable=invalid-name,redefined-builtin
+                    r = results.get(id)
+                    if r is None:
+                        # not yet visible in the list
+                        continue
+                    _resolve(f.started, r)
+                    if r.status in FINISHED:
+                        del self.running[id]
+                        _resolve(f, r)
+
+    def _fail(self, e):
+        with self.cond:
+            futures = list(self.pending.values()) + list(self.running.values())
+            self.pending = {}
+            self.running = {}
+        for f in futures:
+            _resolve(f.started, exception=e)
+            _resolve(f, exception=e)
+
+    def _run(self):
+        errors = 0
+        try:
+            while True:
+                try:
+                    self.poll()
+                    errors = 0
+                except Exception as e: # pylint: disable=broad-except
+                    errors += 1
+                    if errors >= self.max_errors:
+                        self._fail(e)
+
+                with self.cond:
+                    if not self.pending and not self.running:
+                        self.thread = None
+                        return
+                    self.cond.wait(self.interval)
+        finally:
+            # so that add starts a new thread if this one dies
+            with self.cond:
+                if self.thread is current_thread():
+                    self.thread = None
+
 class JobsService(object):
     """Service for accessing CDRouter Jobs."""
 
@@ -138,6 +295,15 @@ class JobsService(object):
     def __init__(self, service):
         self.service = service
         self.base = self.BASE
+        self._scheduler = None
+
+    @property
+    def scheduler(self):
+        """:class:`jobs.JobScheduler <jobs.JobScheduler>` object shared by
+        ``submit`` and ``bulk_submit`` calls, created on first use."""
+        if self._scheduler is None:
+            self._scheduler = JobScheduler(self.service)
+        return self._scheduler
 
     def list(self, filter=None, type=None, sort=None, limit=None, page=None, detailed=None): # pylint: disable=redefined-builtin
         """Get a list of jobs, using summary representation by default (see
@@ -164,6 +330,7 @@ class JobsService(object):
 
         :param args: Arguments that ``list`` takes.
         :param kwargs: Optional arguments that ``list`` takes.
+        :param prefetch: (optional) After the first page, fetch the remaining pages using up to this many concurrent requests as an int.
         :return: :class:`jobs.Job <jobs.Job>` list
 
         """
@@ -208,6 +375,42 @@ class JobsService(object):
         resp = self.service.create(self.base, json)
         return self.service.decode(schema, resp)
 
+    def submit(self, resource):
+        """Launch a new job and return a future for its result.
+
+        Usage::
+
+          f = c.jobs.submit(Job(package_id=package.id))
+          print('started', f.started.result().id)
+          r = f.result()
+          print('finished', r.status, r.result)
+
+        :param resource: :class:`jobs.Job <jobs.Job>` object
+        :return: :class:`jobs.JobFuture <jobs.JobFuture>` object
+        :rtype: jobs.JobFuture
+        """
+        f = JobFuture(self._model(self.launch(resource)))
+        self.scheduler.add(f)
+        return f
+
+    def bulk_submit(self, jobs):
+        """Bulk launch a set of jobs and return a future for each one's
+        result.  All futures are resolved by the same polling thread.
+
+        :param jobs: :class:`jobs.Job <jobs.Job>` list
+        :return: :class:`jobs.JobFuture <jobs.JobFuture>` list
+        """
+        futures = [JobFuture(self._model(j)) for j in self.bulk_launch(jobs=jobs)]
+        for f in futures:
+            self.scheduler.add(f)
+        return futures
+
+    def _model(self, j):
+        # submit needs models even if the client returns raw dicts
+        if isinstance(j, dict):
+            return cdr_decoder.decode(JobSchema(), j)
+        return j
+
     def delete(self, id): # pylint: disable=invalid-name,redefined-builtin
         """Delete a job.
 
@@ -230,7 +433,9 @@ class JobsService(object):
         return self.service.decode(schema, resp, many=True)
 
     def bulk_launch(self, jobs=None, _fields=None, filter=None, type=None, all=False): # pylint: disable=redefined-builtin
-        """Bulk launch a set of jobs.
+        """Bulk launch a set of jobs.  A ``jobs`` list longer than the
+        client's ``bulk_chunk_size`` is launched one chunk at a time,
+        so that jobs are queued in order.
 
         :param jobs: :class:`jobs.Job <jobs.Job>` list
         :param _fields: :class:`jobs.Job <jobs.Job>` object
@@ -238,20 +443,26 @@ class JobsService(object):
         :param type: (optional) `union` or `inter` as string.
         :param all: (optional) Apply to all if bool `True`.
         :return: :class:`jobs.Job <jobs.Job>` list
+        :raises cdrouter.cdr_error.BulkError: If ``jobs`` was split and any chunk failed to launch.
         """
-        json = {}
+        schema = JobSchema()
+        params = {'bulk': 'launch', 'filter': filter, 'type': type, 'all': all}
+
         if jobs is not None:
-            schema = JobSchema()
-            jobs_json = self.service.encode(schema, jobs, many=True)
-            json[self.RESOURCE] = jobs_json
-        elif _fields is not None:
-            schema = JobSchema(exclude=('id', 'active', 'status', 'package_name', 'config_name', 'device_name', 'result_id', 'user_id', 'created', 'updated', 'automatic', 'interfaces', 'interface_names', 'uses_wireless', 'uses_ics', 'ics_interface_name'))
-            jobs_json = self.service.encode(schema, _fields)
-            json['fields'] = jobs_json
+            def launch(jobs):
+                json = {self.RESOURCE: self.service.encode(JobSchema(), jobs, many=True)}
+                resp = self.service.post(self.base, params=params, json=json)
+                return self.service.decode(schema, resp, many=True)
 
-        schema = JobSchema()
-        resp = self.service.post(self.base,
-                                 params={'bulk': 'launch', 'filter': filter, 'type': type, 'all': all}, json=json)
+            report = self.service.bulk(launch, jobs, workers=1)
+            return [j for result in report.results for j in result]
+
+        json = {}
+        if _fields is not None:
+            fields_schema = JobSchema(exclude=('id', 'active', 'status', 'package_name', 'config_name', 'device_name', 'result_id', 'user_id', 'created', 'updated', 'automatic', 'interfaces', 'interface_names', 'uses_wireless', 'uses_ics', 'ics_interface_name'))
+            json['fields'] = self.service.encode(fields_schema, _fields)
+
+        resp = self.service.post(self.base, params=params, json=json)
         return self.service.decode(schema, resp, many=True)
 
     def bulk_delete(self, ids=None, filter=None, type=None, all=False): # pylint: disable=redefined-builtin
@@ -261,5 +472,9 @@ class JobsService(object):
         :param filter: (optional) String list of filters.
         :param type: (optional) `union` or `inter` as string.
         :param all: (optional) Apply to all if bool `True`.
+        :return: `requests.Response` object, or a :class:`cdrouter.BulkReport
+            <cdrouter.BulkReport>` object if ``ids`` was split into one
+            request per ``bulk_chunk_size`` IDs.
+        :raises cdrouter.cdr_error.BulkError: If ``ids`` was split and any request failed.
         """
         return self.service.bulk_delete(self.base, self.RESOURCE, ids=ids, filter=filter, type=type, all=all)
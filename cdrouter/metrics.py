@@ -69,6 +69,11 @@ class Bandwidth(object):
     :param server_device: (optional) Server device as a string.
     :param seq: (optional) TestResult sequence ID as an int.
     """
+    __slots__ = ('log_file', 'timestamp', 'metric', 'bandwidth', 'bandwidth_units', 'result',
+                 'client_interface', 'server_interface', 'streams', 'protocol', 'direction',
+                 'loss_percentage', 'loss_percentage_units', 'client_device', 'server_device',
+                 'seq')
+
     def __init__(self, **kwargs):
         self.log_file = kwargs.get('log_file', None)
         self.timestamp = kwargs.get('timestamp', None)
@@ -128,6 +133,10 @@ class Latency(object):
     :param upload_latency_units: (optional) Upload latency units as a string.
     :param seq: (optional) TestResult sequence ID as an int.
     """
+    __slots__ = ('log_file', 'timestamp', 'metric', 'total_latency', 'total_latency_units',
+                 'result', 'interface', 'download_latency', 'download_latency_units',
+                 'upload_latency', 'upload_latency_units', 'seq')
+
     def __init__(self, **kwargs):
         self.log_file = kwargs.get('log_file', None)
         self.timestamp = kwargs.get('timestamp', None)
@@ -231,6 +240,10 @@ class GraphMetric(object):
     :param device_2: (optional) Second device as a string.
     :param seq: (optional) TestResult sequence ID as an int.
     """
+    __slots__ = ('log_file', 'timestamp', 'metric', 'value', 'units', 'result', 'interface_1',
+                 'interface_2', 'streams', 'protocol', 'direction', 'value_2', 'units_2',
+                 'device_1', 'device_2', 'seq')
+
     def __init__(self, **kwargs):
         self.log_file = kwargs.get('log_file', None)
         self.timestamp = kwargs.get('timestamp', None)
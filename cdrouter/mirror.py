@@ -0,0 +1,279 @@
+#
+# Copyright (c) 2026 by QA Cafe.
+# All Rights Reserved.
+#
+
+"""Module for keeping a local copy of CDRouter Results."""
+
+from collections import namedtuple
+import json
+import sqlite3
+
+from . import cdr_decoder
+from .alerts import AlertSchema
+from .filters import Field as field
+from .metrics import MetricSchema
+from .results import ResultSchema
+from .testresults import TestResultSchema
+
+_TABLES = [
+    '''CREATE TABLE IF NOT EXISTS results (
+        id INTEGER PRIMARY KEY,
+        created TEXT,
+        updated TEXT,
+        status TEXT,
+        data TEXT NOT NULL)''',
+    '''CREATE TABLE IF NOT EXISTS tests (
+        id INTEGER NOT NULL,
+        seq INTEGER NOT NULL,
+        name TEXT,
+        result TEXT,
+        data TEXT NOT NULL,
+        PRIMARY KEY (id, seq))''',
+    '''CREATE TABLE IF NOT EXISTS alerts (
+        id INTEGER NOT NULL,
+        idx INTEGER NOT NULL,
+        seq INTEGER,
+        data TEXT NOT NULL,
+        PRIMARY KEY (id, idx))''',
+    '''CREATE TABLE IF NOT EXISTS metrics (
+        id INTEGER NOT NULL,
+        seq INTEGER,
+        metric TEXT,
+        data TEXT NOT NULL)''',
+    '''CREATE TABLE IF NOT EXISTS sync (
+        name TEXT PRIMARY KEY,
+        value TEXT)''',
+    'CREATE INDEX IF NOT EXISTS results_updated ON results (updated)',
+    'CREATE INDEX IF NOT EXISTS metrics_id ON metrics (id, seq)',
+]
+
+class SyncStats(namedtuple('SyncStats', ['results', 'tests', 'alerts', 'metrics', 'deleted'])):
+    """Named tuple for the outcome of a :func:`mirror.Mirror.sync <mirror.Mirror.sync>` call.
+
+    :param results: Count of new or updated results as an int.
+    :param tests: Count of test results stored for those results as an int.
+    :param alerts: Count of alerts stored for those results as an int.
+    :param metrics: Count of metrics stored for those results as an int.
+    :param deleted: Count of results removed from the mirror as an int.
+    """
+
+class Mirror(object):
+    """Local SQLite copy of the results, test results, alerts and
+    metrics of a CDRouter system.  ``sync`` fetches only the results
+    created or updated since the last sync, replacing their test
+    results, alerts and metrics, after which the ``get``/``list_*``
+    methods are answered from the database without contacting the
+    CDRouter system.
+
+    Usage::
+
+      from cdrouter import CDRouter
+      from cdrouter.mirror import Mirror
+
+      c = CDRouter('http://localhost')
+      with Mirror(c, 'results.db') as m:
+          m.sync()
+          for r in m.list_results(status='completed'):
+              print(r.id, [tr.name for tr in m.list_tests(r.id)])
+
+    Records are stored as the JSON sent by the CDRouter system and
+    decoded into the usual models when read.  The SQLite connection
+    is available as ``conn`` for custom queries; each table has a
+    ``data`` column holding that JSON alongside indexed ``id`` and
+    ``seq`` columns.
+
+    :param c: :class:`cdrouter.CDRouter <cdrouter.CDRouter>` object
+    :param path: (optional) Path to SQLite database file as a string,
+        defaults to an in-memory database.
+    :param limit: (optional) Number of records to fetch per request as an int.
+    :param prefetch: (optional) Number of concurrent requests to use
+        when fetching lists as an int, see ``iter_list``.
+    """
+    def __init__(self, c, path=':memory:', limit=500, prefetch=None):
+        self.c = c
+        self.path = path
+        self.limit = limit
+        self.prefetch = prefetch
+
+        self.conn = sqlite3.connect(path)
+        with self.conn:
+            for stmt in _TABLES:
+                self.conn.execute(stmt)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        """Close the SQLite database."""
+        self.conn.close()
+
+    def _list(self, base, filter=None, type=None, sort=None, limit=None, page=None, detailed=True): # pylint: disable=redefined-builtin
+        resp = self.c.list(base, filter=filter, type=type, sort=sort, limit=limit, page=page, detailed=detailed)
+        return self.c.decode(None, resp, many=True, links=True, raw=True)
+
+    def _iter(self, base, filter=None, sort=None, detailed=True): # pylint: disable=redefined-builtin
+        return self.c.iter_list(self._list, base, filter=filter, sort=sort, limit=self.limit,
+                                detailed=detailed, prefetch=self.prefetch)
+
+    def _changed(self, updated, id): # pylint: disable=invalid-name,redefined-builtin
+        # results ordered by (updated, id) after the given ones.  Each
+        # request continues from the last result seen rather than
+        # asking for a page number, so results updated meanwhile
+        # cannot shift unseen ones onto pages already fetched, and
+        # results sharing an updated time are told apart by ID.
+        while True:
+            if updated is not None and id is not None:
+                rs, _ = self._list('results/', filter=[field('updated').eq(updated), field('id').gt(id)],
+                                   type='inter', sort='+id', limit=self.limit)
+                for r in rs:
+                    yield r
+                if len(rs) == self.limit:
+                    id = int(rs[-1]['id'])
+                    continue
+
+            filter = [field('updated').gt(updated)] if updated is not None else None # pylint: disable=redefined-builtin
+            rs, _ = self._list('results/', filter=filter, sort=['+updated', '+id'], limit=self.limit)
+            for r in rs:
+                yield r
+            if len(rs) < self.limit:
+                return
+            updated, id = rs[-1]['updated'], int(rs[-1]['id'])
+
+    def _get_state(self, name):
+        row = self.conn.execute('SELECT value FROM sync WHERE name = ?', (name,)).fetchone()
+        if row is None:
+            return None
+        return row[0]
+
+    def _set_state(self, name, value):
+        self.conn.execute('INSERT OR REPLACE INTO sync (name, value) VALUES (?, ?)', (name, value))
+
+    def _store(self, r):
+        id = int(r['id']) # pylint: disable=invalid-name,redefined-builtin
+        base = 'results/'+str(id)
+
+        tests = [(id, int(tr['seq']), tr.get('name'), tr.get('result'), json.dumps(tr))
+                 for tr in self._iter(base+'/tests/')]
+        alerts = [(id, int(a['idx']), a.get('seq'), json.dumps(a))
+                  for a in self._iter(base+'/alerts/')]
+        metrics = [(id, m.get('seq'), m.get('metric'), json.dumps(m))
+                   for m in self._iter(base+'/metrics/')]
+
+        with self.conn:
+            self.conn.execute('INSERT OR REPLACE INTO results (id, created, updated, status, data) VALUES (?, ?, ?, ?, ?)',
+                              (id, r.get('created'), r.get('updated'), r.get('status'), json.dumps(r)))
+            for table in ['tests', 'alerts', 'metrics']:
+                self.conn.execute('DELETE FROM '+table+' WHERE id = ?', (id,))
+            self.conn.executemany('INSERT INTO tests (id, seq, name, result, data) VALUES (?, ?, ?, ?, ?)', tests)
+            self.conn.executemany('INSERT INTO alerts (id, idx, seq, data) VALUES (?, ?, ?, ?)', alerts)
+            self.conn.executemany('INSERT INTO metrics (id, seq, metric, data) VALUES (?, ?, ?, ?)', metrics)
+        return len(tests), len(alerts), len(metrics)
+
+    def sync(self, prune=False):
+        """Fetch results created or updated since the last sync, along
+        with their test results, alerts and metrics.  Results are
+        fetched in order of their ``updated`` time and ID, which are
+        recorded as each one is stored, so an interrupted sync resumes
+        where it left off.
+
+        :param prune: (optional) If bool `True`, also remove results
+            which no longer exist on the CDRouter system.  This lists
+            every result's ID, so is more expensive than a plain sync.
+        :return: :class:`mirror.SyncStats <mirror.SyncStats>` object
+        :rtype: mirror.SyncStats
+        """
+        updated = self._get_state('results.updated')
+        id = self._get_state('results.id') # pylint: disable=invalid-name,redefined-builtin
+        if id is not None:
+            id = int(id)
+
+        nresults = ntests = nalerts = nmetrics = 0
+        for r in self._changed(updated, id):
+            t, a, m = self._store(r)
+            nresults += 1
+            ntests += t
+            nalerts += a
+            nmetrics += m
+            if r.get('updated') is not None:
+                with self.conn:
+                    self._set_state('results.updated', r['updated'])
+                    self._set_state('results.id', str(int(r['id'])))
+
+        deleted = 0
+        if prune:
+            ids = set(int(r['id']) for r in self._iter('results/', detailed=False))
+            stale = [(rid,) for (rid,) in self.conn.execute('SELECT id FROM results') if rid not in ids]
+            with self.conn:
+                for table in ['results', 'tests', 'alerts', 'metrics']:
+                    self.conn.executemany('DELETE FROM '+table+' WHERE id = ?', stale)
+            deleted = len(stale)
+
+        return SyncStats(nresults, ntests, nalerts, nmetrics, deleted)
+
+    def get(self, id): # pylint: disable=invalid-name,redefined-builtin
+        """Get a mirrored result.
+
+        :param id: Result ID as an int.
+        :return: :class:`results.Result <results.Result>` object, or `None` if not mirrored.
+        :rtype: results.Result
+        """
+        row = self.conn.execute('SELECT data FROM results WHERE id = ?', (int(id),)).fetchone()
+        if row is None:
+            return None
+        return cdr_decoder.decode(ResultSchema(), json.loads(row[0]))
+
+    def list_results(self, status=None, limit=None):
+        """Get mirrored results, newest first.
+
+        :param status: (optional) Only return results with this status as a string.
+        :param limit: (optional) Maximum number of results to return as an int.
+        :return: :class:`results.Result <results.Result>` list
+        """
+        sql = 'SELECT data FROM results'
+        params = []
+        if status is not None:
+            sql += ' WHERE status = ?'
+            params.append(status)
+        sql += ' ORDER BY id DESC'
+        if limit is not None:
+            sql += ' LIMIT ?'
+            params.append(int(limit))
+        return self._decode(ResultSchema(), sql, params)
+
+    def list_tests(self, id): # pylint: disable=invalid-name,redefined-builtin
+        """Get a mirrored result's test results.
+
+        :param id: Result ID as an int.
+        :return: :class:`testresults.TestResult <testresults.TestResult>` list
+        """
+        return self._decode(TestResultSchema(), 'SELECT data FROM tests WHERE id = ? ORDER BY seq', [int(id)])
+
+    def list_alerts(self, id): # pylint: disable=invalid-name,redefined-builtin
+        """Get a mirrored result's alerts.
+
+        :param id: Result ID as an int.
+        :return: :class:`alerts.Alert <alerts.Alert>` list
+        """
+        return self._decode(AlertSchema(), 'SELECT data FROM alerts WHERE id = ? ORDER BY idx', [int(id)])
+
+    def list_metrics(self, id, seq=None): # pylint: disable=invalid-name,redefined-builtin
+        """Get a mirrored result's metrics.
+
+        :param id: Result ID as an int.
+        :param seq: (optional) Only return metrics of this TestResult sequence ID as an int.
+        :return: :class:`metrics.Metric <metrics.Metric>` list
+        """
+        sql = 'SELECT data FROM metrics WHERE id = ?'
+        params = [int(id)]
+        if seq is not None:
+            sql += ' AND seq = ?'
+            params.append(int(seq))
+        return self._decode(MetricSchema(), sql+' ORDER BY rowid', params)
+
+    def _decode(self, schema, sql, params):
+        decode = cdr_decoder.compile_schema(schema)
+        return [decode(json.loads(data)) for (data,) in self.conn.execute(sql, params)]
@@ -244,6 +244,7 @@ class PackagesService(object):
 
         :param args: Arguments that ``list`` takes.
         :param kwargs: Optional arguments that ``list`` takes.
+        :param prefetch: (optional) After the first page, fetch the remaining pages using up to this many concurrent requests as an int.
         :return: :class:`packages.Package <packages.Package>` list
 
         """
@@ -346,13 +347,15 @@ class PackagesService(object):
         """
         return self.service.edit_shares(self.base, id, user_ids)
 
-    def export(self, id): # pylint: disable=invalid-name,redefined-builtin
+    def export(self, id, dest=None, progress=None): # pylint: disable=invalid-name,redefined-builtin
         """Export a package.
 
         :param id: Package ID as an int.
-        :rtype: tuple `(io.BytesIO, 'filename')`
+        :param dest: (optional) Filepath, directory or writable binary file-like object to stream the export to instead of an ``io.BytesIO``.
+        :param progress: (optional) Function called as ``progress(nbytes, total)`` as each chunk is written.
+        :rtype: tuple `(io.BytesIO, 'filename')`, or `(dest, 'filename')` if ``dest`` is set
         """
-        return self.service.export(self.base, id)
+        return self.service.export(self.base, id, dest=dest, progress=progress)
 
     def analyze(self, id): # pylint: disable=invalid-name,redefined-builtin
         """Get a list of tests that will be skipped for a package.
@@ -387,13 +390,15 @@ class PackagesService(object):
                                  params={'process': 'interfaces'}, json=json)
         return self.service.decode(schema, resp, many=True)
 
-    def bulk_export(self, ids):
+    def bulk_export(self, ids, dest=None, progress=None):
         """Bulk export a set of packages.
 
         :param ids: Int list of package IDs.
-        :rtype: tuple `(io.BytesIO, 'filename')`
+        :param dest: (optional) Filepath, directory or writable binary file-like object to stream the export to instead of an ``io.BytesIO``.
+        :param progress: (optional) Function called as ``progress(nbytes, total)`` as each chunk is written.
+        :rtype: tuple `(io.BytesIO, 'filename')`, or `(dest, 'filename')` if ``dest`` is set
         """
-        return self.service.bulk_export(self.base, ids)
+        return self.service.bulk_export(self.base, ids, dest=dest, progress=progress)
 
     def bulk_copy(self, ids):
         """Bulk copy a set of packages.
@@ -412,6 +417,10 @@ class PackagesService(object):
         :param filter: (optional) String list of filters.
         :param type: (optional) `union` or `inter` as string.
         :param all: (optional) Apply to all if bool `True`.
+        :return: `requests.Response` object, or a :class:`cdrouter.BulkReport
+            <cdrouter.BulkReport>` object if ``ids`` was split into one
+            request per ``bulk_chunk_size`` IDs.
+        :raises cdrouter.cdr_error.BulkError: If ``ids`` was split and any request failed.
         """
         schema = PackageSchema(exclude=('id', 'created', 'updated', 'test_count', 'agent_id', 'result_id', 'interfaces'))
         _fields = self.service.encode(schema, _fields, skip_none=True)
@@ -425,5 +434,9 @@ class PackagesService(object):
         :param filter: (optional) String list of filters.
         :param type: (optional) `union` or `inter` as string.
         :param all: (optional) Apply to all if bool `True`.
+        :return: `requests.Response` object, or a :class:`cdrouter.BulkReport
+            <cdrouter.BulkReport>` object if ``ids`` was split into one
+            request per ``bulk_chunk_size`` IDs.
+        :raises cdrouter.cdr_error.BulkError: If ``ids`` was split and any request failed.
         """
         return self.service.bulk_delete(self.base, self.RESOURCE, ids=ids, filter=filter, type=type, all=all)
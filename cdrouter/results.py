@@ -6,16 +6,27 @@
 """Module for accessing CDRouter Results."""
 
 from collections import namedtuple
+from datetime import datetime
 import io
+import os
+import re
+import time
 
 from requests_toolbelt.downloadutils import stream
 from marshmallow import Schema, fields, post_load, EXCLUDE
+from requests.exceptions import RequestException
+from . import cdr_columns
+from .cdr_concurrent import imap_ordered
+from . import cdr_csv
 from .cdr_datetime import DateTime
 from .testresults import TestResultSchema
 from .alerts import AlertSchema
 from .configs import InterfacesSchema, TestvarSchema
 from .metrics import GraphMetric, GraphMetricSchema, Page as MetricPage, MetricSchema as MetricsDotMetricSchema
 
+#: Result statuses of a result which is no longer running.
+FINISHED = ('completed', 'stopped', 'error')
+
 class TestCount(object):
     """Model for CDRouter Test Counts.
 
@@ -401,6 +412,66 @@ class LogDirFileSchema(Schema):
     def post_load(self, data, **kwargs): # pylint: disable=unused-argument
         return LogDirFile(**data)
 
+class LogDirSyncFile(namedtuple('LogDirSyncFile', ['name', 'path', 'nbytes', 'skipped', 'error'])):
+    """Named tuple for one logdir file of a :func:`results.ResultsService.sync_logdir
+    <results.ResultsService.sync_logdir>` call.
+
+    :param name: Logdir filename as string.
+    :param path: Path of the local copy as a string, or `None` if ``name`` is not a relative path.
+    :param nbytes: Bytes downloaded as an int, `0` if skipped.
+    :param skipped: Bool `True` if the local copy was already up to date.
+    :param error: Exception raised, or `None` if the file was fetched or skipped.
+    """
+
+class LogDirSyncReport(object):
+    """Class representing the outcome of a :func:`results.ResultsService.sync_logdir
+    <results.ResultsService.sync_logdir>` call.
+
+    :param files: :class:`results.LogDirSyncFile <results.LogDirSyncFile>` list, in logdir order.
+    :param deleted: Paths of local files removed as a string list.
+    :param elapsed: Seconds the call took as a float.
+    """
+    def __init__(self, files, deleted, elapsed):
+        self.files = files
+        self.deleted = deleted
+        self.elapsed = elapsed
+
+    @property
+    def downloaded(self):
+        """:class:`results.LogDirSyncFile <results.LogDirSyncFile>` list of the files downloaded or appended to."""
+        return [x for x in self.files if x.error is None and not x.skipped]
+
+    @property
+    def skipped(self):
+        """:class:`results.LogDirSyncFile <results.LogDirSyncFile>` list of the files already up to date."""
+        return [x for x in self.files if x.skipped]
+
+    @property
+    def errors(self):
+        """:class:`results.LogDirSyncFile <results.LogDirSyncFile>` list of the files that failed."""
+        return [x for x in self.files if x.error is not None]
+
+    @property
+    def nbytes(self):
+        """Bytes downloaded as an int."""
+        return sum(x.nbytes for x in self.files)
+
+    @property
+    def throughput(self):
+        """Bytes downloaded per second as a float."""
+        if not self.elapsed:
+            return 0.0
+        return self.nbytes / self.elapsed
+
+def _mtime(modified):
+    # logdir file's modified time as a POSIX timestamp, or None
+    if modified is None or modified == datetime.min:
+        return None
+    try:
+        return modified.timestamp()
+    except (OverflowError, OSError, ValueError):
+        return None
+
 class Options(object):
     """Model for CDRouter Result Options.
 
@@ -536,6 +607,13 @@ class Result(object):
     :param features: (optional) Dict of feature name strings to :class:`results.Feature <results.Feature>` objects.
     :param interfaces: (optional) :class:`configs.Interfaces <configs.Interfaces>` list.
     """
+    __slots__ = ('id', 'created', 'updated', 'locked', 'result', 'active', 'status', 'loops',
+                 'tests', 'passed', 'fail', 'alerts', 'duration', 'size_on_disk', 'starred',
+                 'archived', 'result_dir', 'agent_name', 'package_name', 'device_name',
+                 'config_name', 'package_id', 'device_id', 'config_id', 'user_id', 'note',
+                 'pause_message', 'build_info', 'tags', 'testcases', 'options', 'features',
+                 'interfaces')
+
     def __init__(self, **kwargs):
         self.id = kwargs.get('id', None)
         self.created = kwargs.get('created', None)
@@ -657,6 +735,7 @@ class ResultsService(object):
 
         :param args: Arguments that ``list`` takes.
         :param kwargs: Optional arguments that ``list`` takes.
+        :param prefetch: (optional) After the first page, fetch the remaining pages using up to this many concurrent requests as an int.
         :return: :class:`results.Result <results.Result>` list
 
         """
@@ -674,6 +753,24 @@ class ResultsService(object):
         """
         return self.service.list(self.base, filter, type, sort, limit, page, format='csv').text
 
+    def iter_csv(self, filter=None, type=None, sort=None, limit=None, page=None, typed=False): # pylint: disable=redefined-builtin
+        """Get a list of results as CSV, streamed and parsed row by row.
+        Unlike ``list_csv``, the CSV is never held in memory as a
+        whole, so ``limit='none'`` can be used on a large history.
+
+        :param filter: (optional) Filters to apply as a string list.
+        :param type: (optional) `union` or `inter` as string.
+        :param sort: (optional) Sort fields to apply as string list.
+        :param limit: (optional) Limit returned list length.
+        :param page: (optional) Page to return.
+        :param typed: (optional) If bool `True`, yield named tuples with
+            values converted to the types of :class:`results.Result
+            <results.Result>` fields, see ``cdrouter.cdr_csv``.
+        :return: Generator of dicts of column names to strings, or named tuples if ``typed`` is set.
+        """
+        resp = self.service.list(self.base, filter, type, sort, limit, page, format='csv', stream=True)
+        return cdr_csv.iter_rows(resp, schema=ResultSchema() if typed else None, name='ResultRow')
+
     def get(self, id): # pylint: disable=invalid-name,redefined-builtin
         """Get a result.
 
@@ -811,22 +908,27 @@ class ResultsService(object):
         """
         return self.service.edit_shares(self.base, id, user_ids)
 
-    def export(self, id, exclude_captures=False): # pylint: disable=invalid-name,redefined-builtin
+    def export(self, id, exclude_captures=False, dest=None, progress=None): # pylint: disable=invalid-name,redefined-builtin
         """Export a result.
 
         :param id: Result ID as an int.
         :param exclude_captures: If bool `True`, don't export capture files
-        :rtype: tuple `(io.BytesIO, 'filename')`
+        :param dest: (optional) Filepath, directory or writable binary file-like object to stream the export to instead of an ``io.BytesIO``.
+        :param progress: (optional) Function called as ``progress(nbytes, total)`` as each chunk is written.
+        :rtype: tuple `(io.BytesIO, 'filename')`, or `(dest, 'filename')` if ``dest`` is set
         """
-        return self.service.export(self.base, id, params={'exclude_captures': exclude_captures})
+        return self.service.export(self.base, id, params={'exclude_captures': exclude_captures}, dest=dest, progress=progress)
 
-    def bulk_export(self, ids, exclude_captures=False):
+    def bulk_export(self, ids, exclude_captures=False, dest=None, progress=None):
         """Bulk export a set of results.
 
         :param ids: Int list of result IDs.
-        :rtype: tuple `(io.BytesIO, 'filename')`
+        :param exclude_captures: If bool `True`, don't export capture files
+        :param dest: (optional) Filepath, directory or writable binary file-like object to stream the export to instead of an ``io.BytesIO``.
+        :param progress: (optional) Function called as ``progress(nbytes, total)`` as each chunk is written.
+        :rtype: tuple `(io.BytesIO, 'filename')`, or `(dest, 'filename')` if ``dest`` is set
         """
-        return self.service.bulk_export(self.base, ids, params={'exclude_captures': exclude_captures})
+        return self.service.bulk_export(self.base, ids, params={'exclude_captures': exclude_captures}, dest=dest, progress=progress)
 
     def bulk_edit(self, _fields, ids=None, filter=None, type=None, all=False): # pylint: disable=redefined-builtin
         """Bulk edit a set of results.
@@ -836,6 +938,10 @@ class ResultsService(object):
         :param filter: (optional) String list of filters.
         :param type: (optional) `union` or `inter` as string.
         :param all: (optional) Apply to all if bool `True`.
+        :return: `requests.Response` object, or a :class:`cdrouter.BulkReport
+            <cdrouter.BulkReport>` object if ``ids`` was split into one
+            request per ``bulk_chunk_size`` IDs.
+        :raises cdrouter.cdr_error.BulkError: If ``ids`` was split and any request failed.
         """
         schema = ResultSchema(exclude=('id', 'created', 'updated', 'result', 'active', 'status', 'loops', 'tests', 'passed', 'fail', 'duration', 'size_on_disk', 'result_dir', 'agent_name', 'package_name', 'config_name', 'package_id', 'config_id', 'pause_message', 'build_info', 'options', 'features', 'interfaces'))
         _fields = self.service.encode(schema, _fields, skip_none=True)
@@ -848,6 +954,10 @@ class ResultsService(object):
         :param filter: (optional) String list of filters.
         :param type: (optional) `union` or `inter` as string.
         :param all: (optional) Apply to all if bool `True`.
+        :return: `requests.Response` object, or a :class:`cdrouter.BulkReport
+            <cdrouter.BulkReport>` object if ``ids`` was split into one
+            request per ``bulk_chunk_size`` IDs.
+        :raises cdrouter.cdr_error.BulkError: If ``ids`` was split and any request failed.
         """
         return self.service.bulk_delete(self.base, self.RESOURCE, ids=ids, filter=filter, type=type, all=all)
 
@@ -942,20 +1052,121 @@ class ResultsService(object):
         b.seek(0)
         return (b, self.service.filename(resp))
 
-    def download_logdir_archive(self, id, format='zip', exclude_captures=False): # pylint: disable=invalid-name,redefined-builtin
+    def sync_logdir(self, id, dest, workers=4, append=True, delete=False, progress=None): # pylint: disable=invalid-name,redefined-builtin
+        """Mirror a result's logdir into a local directory.  The logdir is
+        listed and each file whose local copy is missing or differs in
+        size or modified time is fetched, using up to ``workers``
+        concurrent requests, with each file streamed straight to disk.
+        Local copies are given the modified time of the logdir file, so
+        syncing a result again only fetches what changed since.
+
+        If ``append`` is set, files that grew since the last sync are
+        assumed to have been appended to, as the log files of a
+        running result are, and only their new bytes are requested.
+        If the CDRouter system sends the whole file instead, it
+        replaces the local copy.
+
+        A file that fails to download does not stop the others;
+        failures are reported in the returned :class:`results.LogDirSyncReport
+        <results.LogDirSyncReport>`.
+
+        Usage::
+
+          while True:
+              sync = c.results.sync_logdir(r.id, 'logdir/{}'.format(r.id))
+              print('{} files, {} bytes'.format(len(sync.downloaded), sync.nbytes))
+              if c.results.get(r.id).status in FINISHED:
+                  break
+              time.sleep(30)
+
+        :param id: Result ID as an int.
+        :param dest: Directory to write to as a string, created if missing.
+        :param workers: (optional) Maximum number of concurrent requests as an int.
+        :param append: (optional) If bool `False`, always fetch changed files in full.
+        :param delete: (optional) If bool `True`, remove local files no longer in the logdir.
+        :param progress: (optional) Function called with each
+            :class:`results.LogDirSyncFile <results.LogDirSyncFile>`
+            as it completes.
+        :return: :class:`results.LogDirSyncReport <results.LogDirSyncReport>` object
+        :rtype: results.LogDirSyncReport
+        """
+        start = time.monotonic()
+        # always decoded into models, even if the client returns raw dicts
+        resp = self.service.list(self.base+str(id)+'/logdir/')
+        files = self.service.decode(LogDirFileSchema(), resp, many=True, raw=False)
+        os.makedirs(dest, exist_ok=True)
+
+        def fetch(f):
+            synced = self._sync_logdir_file(id, f, dest, append)
+            if progress is not None:
+                progress(synced)
+            return synced
+        synced = list(imap_ordered(fetch, files, workers))
+
+        deleted = []
+        if delete:
+            keep = {os.path.normpath(os.path.join(dest, f.name)) for f in files}
+            for root, _, names in os.walk(dest):
+                for name in names:
+                    path = os.path.normpath(os.path.join(root, name))
+                    if path not in keep:
+                        os.remove(path)
+                        deleted.append(path)
+        return LogDirSyncReport(synced, deleted, time.monotonic() - start)
+
+    def _sync_logdir_file(self, id, f, dest, append): # pylint: disable=invalid-name,redefined-builtin
+        name = os.path.normpath(f.name)
+        if os.path.isabs(name) or name.split(os.sep)[0] == '..':
+            return LogDirSyncFile(f.name, None, 0, False, ValueError('logdir filename {} is outside the logdir'.format(f.name)))
+        path = os.path.join(dest, name)
+        mtime = _mtime(f.modified)
+        part = None
+        try:
+            local = os.stat(path) if os.path.isfile(path) else None
+            if local is not None and local.st_size == f.size and (mtime is None or abs(local.st_mtime - mtime) < 1):
+                return LogDirSyncFile(f.name, path, 0, True, None)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+
+            base = self.base+str(id)+'/logdir/'+f.name+'/'
+            if append and local is not None and f.size is not None and 0 < local.st_size < f.size:
+                resp = self.service.get(base, headers={'range': 'bytes={}-'.format(local.st_size)}, stream=True)
+                m = re.match(r'bytes (\d+)-', resp.headers.get('content-range', ''))
+                if resp.status_code == 206 and m is not None and int(m.group(1)) == local.st_size:
+                    with open(path, 'ab') as fd:
+                        self.service.download(resp, dest=fd)
+                    if mtime is not None:
+                        os.utime(path, (time.time(), mtime))
+                    return LogDirSyncFile(f.name, path, os.path.getsize(path) - local.st_size, False, None)
+                # the whole file was sent, replace the local copy
+            else:
+                resp = self.service.get(base, stream=True)
+
+            # written under another name until complete, so that an
+            # interrupted download is never taken for a finished one
+            part = path + '.part'
+            self.service.download(resp, dest=part)
+            nbytes = os.path.getsize(part)
+            os.replace(part, path)
+            if mtime is not None:
+                os.utime(path, (time.time(), mtime))
+            return LogDirSyncFile(f.name, path, nbytes, False, None)
+        except (RequestException, OSError) as e:
+            if part is not None and os.path.exists(part):
+                os.remove(part)
+            return LogDirSyncFile(f.name, path, 0, False, e)
+
+    def download_logdir_archive(self, id, format='zip', exclude_captures=False, dest=None, progress=None): # pylint: disable=invalid-name,redefined-builtin
         """Download logdir archive in tgz or zip format.
 
         :param id: Result ID as an int.
         :param format: (optional) Format to download, must be string `zip` or `tgz`.
         :param exclude_captures: If bool `True`, don't include capture files
-        :rtype: tuple `(io.BytesIO, 'filename')`
+        :param dest: (optional) Filepath, directory or writable binary file-like object to stream the archive to instead of an ``io.BytesIO``.
+        :param progress: (optional) Function called as ``progress(nbytes, total)`` as each chunk is written.
+        :rtype: tuple `(io.BytesIO, 'filename')`, or `(dest, 'filename')` if ``dest`` is set
         """
         resp = self.service.get(self.base+str(id)+'/logdir/', params={'format': format, 'exclude_captures': exclude_captures}, stream=True)
-        b = io.BytesIO()
-        stream.stream_response_to_file(resp, path=b)
-        resp.close()
-        b.seek(0)
-        return (b, self.service.filename(resp))
+        return self.service.download(resp, dest=dest, progress=progress)
 
     def list_metrics(self, id, filter=None, type=None, sort=None, limit=None, page=None, detailed=None): # pylint: disable=redefined-builtin
         """Get a list of metrics, using summary representation by default (see
@@ -979,6 +1190,44 @@ class ResultsService(object):
         rs, l = self.service.decode(schema, resp, many=True, links=True)
         return MetricPage(rs, l)
 
+    def list_metrics_arrays(self, id, filter=None, type=None, sort=None, limit=None, page=None, detailed=None): # pylint: disable=redefined-builtin
+        """Get a list of metrics as NumPy arrays, one per field,
+        without building a model object per row.  Requires numpy.
+        See ``cdrouter.cdr_columns`` for column types.  Pass
+        ``limit='none'`` to get every metric in a single request.
+
+        :param id: Result ID as an int.
+        :param filter: (optional) Filters to apply as a string list.
+        :param type: (optional) `union` or `inter` as string.
+        :param sort: (optional) Sort fields to apply as string list.
+        :param limit: (optional) Limit returned list length.
+        :param page: (optional) Page to return.
+        :param detailed: (optional) Return all fields if Bool `True`.
+        :return: Dict of field names to `numpy.ndarray` columns.
+        :rtype: dict
+        """
+        schema = MetricsDotMetricSchema()
+        resp = self.service.list(self.base+str(id)+'/metrics/', filter, type, sort, limit, page, detailed=detailed)
+        return cdr_columns.arrays(schema, self.service.decode(schema, resp, many=True, raw=True))
+
+    def list_metrics_frame(self, id, filter=None, type=None, sort=None, limit=None, page=None, detailed=None): # pylint: disable=redefined-builtin
+        """Get a list of metrics as a pandas data frame with the
+        columns of ``list_metrics_arrays``.  Requires pandas.
+
+        :param id: Result ID as an int.
+        :param filter: (optional) Filters to apply as a string list.
+        :param type: (optional) `union` or `inter` as string.
+        :param sort: (optional) Sort fields to apply as string list.
+        :param limit: (optional) Limit returned list length.
+        :param page: (optional) Page to return.
+        :param detailed: (optional) Return all fields if Bool `True`.
+        :return: `pandas.DataFrame` object
+        :rtype: pandas.DataFrame
+        """
+        schema = MetricsDotMetricSchema()
+        resp = self.service.list(self.base+str(id)+'/metrics/', filter, type, sort, limit, page, detailed=detailed)
+        return cdr_columns.frame(schema, self.service.decode(schema, resp, many=True, raw=True))
+
     def get_test_metric(self, id, tname, metric): # pylint: disable=invalid-name,redefined-builtin
         """Get a test graph metric.  This method is only for getting "bandwidth" or "latency" test metrics.
 
@@ -995,6 +1244,36 @@ class ResultsService(object):
         resp = self.service.get(self.base+str(id)+'/metrics/'+tname+'/'+metric+'/')
         return self.service.decode(schema, resp, many=True)
 
+    def get_test_metric_arrays(self, id, tname, metric): # pylint: disable=invalid-name,redefined-builtin
+        """Get a test graph metric as NumPy arrays, one per field,
+        without building a model object per row.  Requires numpy.
+        See ``cdrouter.cdr_columns`` for column types, ``timestamp``
+        is a ``datetime64[us]`` array in UTC.
+
+        :param id: Result ID as an int.
+        :param tname: Test name as string.
+        :param metric: Metric name as string.
+        :return: Dict of field names to `numpy.ndarray` columns.
+        :rtype: dict
+        """
+        schema = GraphMetricSchema()
+        resp = self.service.get(self.base+str(id)+'/metrics/'+tname+'/'+metric+'/')
+        return cdr_columns.arrays(schema, self.service.decode(schema, resp, many=True, raw=True))
+
+    def get_test_metric_frame(self, id, tname, metric): # pylint: disable=invalid-name,redefined-builtin
+        """Get a test graph metric as a pandas data frame with the
+        columns of ``get_test_metric_arrays``.  Requires pandas.
+
+        :param id: Result ID as an int.
+        :param tname: Test name as string.
+        :param metric: Metric name as string.
+        :return: `pandas.DataFrame` object
+        :rtype: pandas.DataFrame
+        """
+        schema = GraphMetricSchema()
+        resp = self.service.get(self.base+str(id)+'/metrics/'+tname+'/'+metric+'/')
+        return cdr_columns.frame(schema, self.service.decode(schema, resp, many=True, raw=True))
+
     def get_test_metric_csv(self, id, tname, metric): # pylint: disable=invalid-name,redefined-builtin
         """Get a test metric as CSV.  This method is only for getting "bandwidth" or "latency" test metrics.
 
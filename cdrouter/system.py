@@ -425,19 +425,19 @@ class SystemService(object):
                                  json={'email': email, 'release': {'nonce': nonce, 'filename': filename}})
         return self.service.decode(schema, resp)
 
-    def manual_upgrade(self, fd, filename='cdrouter.rpm'):
+    def manual_upgrade(self, fd, filename='cdrouter.rpm', progress=None):
         """Upgrade CDRouter manually by uploading an .rpm installer from the
         CDRouter Support Lounge. Please note that any running tests will be
         stopped.
 
         :param fd: File-like object to upload.
         :param filename: (optional) Filename to use for installer as string.
+        :param progress: (optional) Function called as ``progress(nbytes, total)`` as the file is uploaded, see :func:`cdrouter.CDRouter.upload <cdrouter.CDRouter.upload>`.
         :return: :class:`system.Upgrade <system.Upgrade>` object
         :rtype: system.Upgrade
         """
         schema = UpgradeSchema()
-        resp = self.service.post(self.base+'upgrade/',
-                                 files={'file': (filename, fd)})
+        resp = self.service.upload(self.base+'upgrade/', fd, filename, progress=progress)
         return self.service.decode(schema, resp)
 
     def lounge_update_license(self):
@@ -452,15 +452,15 @@ class SystemService(object):
                                  headers={'content-type': 'application/json'})
         return self.service.decode(schema, resp)
 
-    def manual_update_license(self, fd, filename='cdrouter.lic'):
+    def manual_update_license(self, fd, filename='cdrouter.lic', progress=None):
         """Update the license on your CDRouter system manually by uploading a
         .lic license from the CDRouter Support Lounge.
 
         :param fd: File-like object to upload.
         :param filename: (optional) Filename to use for license as string.
+        :param progress: (optional) Function called as ``progress(nbytes, total)`` as the file is uploaded, see :func:`cdrouter.CDRouter.upload <cdrouter.CDRouter.upload>`.
         """
-        return self.service.post(self.base+'license/',
-                                 files={'file': (filename, fd)})
+        return self.service.upload(self.base+'license/', fd, filename, progress=progress)
 
     def shutdown(self):
         """Shutdown the CDRouter Web UI. Please note that any running tests will be stopped."""
@@ -10,6 +10,9 @@ from functools import partial
 
 from marshmallow import Schema, fields, post_load, EXCLUDE
 from .cdr_datetime import DateTime
+from . import cdr_columns
+from . import cdr_csv
+from .cdr_concurrent import imap_ordered
 from .metrics import BandwidthSchema, ClientBandwidthSchema, ClientLatencySchema, LatencySchema, MetricSchema, Page as MetricPage
 
 class Summary(object):
@@ -75,6 +78,12 @@ class Line(object):
 
     :param summary: (optional) :class:`testresults.Summary <testresults.Summary>` object (if section log)
     """
+    __slots__ = ('raw', 'line', 'header', 'section', 'prefix', 'name', 'timestamp',
+                 'timestamp_display', 'message', 'interface', 'packet', 'src', 'dst', 'proto',
+                 'info', 'alert_interface', 'alert_index', 'alert_src', 'alert_dst', 'alert_proto',
+                 'alert_src_port', 'alert_dst_port', 'alert_signature', 'alert_severity',
+                 'alert_severity_display', 'alert_sid', 'alert_rev', 'summary')
+
     def __init__(self, **kwargs):
         self.raw = kwargs.get('raw', None)
 
@@ -257,6 +266,30 @@ class Page(namedtuple('Page', ['data', 'links'])):
     :param links: :class:`cdrouter.Links <cdrouter.Links>` object
     """
 
+def _log_window(args, kwargs):
+    # window size a concurrent iter_list_log can split a log into, or
+    # None if the log must be fetched one window at a time: line
+    # numbers of filtered logs do not map onto offsets, and a limit
+    # such as 'none' is not a window size
+    if args or kwargs.get('filter') is not None \
+       or kwargs.get('packets') not in (None, True) or kwargs.get('warnings') not in (None, True):
+        return None
+    try:
+        limit = int(kwargs.get('limit', 250))
+    except (TypeError, ValueError):
+        return None
+    return limit if limit > 0 else None
+
+def _log_lines(logs, raw):
+    return logs['lines'] if raw else logs.lines
+
+def _log_total(logs, raw):
+    return logs['total'] if raw else logs.total
+
+def _log_offset(lines, raw):
+    # offset of the line after the last of lines
+    return lines[-1]['line'] if raw else lines[-1].line
+
 class TestResultsService(object):
     """Service for accessing CDRouter TestResults."""
 
@@ -296,6 +329,7 @@ class TestResultsService(object):
         :param id: Result ID as an int.
         :param args: Arguments that ``list`` takes.
         :param kwargs: Optional arguments that ``list`` takes.
+        :param prefetch: (optional) After the first page, fetch the remaining pages using up to this many concurrent requests as an int.
         :return: :class:`testresults.TestResult <testresults.TestResult>` list
 
         """
@@ -315,6 +349,26 @@ class TestResultsService(object):
         """
         return self.service.list(self._base(id), filter, type, sort, limit, page, format='csv').text
 
+    def iter_csv(self, id, filter=None, type=None, sort=None, limit=None, page=None, typed=False): # pylint: disable=invalid-name,redefined-builtin
+        """Get a list of test results as CSV, streamed and parsed row by
+        row.  Unlike ``list_csv``, the CSV is never held in memory as a
+        whole.
+
+        :param id: Result ID as an int.
+        :param filter: (optional) Filters to apply as a string list.
+        :param type: (optional) `union` or `inter` as string.
+        :param sort: (optional) Sort fields to apply as string list.
+        :param limit: (optional) Limit returned list length.
+        :param page: (optional) Page to return.
+        :param typed: (optional) If bool `True`, yield named tuples with
+            values converted to the types of
+            :class:`testresults.TestResult <testresults.TestResult>`
+            fields, see ``cdrouter.cdr_csv``.
+        :return: Generator of dicts of column names to strings, or named tuples if ``typed`` is set.
+        """
+        resp = self.service.list(self._base(id), filter, type, sort, limit, page, format='csv', stream=True)
+        return cdr_csv.iter_rows(resp, schema=TestResultSchema() if typed else None, name='TestResultRow')
+
     def get(self, id, seq): # pylint: disable=invalid-name,redefined-builtin
         """Get a test result.
 
@@ -361,34 +415,67 @@ class TestResultsService(object):
                                         'packets': packets, 'warnings': warnings, 'timestamp_format': timestamp_format, 'format': 'json'})
         return self.service.decode(schema, resp)
 
-    def iter_list_log(self, id, seq, *args, **kwargs): # pylint: disable=invalid-name,redefined-builtin
+    def iter_list_log(self, id, seq, *args, concurrency=None, **kwargs): # pylint: disable=invalid-name,redefined-builtin
         """Get a test result's log.  Whereas ``list_log`` fetches a single
         range of log lines according to its ``limit`` and ``offset``
         arguments, ``iter_list_log`` returns all log lines by
         internally making successive calls to ``list_log``.
 
+        If ``concurrency`` is set, the log's total line count is taken
+        from the first call and the remaining ``limit``-sized windows
+        are fetched using up to ``concurrency`` concurrent calls,
+        still yielding lines in order.  Lines appended to the log
+        after the first call are then fetched as usual.  Logs fetched
+        with ``filter``, ``packets`` or ``warnings`` arguments are
+        always fetched one window at a time, since their line numbers
+        do not map onto offsets, as are logs fetched with a ``limit``
+        such as ``'none'`` which is not a line count.
+
         :param id: Result ID as an int.
         :param seq: TestResult sequence ID as an int.
         :param args: Arguments that ``list_log`` takes.
+        :param concurrency: (optional) Maximum number of concurrent ``list_log`` calls as an int.
         :param kwargs: Optional arguments that ``list_log`` takes.
         :return: :class:`testresults.Line <testresults.Line>` list
 
         """
+        raw = self.service.raw
+
+        def fetch(offset):
+            return _log_lines(self.list_log(id, seq, *args, **dict(kwargs, offset=offset)), raw)
 
         def generate():
             offset = int(kwargs.get('offset', 0))
             if 'limit' not in kwargs:
                 kwargs['limit'] = 250
 
+            window = _log_window(args, kwargs) if concurrency else None
+            if window is not None:
+                logs = self.list_log(id, seq, **dict(kwargs, offset=offset))
+                lines = _log_lines(logs, raw)
+                if not lines:
+                    return
+                for l in lines:
+                    yield l
+                offset = _log_offset(lines, raw)
+
+                total = _log_total(logs, raw)
+                if total is not None:
+                    for lines in imap_ordered(fetch, range(offset, total, window), concurrency):
+                        for l in lines:
+                            yield l
+                        if lines:
+                            offset = _log_offset(lines, raw)
+                kwargs.update({'offset': offset})
+
             while True:
                 logs = self.list_log(id, seq, *args, **kwargs)
-                nlines = len(logs.lines)
-                if nlines == 0:
+                lines = _log_lines(logs, raw)
+                if not lines:
                     break
-                for l in logs.lines:
+                for l in lines:
                     yield l
-                offset = logs.lines[nlines-1].line
-                kwargs.update({'offset': offset})
+                kwargs.update({'offset': _log_offset(lines, raw)})
 
         return generate()
 
@@ -431,19 +518,54 @@ class TestResultsService(object):
         :return: :class:`metrics.Bandwidth <metrics.Bandwidth>` list, :class:`metrics.Latency <metrics.Latency>` list, :class:`metrics.ClientBandwidth <metrics.ClientBandwidth>` list or :class:`metrics.ClientLatency <metrics.ClientLatency>` list
         :rtype: Union[metrics.Bandwidth, metrics.Latency, metrics.ClientBandwidth, metrics.ClientLatency]
         """
-        if metric == 'bandwidth':
-            schema = BandwidthSchema()
-        elif metric == 'latency':
-            schema = LatencySchema()
-        elif metric == 'client_bandwidth':
-            schema = ClientBandwidthSchema()
-        elif metric == 'client_latency':
-            schema = ClientLatencySchema()
-        else:
-            raise ValueError('unknown metric {}, must be bandwidth, latency, client_bandwidth or client_latency'.format(metric))
+        schema = self._metric_schema(metric)
         resp = self.service.get(self._base(id)+str(seq)+'/metrics/'+metric+'/')
         return self.service.decode(schema, resp, many=True)
 
+    def get_test_metric_arrays(self, id, seq, metric): # pylint: disable=invalid-name,redefined-builtin
+        """Get a bandwidth, latency, client_bandwidth or client_latency
+        test metric as NumPy arrays, one per field, without building
+        a model object per row.  Requires numpy.  See
+        ``cdrouter.cdr_columns`` for column types, ``timestamp`` is a
+        ``datetime64[us]`` array in UTC.
+
+        :param id: Result ID as an int.
+        :param seq: TestResult sequence ID as an int.
+        :param metric: Metric name as string, must be "bandwidth", "latency", "client_bandwidth" or "client_latency"
+        :return: Dict of field names to `numpy.ndarray` columns.
+        :rtype: dict
+        """
+        schema = self._metric_schema(metric)
+        resp = self.service.get(self._base(id)+str(seq)+'/metrics/'+metric+'/')
+        return cdr_columns.arrays(schema, self.service.decode(schema, resp, many=True, raw=True))
+
+    def get_test_metric_frame(self, id, seq, metric): # pylint: disable=invalid-name,redefined-builtin
+        """Get a bandwidth, latency, client_bandwidth or client_latency
+        test metric as a pandas data frame with the columns of
+        ``get_test_metric_arrays``.  Requires pandas.
+
+        :param id: Result ID as an int.
+        :param seq: TestResult sequence ID as an int.
+        :param metric: Metric name as string, must be "bandwidth", "latency", "client_bandwidth" or "client_latency"
+        :return: `pandas.DataFrame` object
+        :rtype: pandas.DataFrame
+        """
+        schema = self._metric_schema(metric)
+        resp = self.service.get(self._base(id)+str(seq)+'/metrics/'+metric+'/')
+        return cdr_columns.frame(schema, self.service.decode(schema, resp, many=True, raw=True))
+
+    @staticmethod
+    def _metric_schema(metric):
+        if metric == 'bandwidth':
+            return BandwidthSchema()
+        if metric == 'latency':
+            return LatencySchema()
+        if metric == 'client_bandwidth':
+            return ClientBandwidthSchema()
+        if metric == 'client_latency':
+            return ClientLatencySchema()
+        raise ValueError('unknown metric {}, must be bandwidth, latency, client_bandwidth or client_latency'.format(metric))
+
     def get_test_metric_csv(self, id, seq, metric): # pylint: disable=invalid-name,redefined-builtin
         """Get a test metric as CSV.  This methods support all test metrics.
 
@@ -5,8 +5,13 @@
 
 """Module for accessing CDRouter Testsuites."""
 
+from bisect import bisect_left
+from threading import Lock
+import re
+
 from marshmallow import Schema, fields, post_load, EXCLUDE
 from .cdr_datetime import DateTime
+from .cdr_error import CDRouterError
 from .configs import InterfacesSchema
 
 class LicenseInfo(object):
@@ -416,6 +421,229 @@ class SearchSchema(Schema):
     def post_load(self, data, **kwargs): # pylint: disable=unused-argument
         return Search(**data)
 
+class TestsuiteCatalog(object):
+    """In-memory catalog of a CDRouter testsuite's groups, modules,
+    tests, labels, errors and testvars.  The catalog is loaded once
+    using :class:`testsuites.TestsuitesService
+    <testsuites.TestsuitesService>` and then answers lookups from
+    in-memory indexes, without contacting the CDRouter system.
+    ``refresh`` reloads it only if the testsuite's release has
+    changed.  Names are looked up exactly, falling back to a
+    case-insensitive match as the API does.  The catalog holds model
+    objects, so cannot be used with a ``raw`` client.
+
+    Usage::
+
+      catalog = c.testsuites.catalog()
+      choices = catalog.get_testvar('wanMode').keywords
+      for t in catalog.tests_in_module('ipv6_basic'):
+          print(t.name, t.synopsis)
+      catalog.search('ipv6_', kind='tests')
+
+    :param testsuites: :class:`testsuites.TestsuitesService <testsuites.TestsuitesService>` object
+    """
+    #: Kinds of testsuite item, as taken by ``search``.
+    KINDS = ('groups', 'modules', 'tests', 'labels', 'errors', 'testvars')
+
+    def __init__(self, testsuites):
+        self.testsuites = testsuites
+        self.lock = Lock()
+        #: :class:`testsuites.Info <testsuites.Info>` object of the loaded testsuite.
+        self.info = None
+        self._items = dict((kind, {}) for kind in self.KINDS)
+        self._lower = dict((kind, {}) for kind in self.KINDS)
+        self._names = dict((kind, []) for kind in self.KINDS)
+        self._by = {}
+        self.refresh(force=True)
+
+    @property
+    def release(self):
+        """CDRouter release of the loaded testsuite as a string."""
+        return self.info.release if self.info is not None else None
+
+    def refresh(self, force=False):
+        """Reload the catalog if the testsuite's release has changed.
+        Makes one request to check the release.
+
+        :param force: (optional) If bool `True`, reload even if the release is unchanged.
+        :return: Bool `True` if the catalog was reloaded.
+        """
+        info = self.testsuites.info()
+        if not force and self.info is not None and info.release == self.info.release:
+            return False
+
+        ts = self.testsuites
+        items = {
+            'groups': ts.list_groups(detailed=True),
+            'modules': ts.list_modules(detailed=True),
+            'tests': ts.list_tests(detailed=True),
+            'labels': ts.list_labels(detailed=True),
+            'errors': ts.list_errors(detailed=True),
+            'testvars': ts.list_testvars(detailed=True),
+        }
+
+        by = {'group': {}, 'module': {}, 'label': {}, 'testvar': {}, 'keyword': {}}
+        for t in items['tests']:
+            by['group'].setdefault(t.group, []).append(t)
+            by['module'].setdefault(t.module, []).append(t)
+            for label in t.labels or []:
+                by['label'].setdefault(label, []).append(t)
+            for tv in t.testvars or []:
+                by['testvar'].setdefault(tv, []).append(t)
+        for tv in items['testvars']:
+            for keyword in tv.keywords or []:
+                by['keyword'].setdefault(keyword, []).append(tv)
+
+        indexes = {}
+        for kind, values in items.items():
+            indexes[kind] = dict((x.name, x) for x in values)
+        # tests can also be looked up by alias
+        for t in items['tests']:
+            for alias in t.aliases or []:
+                indexes['tests'].setdefault(alias, t)
+        # like the API, fall back to case-insensitive lookups
+        lower = {}
+        for kind, index in indexes.items():
+            lower[kind] = dict((name.lower(), x) for name, x in index.items())
+
+        with self.lock:
+            self.info = info
+            self._items = indexes
+            self._lower = lower
+            self._names = dict((kind, sorted(x.name for x in values)) for kind, values in items.items())
+            self._by = by
+        return True
+
+    def _get(self, kind, name, what):
+        item = self._items[kind].get(name)
+        if item is None:
+            item = self._lower[kind].get(name.lower())
+        if item is None:
+            raise CDRouterError('no such {}'.format(what))
+        return item
+
+    def get_group(self, name):
+        """Get a group.
+
+        :param name: Group name as string.
+        :return: :class:`testsuites.Group <testsuites.Group>` object
+        :rtype: testsuites.Group
+        """
+        return self._get('groups', name, 'group')
+
+    def get_module(self, name):
+        """Get a module.
+
+        :param name: Module name as string.
+        :return: :class:`testsuites.Module <testsuites.Module>` object
+        :rtype: testsuites.Module
+        """
+        return self._get('modules', name, 'module')
+
+    def get_test(self, name):
+        """Get a test by name or alias.
+
+        :param name: Test name or alias as string.
+        :return: :class:`testsuites.Test <testsuites.Test>` object
+        :rtype: testsuites.Test
+        """
+        return self._get('tests', name, 'test')
+
+    def get_label(self, name):
+        """Get a label.
+
+        :param name: Label name as string.
+        :return: :class:`testsuites.Label <testsuites.Label>` object
+        :rtype: testsuites.Label
+        """
+        return self._get('labels', name, 'label')
+
+    def get_error(self, name):
+        """Get an error.
+
+        :param name: Error name as string.
+        :return: :class:`testsuites.Error <testsuites.Error>` object
+        :rtype: testsuites.Error
+        """
+        return self._get('errors', name, 'error')
+
+    def get_testvar(self, name):
+        """Get a testvar.
+
+        :param name: Testvar name as string.
+        :return: :class:`testsuites.Testvar <testsuites.Testvar>` object
+        :rtype: testsuites.Testvar
+        """
+        return self._get('testvars', name, 'testvar')
+
+    def tests_in_group(self, name):
+        """Get the tests of a group.
+
+        :param name: Group name as string.
+        :return: :class:`testsuites.Test <testsuites.Test>` list
+        """
+        return list(self._by['group'].get(name, []))
+
+    def tests_in_module(self, name):
+        """Get the tests of a module.
+
+        :param name: Module name as string.
+        :return: :class:`testsuites.Test <testsuites.Test>` list
+        """
+        return list(self._by['module'].get(name, []))
+
+    def tests_with_label(self, name):
+        """Get the tests with a label.
+
+        :param name: Label name as string.
+        :return: :class:`testsuites.Test <testsuites.Test>` list
+        """
+        return list(self._by['label'].get(name, []))
+
+    def tests_using_testvar(self, name):
+        """Get the tests which use a testvar.
+
+        :param name: Testvar name as string.
+        :return: :class:`testsuites.Test <testsuites.Test>` list
+        """
+        return list(self._by['testvar'].get(name, []))
+
+    def testvars_with_keyword(self, keyword):
+        """Get the testvars which accept a keyword value.
+
+        :param keyword: Keyword as string, for example ``'DHCP'``.
+        :return: :class:`testsuites.Testvar <testsuites.Testvar>` list
+        """
+        return list(self._by['keyword'].get(keyword, []))
+
+    def search(self, pattern, kind='tests', regex=False, ignorecase=False):
+        """Search item names by prefix or regular expression.
+
+        :param pattern: Name prefix as string, or a regular expression if ``regex`` is bool `True`.
+        :param kind: (optional) Kind of item to search as string, one of ``KINDS``.
+        :param regex: (optional) If bool `True`, ``pattern`` is a regular expression matched anywhere in names.
+        :param ignorecase: (optional) If bool `True`, ignore case when matching.
+        :return: List of :class:`testsuites.Test <testsuites.Test>`, etc. objects sorted by name.
+        """
+        if kind not in self.KINDS:
+            raise ValueError('unknown kind {}, must be one of {}'.format(kind, ', '.join(self.KINDS)))
+        with self.lock:
+            names = self._names[kind]
+            items = self._items[kind]
+
+        if regex or ignorecase:
+            if not regex:
+                pattern = '^' + re.escape(pattern)
+            r = re.compile(pattern, re.IGNORECASE if ignorecase else 0)
+            return [items[name] for name in names if r.search(name)]
+
+        matches = []
+        for name in names[bisect_left(names, pattern):]:
+            if not name.startswith(pattern):
+                break
+            matches.append(items[name])
+        return matches
+
 class TestsuitesService(object):
     """Service for accessing CDRouter Testsuites."""
 
@@ -425,6 +653,19 @@ class TestsuitesService(object):
     def __init__(self, service):
         self.service = service
         self.base = self.BASE
+        self._catalog = None
+
+    def catalog(self):
+        """Get an in-memory catalog of the testsuite, loading it on first
+        use.  The same catalog is returned by later calls, call its
+        ``refresh`` method to pick up testsuite updates.
+
+        :return: :class:`testsuites.TestsuiteCatalog <testsuites.TestsuiteCatalog>` object
+        :rtype: testsuites.TestsuiteCatalog
+        """
+        if self._catalog is None:
+            self._catalog = TestsuiteCatalog(self)
+        return self._catalog
 
     def info(self):
         """Get testsuite info.
@@ -0,0 +1,320 @@
+#
+# Copyright (c) 2026 by QA Cafe.
+# All Rights Reserved.
+#
+
+"""Module for transferring resources between CDRouter systems."""
+
+from collections import namedtuple
+from threading import Event
+import time
+import uuid
+
+from requests.exceptions import ChunkedEncodingError, RequestException
+
+from . import cdr_decoder
+from .cdr_concurrent import imap_ordered
+from .cdr_error import CDRouterError
+from .imports import ImportSchema, RequestSchema
+
+# resources an import of each resource also carries, imported along
+# with it
+_REFERENCED = {'results': ('configs', 'devices', 'packages')}
+
+def _unreachable(e):
+    # bool True if a URL import failed because the destination system
+    # could not connect to the source system, as a gateway error
+    return isinstance(e, CDRouterError) and e.response is not None and e.response.status_code in (502, 504)
+
+def _piping(e):
+    # bool True if a streamed transfer failed in the pipe through the
+    # client rather than being refused by either system
+    if isinstance(e, CDRouterError):
+        return e.response is not None and e.response.status_code == 413
+    return isinstance(e, RequestException)
+
+def _model(schema, data):
+    # a transfer needs models even if the client returns raw dicts
+    if isinstance(data, dict):
+        return cdr_decoder.decode(schema, data)
+    return data
+
+class TransferredResult(namedtuple('TransferredResult', ['id', 'method', 'nbytes', 'skipped', 'error'])):
+    """Named tuple for one result of a :func:`transfer.Transfer.results
+    <transfer.Transfer.results>` call.
+
+    :param id: Result ID on the source system as an int.
+    :param method: ``'stream'`` if the export was piped through the
+        client, ``'url'`` if the destination system fetched the result
+        from the source system itself, or `None` if no transfer was
+        made.
+    :param nbytes: Export bytes piped through the client as an int, `0` for ``'url'`` transfers.
+    :param skipped: Bool `True` if the result already exists on the
+        destination system and was left as is.
+    :param error: Exception raised, or `None` if the result was imported or skipped.
+    """
+
+class TransferReport(object):
+    """Class representing the outcome of a :func:`transfer.Transfer.results
+    <transfer.Transfer.results>` call.
+
+    :param results: :class:`transfer.TransferredResult <transfer.TransferredResult>` list, in the order of the IDs given.
+    :param elapsed: Seconds the call took as a float.
+    """
+    def __init__(self, results, elapsed):
+        self.results = results
+        self.elapsed = elapsed
+
+    @property
+    def imported(self):
+        """:class:`transfer.TransferredResult <transfer.TransferredResult>` list of the results imported."""
+        return [x for x in self.results if x.error is None and not x.skipped]
+
+    @property
+    def skipped(self):
+        """:class:`transfer.TransferredResult <transfer.TransferredResult>` list of the results already on the destination system."""
+        return [x for x in self.results if x.skipped]
+
+    @property
+    def errors(self):
+        """:class:`transfer.TransferredResult <transfer.TransferredResult>` list of the results that failed."""
+        return [x for x in self.results if x.error is not None]
+
+    @property
+    def nbytes(self):
+        """Export bytes piped through the client as an int."""
+        return sum(x.nbytes for x in self.results)
+
+    @property
+    def throughput(self):
+        """Export bytes piped through the client per second as a float."""
+        if not self.elapsed:
+            return 0.0
+        return self.nbytes / self.elapsed
+
+class _ExportBody(object):
+    """Multipart request body with a single ``file`` field whose content
+    is read from a streaming export response as the request is sent.
+
+    The body has a ``len`` if the export's size is known, so that
+    requests sends it with a Content-Length, and is otherwise sent
+    with chunked transfer encoding by iterating over it.
+    """
+    def __init__(self, resp, filename, chunk_size):
+        self.resp = resp
+        self.chunk_size = chunk_size
+        boundary = uuid.uuid4().hex
+        self.content_type = 'multipart/form-data; boundary={}'.format(boundary)
+        self.head = ('--{}\r\n'
+                     'Content-Disposition: form-data; name="file"; filename="{}"\r\n'
+                     'Content-Type: application/octet-stream\r\n\r\n').format(boundary, filename.replace('"', '')).encode('utf-8')
+        self.tail = '\r\n--{}--\r\n'.format(boundary).encode('utf-8')
+        self.size = None
+        if 'content-encoding' not in resp.headers and resp.headers.get('content-length'):
+            self.size = int(resp.headers['content-length'])
+            self.len = len(self.head) + self.size + len(self.tail)
+        self.nbytes = 0
+        self._chunks = None
+        self._buf = b''
+
+    def __iter__(self):
+        yield self.head
+        for chunk in self.resp.iter_content(chunk_size=self.chunk_size):
+            self.nbytes += len(chunk)
+            yield chunk
+        if self.size is not None and self.nbytes != self.size:
+            # sending fewer bytes than the Content-Length would leave
+            # the destination system waiting for the rest
+            raise ChunkedEncodingError('export ended after {} of {} bytes'.format(self.nbytes, self.size), response=self.resp)
+        yield self.tail
+
+    def read(self, size=-1):
+        if self._chunks is None:
+            self._chunks = iter(self)
+        while not self._buf:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                return b''
+            self._buf = chunk
+        if size is None or size < 0:
+            size = len(self._buf)
+        data, self._buf = self._buf[:size], self._buf[size:]
+        return data
+
+class Transfer(object):
+    """Copier of resources from one CDRouter system to another, by
+    staging and committing an import on the destination system.
+
+    Each result's export is piped from the source system into an
+    upload to the destination system as it downloads, so that results
+    of any size pass through the client without being held in memory
+    or written to disk.  If the pipe fails, the destination system is
+    asked to fetch the result from the source system itself with a URL
+    import.  Several results are transferred concurrently.
+
+    Usage::
+
+      from cdrouter import CDRouter
+      from cdrouter.filters import Field as field
+      from cdrouter.transfer import Transfer
+
+      src = CDRouter('http://lab1', token=token)
+      dst = CDRouter('http://archive', token=token)
+
+      ids = [r.id for r in src.results.iter_list(filter=[field('starred').eq(True)])]
+      report = Transfer(src, dst, workers=4).results(ids)
+      for r in report.errors:
+          print('result {} failed: {}'.format(r.id, r.error))
+
+    :param src: :class:`cdrouter.CDRouter <cdrouter.CDRouter>` object of the source system.
+    :param dst: :class:`cdrouter.CDRouter <cdrouter.CDRouter>` object of the destination system.
+    :param workers: (optional) Maximum number of concurrent transfers as an int.
+    :param via_url: (optional) If bool `True`, only transfer by URL
+        import; if bool `False`, only pipe exports through the client.
+        If `None`, pipe exports and fall back to a URL import for a
+        result whose export or upload is interrupted, or which the
+        destination system refuses as too large.  Once the destination
+        system answers a URL import with a gateway error (502 or 504),
+        meaning it cannot connect to the source system, there is no
+        fallback for the rest of the ``results`` call.
+    :param src_url: (optional) Base URL the destination system reaches
+        the source system at as a string, if not the ``base`` of
+        ``src``, for example when the client goes through a proxy.
+    :param exclude_captures: (optional) If bool `True`, don't transfer
+        capture files of results piped through the client.  URL
+        imports always include them.
+    """
+    def __init__(self, src, dst, workers=4, via_url=None, src_url=None, exclude_captures=False):
+        self.src = src
+        self.dst = dst
+        self.workers = workers
+        self.via_url = via_url
+        self.src_url = src_url if src_url is not None else src.base
+        self.exclude_captures = exclude_captures
+
+    def results(self, ids, replace_existing=False, tags=None, progress=None):
+        """Transfer results.  A result which fails to transfer does not
+        stop the others; failures are reported in the returned
+        :class:`transfer.TransferReport <transfer.TransferReport>`.
+
+        Importing a result also imports the config, device and package
+        it references, unless they already exist on the destination
+        system and ``replace_existing`` is not set.
+
+        :param ids: Result IDs on the source system as an int list.
+        :param replace_existing: (optional) If bool `True`, overwrite
+            results which already exist on the destination system,
+            else skip them.
+        :param tags: (optional) Tags to add to the imported results,
+            and the resources imported with them, as string list.
+        :param progress: (optional) Function called with each
+            :class:`transfer.TransferredResult <transfer.TransferredResult>`
+            as it completes.
+        :return: :class:`transfer.TransferReport <transfer.TransferReport>` object
+        :rtype: transfer.TransferReport
+        """
+        start = time.monotonic()
+        # set once the destination system fails to connect to the
+        # source system for a URL import, shared by this call's
+        # workers only
+        unreachable = Event()
+
+        def transfer(id): # pylint: disable=invalid-name,redefined-builtin
+            transferred = self._transfer('results', id, replace_existing, tags, unreachable)
+            if progress is not None:
+                progress(transferred)
+            return transferred
+        transferred = list(imap_ordered(transfer, ids, self.workers))
+        return TransferReport(transferred, time.monotonic() - start)
+
+    def _transfer(self, resource, id, replace_existing, tags, unreachable): # pylint: disable=invalid-name,redefined-builtin
+        method = None
+        body = None
+        staged = None
+        try:
+            if not replace_existing and self._exists(resource, id):
+                return TransferredResult(id, None, 0, True, None)
+            if self.via_url is not True:
+                method = 'stream'
+                try:
+                    body, staged = self._pipe(resource, id)
+                except (CDRouterError, RequestException) as e:
+                    if self.via_url is False or unreachable.is_set() or not _piping(e):
+                        raise
+            if staged is None:
+                method = 'url'
+                body = None
+                try:
+                    staged = self._stage_url(resource, id)
+                except CDRouterError as ce:
+                    if self.via_url is None and _unreachable(ce):
+                        # the destination system cannot reach the
+                        # source system, so don't fall back for the
+                        # others
+                        unreachable.set()
+                    raise
+
+            skipped = not self._commit(resource, staged, replace_existing, tags)
+            return TransferredResult(id, method, body.nbytes if body is not None else 0, skipped, None)
+        except (CDRouterError, RequestException, OSError) as e:
+            if staged is not None:
+                try:
+                    self.dst.imports.delete(staged.id)
+                except (CDRouterError, RequestException):
+                    pass
+            return TransferredResult(id, method, body.nbytes if body is not None else 0, False, e)
+
+    def _pipe(self, resource, id): # pylint: disable=invalid-name,redefined-builtin
+        # returns (body, staged) once the export is piped into a
+        # staged import, body.nbytes is the bytes piped
+        params = {'format': 'gz', 'exclude_captures': self.exclude_captures}
+        resp = self.src.get(resource+'/'+str(id)+'/', params=params, stream=True)
+        try:
+            filename = self.src.filename(resp, '{}-{}.gz'.format(resource, id))
+            body = _ExportBody(resp, filename, self.src.CHUNK_SIZE)
+            return body, self._stage_stream(body)
+        finally:
+            resp.close()
+
+    def _exists(self, resource, id): # pylint: disable=invalid-name,redefined-builtin
+        try:
+            getattr(self.dst, resource).get(id)
+        except CDRouterError as ce:
+            if ce.response is not None and ce.response.status_code == 404:
+                return False
+            raise
+        return True
+
+    def _stage_url(self, resource, id): # pylint: disable=invalid-name,redefined-builtin
+        url = '{}/{}/{}/'.format(self.src_url.rstrip('/'), resource, id)
+        return _model(ImportSchema(), self.dst.imports.stage_import_from_url(url, token=self.src.token, insecure=self.src.insecure))
+
+    def _stage_stream(self, body):
+        resp = self.dst.post(self.dst.imports.base, data=body, headers={'content-type': body.content_type})
+        return self.dst.decode(ImportSchema(), resp, raw=False)
+
+    def _commit(self, resource, staged, replace_existing, tags):
+        # returns bool False if there was nothing to import
+        impreq = _model(RequestSchema(), self.dst.imports.get_commit_request(staged.id))
+        impreq.replace_existing = replace_existing
+        if tags:
+            impreq.tags = tags
+
+        marked = {}
+        for r in (resource,) + _REFERENCED.get(resource, ()):
+            rs = getattr(impreq, r) or {}
+            marked[r] = [name for name in rs if replace_existing or rs[name].existing_id is None]
+            for name in rs:
+                rs[name].should_import = name in marked[r]
+        if not marked[resource]:
+            self.dst.imports.delete(staged.id)
+            return False
+
+        impreq = _model(RequestSchema(), self.dst.imports.commit(staged.id, impreq))
+        for r, names in marked.items():
+            rs = getattr(impreq, r) or {}
+            for name in names:
+                response = rs[name].response if name in rs else None
+                if response is not None and not response.imported:
+                    raise CDRouterError('{} {} was not imported: {}'.format(r, name, response.message))
+        return True
@@ -0,0 +1,418 @@
+#
+# Copyright (c) 2026 by QA Cafe.
+# All Rights Reserved.
+#
+
+"""Module for watching many running CDRouter Results at once."""
+
+import asyncio
+import heapq
+import inspect
+import itertools
+from threading import Condition, Thread
+import time
+
+from .alerts import Alert
+from .cdr_error import CDRouterError
+from .results import ResultsService, Result, ResultSchema, UpdateSchema, FINISHED
+from .testresults import TestResult
+
+def _get_update(c, id, update_id): # pylint: disable=invalid-name,redefined-builtin
+    if update_id is None:
+        update_id = -1
+    resp = c.get_id(ResultsService.BASE, id, params={'updates': update_id})
+    return c.decode(UpdateSchema(), resp, raw=False)
+
+def _get_result(c, id): # pylint: disable=invalid-name,redefined-builtin
+    resp = c.get_id(ResultsService.BASE, id)
+    return c.decode(ResultSchema(), resp, raw=False)
+
+def _gone(e):
+    # bool True if polling failed because the result was deleted
+    return isinstance(e, CDRouterError) and e.response is not None and e.response.status_code == 404
+
+class _Watch(object):
+    # state of one watched result, turning updates into events
+    def __init__(self, id, update_id): # pylint: disable=invalid-name,redefined-builtin
+        self.id = id
+        self.update_id = update_id
+        self.delay = 0
+        self.progress = None
+        self.started = -1
+        self.finished = -1
+        self.status = None
+        self.done = False
+
+    def on_update(self, update):
+        events = []
+        if update.id is not None:
+            self.update_id = update.id
+
+        if update.progress is not None:
+            progress = (update.progress.finished, update.progress.total, update.progress.progress)
+            if progress != self.progress:
+                self.progress = progress
+                events.append(('progress', update.progress))
+
+        if update.running is not None:
+            events.extend(self._on_test(update.running))
+
+        for u in update.updates or []:
+            if isinstance(u, Result):
+                events.extend(self.on_result(u))
+            elif isinstance(u, TestResult):
+                events.extend(self._on_test(u))
+            elif isinstance(u, Alert):
+                events.append(('alert', u))
+        return events
+
+    def _on_test(self, tr):
+        events = []
+        seq = tr.seq if tr.seq is not None else -1
+        if seq > self.started:
+            self.started = seq
+            events.append(('test_start', tr))
+        if tr.result not in (None, 'running') and seq > self.finished:
+            self.finished = seq
+            events.append(('test_finish', tr))
+        return events
+
+    def on_result(self, r):
+        events = []
+        if r.status != self.status:
+            if r.status == 'paused':
+                events.append(('pause', r))
+            elif r.status == 'running' and self.status == 'paused':
+                events.append(('resume', r))
+            elif r.status in FINISHED:
+                self.done = True
+                events.append(('complete', r))
+            self.status = r.status
+        return events
+
+    def backoff(self, idle, min_interval, max_interval, factor):
+        # long-polls return as soon as there is news, so an active
+        # result is polled again at once and an idle one (queued or
+        # paused) ever less often
+        if not idle:
+            self.delay = 0
+        elif self.delay == 0:
+            self.delay = min_interval
+        else:
+            self.delay = min(self.delay * factor, max_interval)
+        return self.delay
+
+class _Watcher(object):
+    #: Names of the events callbacks can be registered for.
+    EVENTS = ('progress', 'test_start', 'test_finish', 'alert', 'pause', 'resume', 'complete', 'error')
+
+    def __init__(self, min_interval, max_interval, backoff):
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.handlers = dict((event, []) for event in self.EVENTS)
+        self.watches = {}
+
+    def on(self, event, fn=None): # pylint: disable=invalid-name
+        """Register a callback for an event.  Can also be used as a
+        decorator, as ``@watcher.on('complete')``.
+
+        Callbacks are called as ``fn(id, obj)``, where ``id`` is the
+        result ID and ``obj`` depends on the event:
+
+        * ``'progress'``: :class:`results.Progress <results.Progress>` object
+        * ``'test_start'``, ``'test_finish'``: :class:`testresults.TestResult <testresults.TestResult>` object
+        * ``'alert'``: :class:`alerts.Alert <alerts.Alert>` object
+        * ``'pause'``, ``'resume'``, ``'complete'``: :class:`results.Result <results.Result>` object
+        * ``'error'``: Exception raised while polling or by another
+          callback.  A result which no longer exists is no longer
+          watched after its error.
+
+        :param event: Event name as a string, one of ``EVENTS``.
+        :param fn: (optional) Callback function.
+        """
+        if event not in self.handlers:
+            raise ValueError('unknown event {}, must be one of {}'.format(event, ', '.join(self.EVENTS)))
+        if fn is None:
+            def decorator(fn):
+                self.handlers[event].append(fn)
+                return fn
+            return decorator
+        self.handlers[event].append(fn)
+        return fn
+
+    @property
+    def watching(self):
+        """IDs of the results being watched as an int list."""
+        return list(self.watches)
+
+class ResultWatcher(_Watcher):
+    """Watcher for many running results of a :class:`cdrouter.CDRouter
+    <cdrouter.CDRouter>` object, using a pool of threads to long-poll
+    each result's updates.  A result's last update ID is kept between
+    polls, and polls which return no updates are spaced out from
+    ``min_interval`` to ``max_interval`` seconds, so a handful of
+    threads can follow every result of a lab.  A result is no longer
+    watched once it has completed, stopped or failed.
+
+    Usage::
+
+      from cdrouter import CDRouter
+      from cdrouter.watcher import ResultWatcher
+
+      c = CDRouter('http://localhost')
+      with ResultWatcher(c) as w:
+          w.on('progress', lambda id, p: print(id, p.progress))
+          w.on('complete', lambda id, r: print(id, r.status))
+          for r in c.results.iter_list(filter=['status=running']):
+              w.watch(r.id)
+          w.wait()
+
+    Callbacks are called from the watcher's threads.
+
+    :param c: :class:`cdrouter.CDRouter <cdrouter.CDRouter>` object
+    :param workers: (optional) Number of threads polling concurrently as an int.
+    :param min_interval: (optional) Seconds to wait before polling a result again after a poll without updates, as an int or float.
+    :param max_interval: (optional) Maximum seconds to wait between polls of a result without updates, as an int or float.
+    :param backoff: (optional) Factor the wait grows by after each further poll without updates, as an int or float.
+    """
+    def __init__(self, c, workers=8, min_interval=1, max_interval=30, backoff=2):
+        super().__init__(min_interval, max_interval, backoff)
+        self.c = c
+        self.workers = workers
+        self.cond = Condition()
+        self.queue = []
+        self.counter = itertools.count()
+        self.threads = []
+        self.stopped = False
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *args):
+        self.stop()
+
+    def watch(self, id, update_id=None): # pylint: disable=invalid-name,redefined-builtin
+        """Start watching a result.
+
+        :param id: Result ID as an int.
+        :param update_id: (optional) Update ID to start from as an int.
+        """
+        with self.cond:
+            w = _Watch(int(id), update_id)
+            self.watches[w.id] = w
+            self._schedule(w, 0)
+
+    def unwatch(self, id): # pylint: disable=invalid-name,redefined-builtin
+        """Stop watching a result.
+
+        :param id: Result ID as an int.
+        """
+        with self.cond:
+            self.watches.pop(int(id), None)
+            self.cond.notify_all()
+
+    def start(self):
+        """Start the watcher's threads."""
+        with self.cond:
+            self.stopped = False
+            while len(self.threads) < self.workers:
+                t = Thread(target=self._work, daemon=True)
+                t.start()
+                self.threads.append(t)
+
+    def stop(self, wait=True):
+        """Stop the watcher's threads.
+
+        :param wait: (optional) If bool `True`, wait for polls in flight to return, which can take as long as the CDRouter system's long-poll timeout.
+        """
+        with self.cond:
+            self.stopped = True
+            self.cond.notify_all()
+            threads, self.threads = self.threads, []
+        if wait:
+            for t in threads:
+                t.join()
+
+    def wait(self, timeout=None):
+        """Wait until no results are being watched.
+
+        :param timeout: (optional) Seconds to wait as an int or float.
+        :return: Bool `True` if no results are being watched.
+        """
+        with self.cond:
+            return self.cond.wait_for(lambda: not self.watches, timeout=timeout)
+
+    def _schedule(self, w, delay):
+        heapq.heappush(self.queue, (time.monotonic() + delay, next(self.counter), w))
+        self.cond.notify()
+
+    def _next(self):
+        with self.cond:
+            while not self.stopped:
+                if not self.queue:
+                    self.cond.wait()
+                    continue
+                due, _, w = self.queue[0]
+                now = time.monotonic()
+                if due > now:
+                    self.cond.wait(due - now)
+                    continue
+                heapq.heappop(self.queue)
+                if self.watches.get(w.id) is w:
+                    return w
+            return None
+
+    def _work(self):
+        while True:
+            w = self._next()
+            if w is None:
+                return
+            self._poll(w)
+
+    def _poll(self, w):
+        try:
+            update_id = w.update_id
+            events = w.on_update(_get_update(self.c, w.id, update_id))
+            idle = not events and w.update_id == update_id
+            if idle:
+                # no news, make sure the result has not finished
+                # without telling us
+                events = w.on_result(_get_result(self.c, w.id))
+        except Exception as e: # pylint: disable=broad-except
+            events = [('error', e)]
+            idle = True
+            # a deleted result would fail every poll, so stop watching it
+            w.done = _gone(e)
+
+        for event, obj in events:
+            self._dispatch(w.id, event, obj)
+
+        with self.cond:
+            if self.watches.get(w.id) is not w:
+                return
+            if w.done:
+                del self.watches[w.id]
+                self.cond.notify_all()
+                return
+            self._schedule(w, w.backoff(idle, self.min_interval, self.max_interval, self.backoff))
+
+    def _dispatch(self, id, event, obj): # pylint: disable=invalid-name,redefined-builtin
+        for fn in self.handlers[event]:
+            try:
+                fn(id, obj)
+            except Exception as e: # pylint: disable=broad-except
+                if event != 'error':
+                    self._dispatch(id, 'error', e)
+
+class AsyncResultWatcher(_Watcher):
+    """Watcher for many running results of an :class:`aio.AsyncCDRouter
+    <aio.AsyncCDRouter>` object, long-polling each result's updates
+    from a task on the event loop.  Behaves like
+    :class:`watcher.ResultWatcher <watcher.ResultWatcher>`, and
+    callbacks may also be coroutine functions.
+
+    Usage::
+
+      from cdrouter.aio import AsyncCDRouter
+      from cdrouter.watcher import AsyncResultWatcher
+
+      async with AsyncCDRouter('http://localhost') as c:
+          w = AsyncResultWatcher(c)
+          w.on('complete', lambda id, r: print(id, r.status))
+          async for r in c.results.iter_list(filter=['status=running']):
+              w.watch(r.id)
+          await w.run()
+
+    :param c: :class:`aio.AsyncCDRouter <aio.AsyncCDRouter>` object
+    :param concurrency: (optional) Maximum number of polls in flight as an int.
+    :param min_interval: (optional) Seconds to wait before polling a result again after a poll without updates, as an int or float.
+    :param max_interval: (optional) Maximum seconds to wait between polls of a result without updates, as an int or float.
+    :param backoff: (optional) Factor the wait grows by after each further poll without updates, as an int or float.
+    """
+    def __init__(self, c, concurrency=100, min_interval=1, max_interval=30, backoff=2):
+        super().__init__(min_interval, max_interval, backoff)
+        self.c = c
+        self.concurrency = concurrency
+        self.tasks = {}
+        self.semaphore = None
+
+    def watch(self, id, update_id=None): # pylint: disable=invalid-name,redefined-builtin
+        """Start watching a result.  If ``run`` is already running, the
+        result is polled right away.
+
+        :param id: Result ID as an int.
+        :param update_id: (optional) Update ID to start from as an int.
+        """
+        w = _Watch(int(id), update_id)
+        self.unwatch(w.id)
+        self.watches[w.id] = w
+        if self.semaphore is not None:
+            self.tasks[w.id] = asyncio.ensure_future(self._loop(w))
+
+    def unwatch(self, id): # pylint: disable=invalid-name,redefined-builtin
+        """Stop watching a result.
+
+        :param id: Result ID as an int.
+        """
+        self.watches.pop(int(id), None)
+        task = self.tasks.pop(int(id), None)
+        if task is not None:
+            task.cancel()
+
+    async def run(self):
+        """Watch results until none are left to watch."""
+        self.semaphore = asyncio.Semaphore(self.concurrency)
+        try:
+            for w in list(self.watches.values()):
+                if w.id not in self.tasks:
+                    self.tasks[w.id] = asyncio.ensure_future(self._loop(w))
+            while self.tasks:
+                await asyncio.wait(list(self.tasks.values()))
+        finally:
+            for task in self.tasks.values():
+                task.cancel()
+            self.tasks = {}
+            self.semaphore = None
+
+    async def _loop(self, w):
+        try:
+            while self.watches.get(w.id) is w and not w.done:
+                idle = await self._poll(w)
+                if w.done:
+                    break
+                await asyncio.sleep(w.backoff(idle, self.min_interval, self.max_interval, self.backoff))
+        finally:
+            if self.watches.get(w.id) is w:
+                del self.watches[w.id]
+                self.tasks.pop(w.id, None)
+
+    async def _poll(self, w):
+        try:
+            async with self.semaphore:
+                update_id = w.update_id
+                update = await self.c.run(lambda t: _get_update(t, w.id, update_id))
+                events = w.on_update(update)
+                idle = not events and w.update_id == update_id
+                if idle:
+                    result = await self.c.run(lambda t: _get_result(t, w.id))
+                    events = w.on_result(result)
+        except Exception as e: # pylint: disable=broad-except
+            events = [('error', e)]
+            idle = True
+            w.done = _gone(e)
+
+        for event, obj in events:
+            await self._dispatch(w.id, event, obj)
+        return idle
+
+    async def _dispatch(self, id, event, obj): # pylint: disable=invalid-name,redefined-builtin
+        for fn in self.handlers[event]:
+            try:
+                ret = fn(id, obj)
+                if inspect.isawaitable(ret):
+                    await ret
+            except Exception as e: # pylint: disable=broad-except
+                if event != 'error':
+                    await self._dispatch(id, 'error', e)
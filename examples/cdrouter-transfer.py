@@ -9,6 +9,7 @@ import sys
 from cdrouter import CDRouter
 from cdrouter.cdrouter import CDRouterError
 from cdrouter.filters import Field as field
+from cdrouter.transfer import Transfer
 
 parser = argparse.ArgumentParser(description='''
 
@@ -59,6 +60,9 @@ parser.add_argument('--resources', metavar='LIST', help='Comma-separated list of
 parser.add_argument('--after', metavar='DATE', help='Migrate only resources created after this date (format: YYYY-MM-DD)', type=valid_date, default=None)
 parser.add_argument('--before', metavar='DATE', help='Migrate only resources created before this date (format: YYYY-MM-DD)', type=valid_date, default=None)
 
+parser.add_argument('--workers', metavar='INT', help='Number of results to transfer concurrently (default: %(default)s)', type=int, default=4)
+parser.add_argument('--via-url', help='Have DST fetch results from SRC instead of streaming them through this host', action='store_true', default=False)
+
 parser.add_argument('--verbose', help='Enable verbose output', action='store_true', default=False)
 
 args = parser.parse_args()
@@ -144,9 +148,19 @@ if args.after != None:
 if args.before != None:
     filter.append(field('created').lt(args.before))
 
+def print_transferred(r):
+    if r.error is not None:
+        print(f'Error migrating result {r.id}: {r.error}')
+    elif r.skipped:
+        print_verbose(f'Skipping result {r.id}, already exists')
+    else:
+        print(f'Imported result {r.id}')
+
 if 'results' in resources:
     print('\nTransferring results')
-    migrate(src, dst, 'result', 'id', filter, ['results'])
+    ids = [r.id for r in src.results.iter_list(filter=filter, sort='-created')]
+    transfer = Transfer(src, dst, workers=args.workers, via_url=True if args.via_url else None)
+    transfer.results(ids, replace_existing=args.overwrite, progress=print_transferred)
 
 if 'packages' in resources:
     print('\nTransferring packages')
@@ -24,7 +24,6 @@
 #         junit: out/results_*.xml
 #
 import sys
-import time
 import shutil
 import os
 
@@ -55,20 +54,11 @@ jobs = [Job(package_id=p.id, options=Options(tags=result_tags_list)) for p in pa
 
 fails = 0
 # launch all packages
-for j in c.jobs.bulk_launch(jobs=jobs):
-    while j.result_id is None:
-        time.sleep(1)
-        j = c.jobs.get(j.id)
-    print('Test package launched. Result-ID: {0}'.format(j.result_id))
+for f in c.jobs.bulk_submit(jobs):
+    print('Test package launched. Result-ID: {0}'.format(f.started.result().id))
     print('Waiting for job to complete...')
 
-    u = c.results.updates(j.result_id, None)
-    while u:
-        r = c.results.get(j.result_id)
-        if r.status in ['completed', 'stopped', 'error']:
-            break
-        time.sleep(1)
-        u = c.results.updates(j.result_id, u.id)
+    r = f.result()
 
     result_url = base.strip('/') + '/results/' + str(r.id)
     print('Job status: {0}'.format(r.status))
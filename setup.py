@@ -62,4 +62,10 @@ setup(
     keywords="cdrouter json rest api client",
     packages=["cdrouter"],
     install_requires=["future", "marshmallow>=3.13.0,<4.0.0", "requests", "requests-toolbelt", "urllib3<2"],
+    extras_require={
+        "async": ["aiohttp"],
+        "fastjson": ["orjson"],
+        "numpy": ["numpy"],
+        "pandas": ["numpy", "pandas"],
+    },
 )
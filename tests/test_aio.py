@@ -0,0 +1,129 @@
+#
+# Copyright (c) 2026 by QA Cafe.
+# All Rights Reserved.
+#
+
+import asyncio
+
+import pytest
+
+from cdrouter import AsyncCDRouter
+from cdrouter.aio import _imap_ordered
+from cdrouter.cdrouter import CDRouterError
+from cdrouter.results import Result
+
+from .utils import my_cdrouter, my_c, import_all_from_file # pylint: disable=unused-import
+
+class TestAsyncCDRouter:
+    def test_get(self, c):
+        import_all_from_file(c, 'tests/testdata/example.gz')
+
+        async def main():
+            async with AsyncCDRouter(c.base, insecure=c.insecure) as ac:
+                return await ac.results.get(20220821222306)
+
+        r = asyncio.run(main())
+        assert isinstance(r, Result)
+        assert r.id == 20220821222306
+        assert r.status == 'completed'
+
+    def test_gather(self, c):
+        import_all_from_file(c, 'tests/testdata/example.gz')
+
+        async def main():
+            async with AsyncCDRouter(c.base, insecure=c.insecure) as ac:
+                return await asyncio.gather(*[ac.tests.get(20220821222306, seq) for seq in range(1, 5)])
+
+        trs = asyncio.run(main())
+        assert [tr.seq for tr in trs] == [1, 2, 3, 4]
+
+    def test_iter_list(self, c):
+        import_all_from_file(c, 'tests/testdata/example.gz')
+
+        async def main():
+            async with AsyncCDRouter(c.base, insecure=c.insecure) as ac:
+                serial = [tr.seq async for tr in ac.tests.iter_list(20220821222306, limit=1)]
+                prefetched = [tr.seq async for tr in ac.tests.iter_list(20220821222306, limit=1, prefetch=2)]
+                return serial, prefetched
+
+        serial, prefetched = asyncio.run(main())
+        assert serial == [1, 2, 3, 4]
+        assert prefetched == serial
+
+    def test_iter_list_log(self, c):
+        import_all_from_file(c, 'tests/testdata/example.gz')
+
+        async def main():
+            async with AsyncCDRouter(c.base, insecure=c.insecure) as ac:
+                return [l async for l in ac.tests.iter_list_log(20220821222306, 1, limit=100)]
+
+        lines = asyncio.run(main())
+        assert len(lines) == 558
+        assert lines[53].line == 54
+
+        async def main_concurrent():
+            async with AsyncCDRouter(c.base, insecure=c.insecure) as ac:
+                return [l async for l in ac.tests.iter_list_log(20220821222306, 1, limit=10, concurrency=4)]
+
+        assert [l.line for l in asyncio.run(main_concurrent())] == [l.line for l in lines]
+
+        async def main_none():
+            async with AsyncCDRouter(c.base, insecure=c.insecure) as ac:
+                return [l async for l in ac.tests.iter_list_log(20220821222306, 1, limit='none', concurrency=4)]
+
+        assert [l.line for l in asyncio.run(main_none())] == [l.line for l in lines]
+
+    def test_error(self, c):
+        async def main():
+            async with AsyncCDRouter(c.base, insecure=c.insecure) as ac:
+                await ac.results.get(1)
+
+        with pytest.raises(CDRouterError):
+            asyncio.run(main())
+
+    def test_unsupported(self, tmp_path):
+        async def main():
+            async with AsyncCDRouter('http://localhost') as ac:
+                with pytest.raises(NotImplementedError, match='ResultsService.iter_csv'):
+                    ac.results.iter_csv()
+                with pytest.raises(NotImplementedError, match='JobsService.submit'):
+                    ac.jobs.submit([])
+                with pytest.raises(NotImplementedError, match='TestsuitesService.catalog'):
+                    ac.testsuites.catalog()
+                with pytest.raises(NotImplementedError, match='CapturesService.download_all'):
+                    ac.captures.download_all(20220821222306, str(tmp_path))
+                with pytest.raises(NotImplementedError, match='dest'):
+                    await ac.results.export(20220821222306, dest=str(tmp_path))
+                with pytest.raises(NotImplementedError, match='dest'):
+                    await ac.results.export(20220821222306, False, str(tmp_path))
+
+        asyncio.run(main())
+
+    def test_imap_ordered(self):
+        started = []
+
+        async def fetch(n):
+            started.append(n)
+            await asyncio.sleep(0.01 * (n % 3))
+            return n
+
+        async def main():
+            got = []
+            async for n in _imap_ordered(fetch, range(20), 3):
+                got.append(n)
+                # a slow consumer: no more than 3 calls run ahead
+                await asyncio.sleep(0.02)
+                assert len(started) <= len(got) + 3
+            return got
+
+        assert asyncio.run(main()) == list(range(20))
+
+        async def stop():
+            async for n in _imap_ordered(fetch, range(100), 3):
+                if n == 5:
+                    break
+            await asyncio.sleep(0.05)
+
+        started.clear()
+        asyncio.run(stop())
+        assert len(started) <= 9
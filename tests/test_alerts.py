@@ -22,6 +22,10 @@ class TestAlerts:
 
         assert len(list(c.alerts.iter_list(20220831203101, limit=1))) == 608
 
+        alerts = list(c.alerts.iter_list(20220831203101, limit=10, prefetch=4))
+        assert len(alerts) == 608
+        assert [a.idx for a in alerts] == [a.idx for a in c.alerts.iter_list(20220831203101, limit=10)]
+
     def test_get(self, c):
         import_all_from_file(c, 'tests/testdata/example4.gz')
 
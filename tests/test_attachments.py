@@ -82,8 +82,9 @@ class TestAttachments:
         assert a.path == '/usr/cdrouter-data/attachments/1/example.gz'
         assert a.device_id == d.id
 
+        sent = []
         with open('tests/testdata/example.gz', 'rb') as fd:
-            a = c.attachments.create(d.id, fd, filename='example2.gz')
+            a = c.attachments.create(d.id, fd, filename='example2.gz', progress=lambda nbytes, total: sent.append((nbytes, total)))
 
         assert a.id == 2
         assert a.name == 'example2.gz'
@@ -92,6 +93,11 @@ class TestAttachments:
         assert a.path == '/usr/cdrouter-data/attachments/1/example2.gz'
         assert a.device_id == d.id
 
+        assert len(sent) > 1
+        nbytes, total = sent[-1]
+        assert nbytes == total
+        assert total > 118814
+
     def test_download(self, c, tmp_path):
         import_all_from_file(c, 'tests/testdata/example.gz')
 
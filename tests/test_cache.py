@@ -0,0 +1,71 @@
+#
+# Copyright (c) 2026 by QA Cafe.
+# All Rights Reserved.
+#
+
+import requests
+
+from cdrouter.cdrouter import CDRouter
+from cdrouter.cdr_cache import ResponseCache
+
+def response(status, content=b'', headers=None):
+    resp = requests.models.Response()
+    resp.status_code = status
+    resp.headers.update(headers or {})
+    resp._content = content # pylint: disable=protected-access
+    return resp
+
+class TestCache:
+    def test_store_not_modified(self):
+        cache = ResponseCache(ttl=60)
+        cache.store('configs/', None, response(200, b'old', {'etag': '"1"'}))
+        cache.entries[('configs/', ())].expires = 0
+
+        resp, validators = cache.lookup('configs/', None)
+        assert resp is None
+        assert validators == {'if-none-match': '"1"'}
+        assert cache.store('configs/', None, response(304)).content == b'old'
+        assert cache.revalidations == 1
+
+        cache.invalidate()
+        assert cache.store('configs/', None, response(304)) is None
+
+    def test_invalidate_after_request(self):
+        cache = ResponseCache(ttl=60)
+        c = CDRouter('http://localhost', token='x', cache=cache)
+        sent = []
+
+        def request(method, path, headers=None, **kwargs): # pylint: disable=unused-argument
+            sent.append(method)
+            if method == 'GET':
+                return response(200, b'new' if 'PATCH' in sent else b'old')
+            # a GET made by another thread while the edit is in flight
+            cache.store('configs/1/', None, response(200, b'old'))
+            return response(200)
+        c.session.request = request
+
+        assert c.get('configs/1/').content == b'old'
+        c.patch('configs/1/', json={})
+        assert c.get('configs/1/').content == b'new'
+        assert sent == ['GET', 'PATCH', 'GET']
+
+    def test_revalidate_evicted(self):
+        cache = ResponseCache(ttl=60)
+        c = CDRouter('http://localhost', token='x', cache=cache)
+        sent = []
+
+        def request(method, path, headers=None, **kwargs): # pylint: disable=unused-argument
+            sent.append(headers.get('if-none-match'))
+            if 'if-none-match' in headers:
+                # evicted by other requests while revalidating
+                cache.invalidate()
+                return response(304, headers={'etag': '"1"'})
+            return response(200, b'body', {'etag': '"1"'})
+        c.session.request = request
+
+        assert c.get('configs/').content == b'body'
+        cache.entries[('configs/', ())].expires = 0
+        assert c.get('configs/').content == b'body'
+        assert sent == [None, '"1"', None]
+        assert c.get('configs/').content == b'body'
+        assert sent == [None, '"1"', None]
@@ -9,6 +9,7 @@ import shutil
 import pytest
 
 from cdrouter.cdrouter import CDRouterError
+from cdrouter.filters import Field as field
 
 from .utils import my_cdrouter, my_c, import_all_from_file # pylint: disable=unused-import
 
@@ -76,6 +77,29 @@ class TestCaptures:
         with open(filename, 'wb') as fd:
             shutil.copyfileobj (b, fd)
 
+    def test_download_all(self, c, tmp_path):
+        import_all_from_file(c, 'tests/testdata/example.gz')
+
+        idd = 20220821222306
+
+        done = []
+        report = c.captures.download_all(idd, str(tmp_path), workers=2, progress=done.append)
+        assert len(report.errors) == 0
+        assert len(report.skipped) == 0
+        assert len(report.downloaded) == len(done) > 0
+        assert report.nbytes == sum(path.stat().st_size for path in tmp_path.glob('*/*'))
+        assert report.throughput > 0
+        # start has three captures, see test_list
+        assert len(list((tmp_path / '1').iterdir())) == 3
+
+        report = c.captures.download_all(idd, str(tmp_path))
+        assert len(report.downloaded) == 0
+        assert len(report.skipped) == len(done)
+        assert report.nbytes == 0
+
+        report = c.captures.download_all(idd, str(tmp_path / 'fail'), filter=[field('result').eq('fail')])
+        assert {x.seq for x in report.files} <= {t.seq for t in c.tests.iter_list(idd, filter=[field('result').eq('fail')])}
+
     @pytest.mark.skipif('CLOUDSHARK_URL' not in environ, reason="requires CLOUDSHARK_URL env var")
     @pytest.mark.skipif('CLOUDSHARK_TOKEN' not in environ, reason="requires CLOUDSHARK_TOKEN env var")
     def test_send_to_cloudshark(self, c):
@@ -3,13 +3,22 @@
 # All Rights Reserved.
 #
 
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+import logging
 from os import environ
 import pytest
 import requests
+from marshmallow.exceptions import ValidationError
 from requests.exceptions import SSLError
 
-from cdrouter.cdrouter import CDRouter, CDRouterError
-from cdrouter.configs import ConfigSchema
+from cdrouter.cdrouter import CDRouter, CDRouterError, AUTH_MODE_AUTOMATIC, AUTH_MODE_TOKEN, AUTH_MODE_EXPIRED
+from cdrouter.cdr_cache import ResponseCache
+from cdrouter.cdr_http import DEFAULT_SOCKET_OPTIONS, PoolAdapter, keepalive_options
+from cdrouter.instrumentation import Instrument, RequestMetrics, exposition
+from cdrouter.configs import Config, ConfigSchema
+from cdrouter.filters import Field as field
+from cdrouter.results import ResultSchema
 
 from .utils import my_cdrouter, my_c, my_c_https, import_all_from_file # pylint: disable=unused-import
 
@@ -51,6 +60,32 @@ class TestCDRouter:
         with pytest.raises(CDRouterError, match='invalid token'):
             c2.system.hostname()
 
+    def test_auth_mode(self, c):
+        u = c.users.get_by_name('admin')
+
+        new_password = 'cdrouter2'
+        c.users.change_password(u.id, new_password)
+
+        c2 = CDRouter(c.base, insecure=c.insecure, username=u.name, password=new_password)
+        assert c2.auth_mode is None
+        c2.system.hostname()
+        assert c2.auth_mode == AUTH_MODE_AUTOMATIC
+        assert c2.token is None
+
+        prefs = c.system.get_preferences()
+        prefs.automatic_login = False
+        c.system.edit_preferences(prefs)
+
+        c2.system.hostname()
+        assert c2.auth_mode == AUTH_MODE_TOKEN
+        assert c2.token is not None
+
+        c3 = CDRouter(c.base, insecure=c.insecure, token='invalid')
+        assert c3.auth_mode == AUTH_MODE_TOKEN
+        with pytest.raises(CDRouterError, match='invalid token'):
+            c3.system.hostname()
+        assert c3.auth_mode == AUTH_MODE_EXPIRED
+
     def test_username_password(self, c):
         u = c.users.get_by_name('admin')
 
@@ -162,6 +197,188 @@ class TestCDRouter:
         assert len(cfgs) == 1
         assert cfgs[0].name == 'foo.conf'
 
+    def test_validate(self, c):
+        content = '{"data": [{"id": "20220821222306", "created": "2022-08-21T22:23:06-04:00", "updated": "bogus", "pass": "3", "locked": "true", "tags": ["foo"]}], "links": {"total": 1}}'.encode("utf-8")
+
+        decoded = []
+        for validate in [False, True]:
+            c2 = CDRouter(c.base, insecure=c.insecure, validate=validate)
+            resp = requests.models.Response()
+            resp.status_code = 200
+            resp._content = content # pylint: disable=protected-access
+            resp.encoding = "utf-8"
+            decoded.append(c2.decode(ResultSchema(), resp, many=True, links=True))
+
+        for results, links in decoded:
+            assert len(results) == 1
+            r = results[0]
+            assert r.id == 20220821222306
+            assert r.created.year == 2022
+            assert r.updated == datetime.min
+            assert r.passed == 3
+            assert r.locked is True
+            assert r.tags == ['foo']
+            assert links.total == 1
+            assert links.next is None
+        fast, slow = decoded[0][0][0], decoded[1][0][0]
+        for attr in fast.__slots__:
+            assert getattr(fast, attr) == getattr(slow, attr)
+
+        resp = requests.models.Response()
+        resp.status_code = 200
+        resp._content = '{"data": [{"id": "foo"}]}'.encode("utf-8") # pylint: disable=protected-access
+        resp.encoding = "utf-8"
+        with pytest.raises(ValidationError):
+            c.decode(ResultSchema(), resp, many=True)
+
+    def test_json_backend(self, c):
+        content = '{"data": {"name": "foo.conf", "tags": ["\u00e9"]}}'.encode("utf-8")
+
+        for json_backend in [None, 'json', 'orjson', lambda b: {'data': {'name': 'bar.conf'}}]:
+            c2 = CDRouter(c.base, insecure=c.insecure, json_backend=json_backend)
+            resp = requests.models.Response()
+            resp.status_code = 200
+            resp._content = content # pylint: disable=protected-access
+            cfg = c2.decode(ConfigSchema(), resp)
+            if callable(json_backend):
+                assert cfg.name == 'bar.conf'
+            else:
+                assert cfg.name == 'foo.conf'
+                assert cfg.tags == ['\u00e9']
+
+        with pytest.raises(ValueError, match='unknown JSON backend'):
+            CDRouter(c.base, insecure=c.insecure, json_backend='foo')
+
+    def test_raw(self, c):
+        import_all_from_file(c, 'tests/testdata/example.gz')
+
+        c2 = CDRouter(c.base, insecure=c.insecure, raw=True)
+
+        r = c2.results.get(20220821222306)
+        assert isinstance(r, dict)
+        assert int(r['id']) == 20220821222306
+
+        rs, links = c2.results.list()
+        assert isinstance(rs[0], dict)
+        assert links.total == 1
+
+        lines = list(c2.tests.iter_list_log(20220821222306, 1, limit=100))
+        assert len(lines) == 558
+        assert lines[53]['line'] == 54
+
+    def test_raw_helpers(self, c, tmp_path):
+        import_all_from_file(c, 'tests/testdata/example.gz')
+
+        c2 = CDRouter(c.base, insecure=c.insecure, raw=True)
+
+        sync = c2.results.sync_logdir(20220821222306, str(tmp_path / 'logdir'))
+        assert len(sync.downloaded) == 32
+        assert len(sync.errors) == 0
+
+        report = c2.captures.download_all(20220821222306, str(tmp_path / 'captures'), filter=[field('seq').eq(1)])
+        assert len(report.downloaded) == 3
+        assert len(report.errors) == 0
+
+        d = c2.devices.get_by_name('Cisco E4200')
+        assert isinstance(d, dict)
+        assert d['name'] == 'Cisco E4200'
+
+    def test_cache(self, c):
+        cache = ResponseCache()
+        c2 = CDRouter(c.base, insecure=c.insecure, cache=cache)
+
+        tests = c2.testsuites.list_tests()
+        assert cache.hits == 0
+        assert len(c2.testsuites.list_tests()) == len(tests)
+        assert cache.hits > 0
+
+        hits = cache.hits
+        c2.system.hostname()
+        c2.system.hostname()
+        assert cache.hits == hits
+
+        cfg = c2.configs.create(Config(contents='testvar wanIspIp 1.1.1.1', name='cached.conf'))
+        assert c2.configs.get(cfg.id).name == 'cached.conf'
+        assert c2.configs.get(cfg.id).name == 'cached.conf'
+        cfg.name = 'renamed.conf'
+        c2.configs.edit(cfg)
+        assert c2.configs.get(cfg.id).name == 'renamed.conf'
+
+    def test_instruments(self, c):
+        import_all_from_file(c, 'tests/testdata/example.gz')
+
+        class Recorder(Instrument):
+            def __init__(self):
+                self.before = []
+                self.after = []
+
+            def before_request(self, record):
+                self.before.append(record)
+
+            def after_request(self, record):
+                self.after.append(record)
+
+        metrics = RequestMetrics()
+        recorder = Recorder()
+        c2 = CDRouter(c.base, insecure=c.insecure, instruments=[metrics, recorder])
+
+        c2.results.get(20220821222306)
+        with pytest.raises(CDRouterError):
+            c2.results.get(9999)
+
+        assert len(recorder.before) == 2
+        assert recorder.before == recorder.after
+        (r, err) = recorder.after
+        assert r.method == 'GET'
+        assert r.template == 'results/{id}/'
+        assert r.status == 200
+        assert r.bytes_in > 0
+        assert r.elapsed >= r.server_time > 0
+        assert r.decode_time > 0
+        assert r.error is None
+        assert err.status == 404
+        assert isinstance(err.error, CDRouterError)
+
+        assert metrics.requests == {('GET', 'results/{id}/', '200'): 1, ('GET', 'results/{id}/', '404'): 1}
+        assert metrics.decode[('GET', 'results/{id}/')].count == 1
+        assert 'cdrouter_request_duration_seconds_count{method="GET",path="results/{id}/"} 2' in exposition(metrics)
+
+    def test_threads(self, c, caplog):
+        import_all_from_file(c, 'tests/testdata/example.gz')
+
+        c2 = CDRouter(c.base, insecure=c.insecure, pool_maxsize=16,
+                      socket_options=DEFAULT_SOCKET_OPTIONS + keepalive_options(idle=30))
+        with caplog.at_level(logging.WARNING, logger='urllib3'):
+            with ThreadPoolExecutor(16) as pool:
+                ids = list(pool.map(lambda _: c2.results.get(20220821222306).id, range(64)))
+        assert ids == [20220821222306] * 64
+        assert 'pool is full' not in caplog.text
+
+    def test_timeout(self, c):
+        class RecordingAdapter(PoolAdapter):
+            def __init__(self):
+                super().__init__()
+                self.sent = []
+
+            def send(self, request, **kwargs): # pylint: disable=arguments-differ
+                self.sent.append((kwargs['timeout'], request.headers.get('connection')))
+                return super().send(request, **kwargs)
+
+        c2 = CDRouter(c.base, insecure=c.insecure, timeout=(5, 30), keep_alive=False)
+        adapter = RecordingAdapter()
+        c2.session.mount(c.base, adapter)
+
+        c2.system.hostname()
+        with c2.request_timeout(120):
+            c2.system.hostname()
+            with c2.request_timeout(None):
+                c2.system.hostname()
+            c2.system.hostname()
+        c2.system.hostname()
+
+        # the first request may be preceded by an auth mode probe
+        assert adapter.sent[-5:] == [((5, 30), 'close'), (120, 'close'), (None, 'close'), (120, 'close'), ((5, 30), 'close')]
+
     def test_exclude_unknown_fields_error_response(self, c):
         resp = requests.models.Response()
         resp.status_code = 400
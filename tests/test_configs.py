@@ -5,6 +5,7 @@
 
 import shutil
 import pytest
+import requests
 
 from cdrouter.cdrouter import CDRouterError
 from cdrouter.configs import Config, Testvar
@@ -401,6 +402,41 @@ class TestConfigs:
         assert configs[1].name == 'My config 2 (copy 1)'
         assert configs[2].name == 'My config 3 (copy 1)'
 
+    def test_bulk_chunked(self, c, tmp_path):
+        c.bulk_chunk_size = 2
+
+        configs = []
+        for ii in range(1, 6):
+            cfg = Config(
+                name='My config {}'.format(ii),
+            )
+            configs.append(c.configs.create(cfg))
+        ids = [cfg.id for cfg in configs]
+
+        copies = c.configs.bulk_copy(ids)
+        assert [cfg.name for cfg in copies] == ['My config {} (copy 1)'.format(ii) for ii in range(1, 6)]
+
+        report = c.configs.bulk_delete([cfg.id for cfg in copies])
+        assert len(report.chunks) == 3
+        assert report.errors == []
+
+        (b, filename) = c.configs.bulk_export(ids)
+
+        filename = '{}/{}'.format(tmp_path, 'example.gz')
+        with open(filename, 'wb') as fd:
+            shutil.copyfileobj(b, fd)
+
+        c.configs.bulk_delete(ids)
+
+        for cfg in configs:
+            with pytest.raises(CDRouterError, match='no such config'):
+                c.configs.get(cfg.id)
+
+        import_all_from_file(c, filename)
+
+        for cfg in configs:
+            cfg = c.configs.get_by_name(cfg.name)
+
     def test_bulk_edit(self, c):
         configs = []
         for ii in range(1, 4):
@@ -504,7 +540,8 @@ class TestConfigs:
         )
         cfg5 = c.configs.create(cfg5)
 
-        c.configs.bulk_delete([cfg2.id, cfg3.id])
+        resp = c.configs.bulk_delete([cfg2.id, cfg3.id])
+        assert isinstance(resp, requests.Response)
         c.configs.get(cfg.id)
         with pytest.raises(CDRouterError, match='no such config'):
             c.configs.get(cfg2.id)
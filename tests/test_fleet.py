@@ -0,0 +1,69 @@
+#
+# Copyright (c) 2026 by QA Cafe.
+# All Rights Reserved.
+#
+
+from concurrent.futures import TimeoutError as FutureTimeoutError
+import socket
+
+from requests.exceptions import ConnectionError as RequestsConnectionError, ReadTimeout
+
+from cdrouter import CDRouter, CDRouterFleet
+from cdrouter.cdrouter import CDRouterError
+
+from .utils import my_cdrouter, my_c, import_all_from_file # pylint: disable=unused-import
+
+class TestFleet:
+    def test_call(self, c):
+        with CDRouterFleet({'a': c, 'b': CDRouter(c.base, insecure=c.insecure)}) as fleet:
+            r = fleet.system.hostname()
+            assert list(r.data) == ['a', 'b']
+            assert r.data['a'] == r.data['b']
+            assert r.errors == {}
+
+            r = fleet.results.get(1)
+            assert r.data == {}
+            assert isinstance(r.errors['a'], CDRouterError)
+            assert isinstance(r.errors['b'], CDRouterError)
+
+            r = fleet.call(lambda c: c.base)
+            assert r.data['a'] == c.base
+
+    def test_errors(self, c):
+        with CDRouterFleet({'a': c, 'down': CDRouter('http://127.0.0.1:1')}) as fleet:
+            r = fleet.system.hostname()
+            assert list(r.data) == ['a']
+            assert isinstance(r.errors['down'], RequestsConnectionError)
+
+        with CDRouterFleet([c]) as fleet:
+            r = fleet.call(lambda c: __import__('time').sleep(2), timeout=0.1)
+            assert isinstance(r.errors[c.base], FutureTimeoutError)
+
+    def test_hung(self):
+        # accepts connections but never answers
+        with socket.socket() as sock:
+            sock.bind(('127.0.0.1', 0))
+            sock.listen(8)
+            hung = CDRouter('http://127.0.0.1:{}'.format(sock.getsockname()[1]), token='x')
+
+            with CDRouterFleet({'hung': hung}, workers=1, timeout=0.5) as fleet:
+                r = fleet.system.hostname()
+                assert isinstance(r.errors['hung'], (FutureTimeoutError, ReadTimeout))
+
+                # the request timed out as well, freeing the only worker
+                r = fleet.call(lambda c: c.base, timeout=10)
+                assert r.data == {'hung': hung.base}
+
+    def test_list(self, c):
+        import_all_from_file(c, 'tests/testdata/example.gz')
+
+        with CDRouterFleet({'a': c, 'b': CDRouter(c.base, insecure=c.insecure)}) as fleet:
+            page = fleet.list('tests', 20220821222306, sort='-seq', limit=1)
+            assert page.errors == {}
+            assert [(r.system, r.data.seq) for r in page.data] == [
+                ('a', 4), ('b', 4), ('a', 3), ('b', 3), ('a', 2), ('b', 2), ('a', 1), ('b', 1),
+            ]
+
+            page = fleet.list('results', detailed=True)
+            assert len(page.data) == 2
+            assert set(r.system for r in page.data) == {'a', 'b'}
@@ -0,0 +1,75 @@
+#
+# Copyright (c) 2026 by QA Cafe.
+# All Rights Reserved.
+#
+
+from cdrouter.instrumentation import Histogram, RequestMetrics, RequestRecord, exposition, path_template
+
+class TestInstrumentation:
+    def test_path_template(self):
+        assert path_template('results/')                                == 'results/'
+        assert path_template('results/20220821222306/')                 == 'results/{id}/'
+        assert path_template('results/20220821222306/tests/4/log/')     == 'results/{id}/tests/{seq}/log/'
+        assert path_template('/results/1/tests/2/captures/lan/')        == 'results/{id}/tests/{seq}/captures/{interface}/'
+        assert path_template('results/1/alerts/3/')                     == 'results/{id}/alerts/{idx}/'
+        assert path_template('testsuites/1/tests/start/')               == 'testsuites/{id}/tests/{name}/'
+        assert path_template('configs/5/testvars/lanIp/')               == 'configs/{id}/testvars/{name}/'
+        assert path_template('results/1/logdir/')                       == 'results/{id}/logdir/'
+        assert path_template('results/1/logdir/output.txt/')            == 'results/{id}/logdir/{name}/'
+        assert path_template('results/1/logdir/captures/lan.pcap/')     == 'results/{id}/logdir/{name}/'
+        assert path_template('system/hostname/')                        == 'system/hostname/'
+
+    def test_histogram(self):
+        h = Histogram(buckets=(1, 2, 4))
+        assert h.quantile(0.5) is None
+
+        for value in [0.5, 1, 1.5, 3, 10]:
+            h.observe(value)
+
+        assert h.count == 5
+        assert h.sum == 16
+        assert h.counts == [2, 1, 1, 1]
+        assert h.cumulative() == [(1, 2), (2, 3), (4, 4), (float('inf'), 5)]
+        assert h.quantile(0.2) == 0.5
+        assert h.quantile(0.6) == 2
+        assert h.quantile(1) == 4
+
+    def test_exposition(self):
+        m = RequestMetrics(buckets=(0.1, 1))
+
+        r = RequestRecord('GET', 'results/1/')
+        r.status = 200
+        r.elapsed = 0.05
+        r.server_time = 0.04
+        r.bytes_in = 100
+        m.after_request(r)
+        r.decode_time = 0.5
+        m.after_decode(r)
+
+        r = RequestRecord('GET', 'results/2/')
+        r.elapsed = 2
+        r.retries = 1
+        m.after_request(r)
+
+        assert m.requests == {('GET', 'results/{id}/', '200'): 1, ('GET', 'results/{id}/', 'error'): 1}
+        assert m.latency[('GET', 'results/{id}/')].count == 2
+        assert m.server[('GET', 'results/{id}/')].count == 1
+
+        text = exposition(m)
+        assert '# TYPE cdrouter_requests_total counter\n' in text
+        assert 'cdrouter_requests_total{method="GET",path="results/{id}/",status="200"} 1\n' in text
+        assert 'cdrouter_request_duration_seconds_bucket{method="GET",path="results/{id}/",le="0.1"} 1\n' in text
+        assert 'cdrouter_request_duration_seconds_bucket{method="GET",path="results/{id}/",le="+Inf"} 2\n' in text
+        assert 'cdrouter_request_duration_seconds_count{method="GET",path="results/{id}/"} 2\n' in text
+        assert 'cdrouter_decode_duration_seconds_sum{method="GET",path="results/{id}/"} 0.5\n' in text
+        assert 'cdrouter_response_bytes_total{method="GET",path="results/{id}/"} 100\n' in text
+        assert 'cdrouter_retries_total{method="GET",path="results/{id}/"} 1\n' in text
+        assert not text.endswith('# EOF\n')
+
+        text = exposition(m, openmetrics=True)
+        assert '# TYPE cdrouter_requests counter\n' in text
+        assert 'cdrouter_requests_total{method="GET",path="results/{id}/",status="200"} 1\n' in text
+        assert text.endswith('# EOF\n')
+
+        m.reset()
+        assert exposition(m) == '\n'
@@ -8,11 +8,12 @@ import pytest
 
 from marshmallow import Schema, post_load
 
-from cdrouter.cdrouter import CDRouterError
+from cdrouter.cdrouter import CDRouter, CDRouterError
 from cdrouter.cdr_datetime import DateTime
 from cdrouter.configs import Testvar
 from cdrouter.filters import Field as field
-from cdrouter.jobs import Job, Options
+from cdrouter.jobs import Job, JobFuture, JobScheduler, Options
+from cdrouter.results import Result
 
 from .utils import my_cdrouter, my_c, import_all_from_file # pylint: disable=unused-import
 
@@ -154,6 +155,70 @@ class TestJobs:
 
         assert len(list(c.jobs.iter_list())) == 2
 
+    def test_submit(self, c):
+        import_all_from_file(c, 'tests/testdata/example2.gz')
+
+        package = c.packages.get_by_name('example')
+
+        f = c.jobs.submit(Job(package_id=package.id))
+        assert isinstance(f.job, Job)
+
+        r = f.started.result(timeout=300)
+        assert isinstance(r, Result)
+
+        r = f.result(timeout=300)
+        assert r.id == f.started.result().id
+        assert r.id == f.job.result_id
+        assert r.status == 'completed'
+
+    def test_bulk_submit(self, c):
+        import_all_from_file(c, 'tests/testdata/example2.gz')
+
+        package = c.packages.get_by_name('example')
+
+        futures = c.jobs.bulk_submit([Job(package_id=package.id), Job(package_id=package.id)])
+        assert len(futures) == 2
+
+        results = [f.result(timeout=600) for f in futures]
+        assert [r.status for r in results] == ['completed', 'completed']
+        assert results[0].id != results[1].id
+        assert c.jobs.scheduler.pending == {}
+        assert c.jobs.scheduler.running == {}
+
+    def test_scheduler_errors(self):
+        s = JobScheduler(CDRouter('http://localhost', token='x'), interval=0.01, max_errors=3)
+        polls = []
+
+        def poll():
+            polls.append(None)
+            raise ValueError('not a list of jobs')
+        s.poll = poll
+
+        f = JobFuture(Job(id=1))
+        s.add(f)
+        with pytest.raises(ValueError, match='not a list of jobs'):
+            f.result(timeout=10)
+        with pytest.raises(ValueError):
+            f.started.result(timeout=10)
+        assert len(polls) == 3
+
+        thread = s.thread
+        if thread is not None:
+            thread.join(10)
+        assert s.thread is None
+
+        def poll_ok():
+            with s.cond:
+                for f in s.pending.values():
+                    f.set_result(None)
+                s.pending = {}
+        s.poll = poll_ok
+
+        # a new thread is started for the next future
+        f = JobFuture(Job(id=2))
+        s.add(f)
+        assert f.result(timeout=10) is None
+
     def test_delete(self, c):
         import_all_from_file(c, 'tests/testdata/example2.gz')
 
@@ -0,0 +1,113 @@
+#
+# Copyright (c) 2026 by QA Cafe.
+# All Rights Reserved.
+#
+
+from cdrouter.cdrouter import CDRouter, Links
+from cdrouter.mirror import Mirror
+from cdrouter.results import Result
+from cdrouter.testresults import TestResult
+
+from .utils import my_cdrouter, my_c, import_all_from_file # pylint: disable=unused-import
+
+class Results:
+    # just enough of a CDRouter object to list results to a Mirror,
+    # calling before_list ahead of answering each results list
+    def __init__(self, updated):
+        self.updated = dict(updated)
+        self.before_list = None
+
+    iter_list = CDRouter.iter_list
+
+    def list(self, base, filter=None, type=None, sort=None, limit=None, page=None, detailed=None): # pylint: disable=redefined-builtin,unused-argument
+        if base != 'results/':
+            return [], Links()
+        if self.before_list is not None:
+            self.before_list()
+
+        rs = [{'id': str(id), 'updated': updated} for id, updated in self.updated.items()]
+        for f in filter or []:
+            key = int if f.field == 'id' else str
+            op = {'=': lambda a, b: a == b, '>': lambda a, b: a > b}[f.op]
+            rs = [r for r in rs if op(key(r[f.field]), key(f.value))]
+        sort = sort if isinstance(sort, list) else [sort]
+        rs.sort(key=lambda r: tuple(int(r[k[1:]]) if k == '+id' else r[k[1:]] for k in sort))
+
+        start = ((page or 1) - 1) * limit
+        return rs[start:start+limit], Links(next=(page or 1) + 1 if start + limit < len(rs) else None)
+
+    def decode(self, schema, resp, many=None, links=False, raw=None): # pylint: disable=unused-argument
+        return resp
+
+def mirrored(m):
+    return sorted(id for (id,) in m.conn.execute('SELECT id FROM results'))
+
+class TestMirror:
+    def test_sync_same_updated(self):
+        c = Results({1: 't1', 2: 't1', 3: 't1', 4: 't2', 5: 't2'})
+        with Mirror(c, limit=2) as m:
+            assert m.sync().results == 5
+            assert mirrored(m) == [1, 2, 3, 4, 5]
+
+            # a result updated at the same time as the last one stored
+            c.updated[6] = 't2'
+            assert m.sync().results == 1
+            assert mirrored(m) == [1, 2, 3, 4, 5, 6]
+
+    def test_sync_updated_meanwhile(self):
+        c = Results({1: 't1', 2: 't2', 3: 't3', 4: 't4', 5: 't5', 6: 't6'})
+        calls = []
+
+        def before_list():
+            # result 1 is updated once the first page is sent, which
+            # moves every other result up a place
+            calls.append(None)
+            if len(calls) == 2:
+                c.updated[1] = 't7'
+        c.before_list = before_list
+
+        with Mirror(c, limit=2) as m:
+            m.sync()
+            assert mirrored(m) == [1, 2, 3, 4, 5, 6]
+
+    def test_sync(self, c, tmp_path):
+        import_all_from_file(c, 'tests/testdata/example.gz')
+
+        path = str(tmp_path / 'mirror.db')
+        with Mirror(c, path) as m:
+            stats = m.sync()
+            assert stats.results == 1
+            assert stats.tests == 4
+            assert stats.deleted == 0
+
+            r = m.get(20220821222306)
+            assert isinstance(r, Result)
+            assert r.status == 'completed'
+            assert r.tests == 4
+
+            trs = m.list_tests(20220821222306)
+            assert [tr.seq for tr in trs] == [1, 2, 3, 4]
+            assert isinstance(trs[0], TestResult)
+            assert trs[0].name == 'start'
+
+            assert [r.id for r in m.list_results(status='completed')] == [20220821222306]
+            assert m.list_results(status='running') == []
+            assert m.get(1) is None
+
+            stats = m.sync()
+            assert stats.results == 0
+
+            r.starred = not r.starred
+            c.results.edit(r)
+            stats = m.sync()
+            assert stats.results == 1
+            assert m.get(20220821222306).starred == r.starred
+
+        with Mirror(c, path) as m:
+            assert m.sync().results == 0
+
+            c.results.delete(20220821222306)
+            stats = m.sync(prune=True)
+            assert stats.deleted == 1
+            assert m.get(20220821222306) is None
+            assert m.list_tests(20220821222306) == []
@@ -3,7 +3,10 @@
 # All Rights Reserved.
 #
 
+from csv import DictReader
+from io import StringIO
 import shutil
+import tarfile
 import time
 
 import pytest
@@ -48,6 +51,18 @@ class TestResults:
         csv = c.results.list_csv()
         assert '20220821222306,' in csv
 
+    def test_iter_csv(self, c):
+        import_all_from_file(c, 'tests/testdata/example.gz')
+
+        rows = list(c.results.iter_csv())
+        assert rows == list(DictReader(StringIO(c.results.list_csv(), newline='')))
+        assert '20220821222306' in rows[0].values()
+
+        rows = list(c.results.iter_csv(typed=True))
+        assert len(rows) == 1
+        assert type(rows[0]).__name__ == 'ResultRow'
+        assert 20220821222306 in rows[0]
+
     def test_get(self, c):
         import_all_from_file(c, 'tests/testdata/example.gz')
 
@@ -507,6 +522,24 @@ buddy::start_proc my_start_proc
 
         r = c.results.get(20220821222306)
 
+    def test_export_dest(self, c, tmp_path):
+        import_all_from_file(c, 'tests/testdata/example.gz')
+
+        r = c.results.get(20220821222306)
+
+        progress = []
+        (path, filename) = c.results.export(r.id, dest=str(tmp_path), progress=lambda n, t: progress.append(n))
+        assert path == '{}/{}'.format(tmp_path, filename)
+        assert len(progress) > 0
+        with open(path, 'rb') as fd:
+            assert len(fd.read()) == progress[-1]
+
+        c.results.delete(r.id)
+
+        import_all_from_file(c, path)
+
+        r = c.results.get(20220821222306)
+
     def test_bulk_export(self, c, tmp_path):
         import_all_from_file(c, 'tests/testdata/example.gz')
 
@@ -666,6 +699,31 @@ buddy::start_proc my_start_proc
         with open(filename, 'wb') as fd:
             shutil.copyfileobj (b, fd)
 
+    def test_sync_logdir(self, c, tmp_path):
+        import_all_from_file(c, 'tests/testdata/example.gz')
+
+        r = c.results.get(20220821222306)
+
+        sync = c.results.sync_logdir(r.id, str(tmp_path), workers=4)
+        assert len(sync.files) == 32
+        assert len(sync.downloaded) == 32
+        assert len(sync.errors) == 0
+        assert (tmp_path / 'CDROUTER-INSTALL').stat().st_size == 212
+
+        sync = c.results.sync_logdir(r.id, str(tmp_path))
+        assert len(sync.skipped) == 32
+        assert sync.nbytes == 0
+
+        with open(str(tmp_path / 'CDROUTER-INSTALL'), 'r+b') as fd:
+            fd.truncate(100)
+        (tmp_path / 'stale').write_text('stale')
+
+        sync = c.results.sync_logdir(r.id, str(tmp_path), delete=True)
+        assert [f.name for f in sync.downloaded] == ['CDROUTER-INSTALL']
+        assert len(sync.skipped) == 31
+        assert (tmp_path / 'CDROUTER-INSTALL').stat().st_size == 212
+        assert sync.deleted == [str(tmp_path / 'stale')]
+
     def test_download_logdir_archive(self, c, tmp_path):
         import_all_from_file(c, 'tests/testdata/example.gz')
 
@@ -677,6 +735,19 @@ buddy::start_proc my_start_proc
         with open(filename, 'wb') as fd:
             shutil.copyfileobj (b, fd)
 
+    def test_download_logdir_archive_dest(self, c, tmp_path):
+        import_all_from_file(c, 'tests/testdata/example.gz')
+
+        r = c.results.get(20220821222306)
+
+        filename = '{}/{}'.format(tmp_path, 'logdir.tgz')
+        with open(filename, 'wb') as fd:
+            (dest, _) = c.results.download_logdir_archive(r.id, format='tgz', dest=fd)
+            assert dest is fd
+
+        with tarfile.open(filename) as tar:
+            assert len(tar.getnames()) > 0
+
     @pytest.mark.skipif(cdrouter_version() <= (13, 14, 1), reason="list metrics endpoint broken in 13.14.1")
     def test_list_metrics(self, c):
         import_all_from_file(c, 'tests/testdata/example5.gz')
@@ -720,6 +791,30 @@ buddy::start_proc my_start_proc
         with pytest.raises(CDRouterError, match='no such result'):
             c.results.list_metrics(999999)
 
+    @pytest.mark.skipif(cdrouter_version() <= (13, 14, 1), reason="list metrics endpoint broken in 13.14.1")
+    def test_list_metrics_arrays(self, c):
+        numpy = pytest.importorskip('numpy')
+        pytest.importorskip('pandas')
+
+        import_all_from_file(c, 'tests/testdata/example5.gz')
+
+        r = c.results.get(20230310111705)
+
+        metrics, _ = c.results.list_metrics(r.id, filter=[field('metric').eq('client_bandwidth')], limit='none')
+        arrays = c.results.list_metrics_arrays(r.id, filter=[field('metric').eq('client_bandwidth')], limit='none')
+        assert len(arrays['seq']) == 40
+        assert arrays['seq'].dtype == numpy.int64
+        assert arrays['created'].dtype == numpy.dtype('datetime64[us]')
+        assert list(arrays['seq']) == [m.seq for m in metrics]
+        assert list(arrays['filename']) == [m.filename for m in metrics]
+
+        df = c.results.list_metrics_frame(r.id, limit='none')
+        assert len(df) == 80
+        assert df['test_name'][0] == 'perf_multi_1'
+
+        with pytest.raises(CDRouterError, match='no such result'):
+            c.results.list_metrics_arrays(999999)
+
     def test_get_test_metric(self, c):
         import_all_from_file(c, 'tests/testdata/example3.gz')
 
@@ -747,6 +842,28 @@ buddy::start_proc my_start_proc
         with pytest.raises(CDRouterError, match='no such metric'):
             c.results.get_test_metric(r.id, 'invalid', 'bandwidth')
 
+    def test_get_test_metric_arrays(self, c):
+        import_all_from_file(c, 'tests/testdata/example3.gz')
+
+        r = c.results.get(20220721151446)
+
+        numpy = pytest.importorskip('numpy')
+        pytest.importorskip('pandas')
+
+        arrays = c.results.get_test_metric_arrays(r.id, 'perf_multi_4', 'bandwidth')
+        assert len(arrays['value']) == 23
+        assert arrays['timestamp'].dtype == numpy.dtype('datetime64[us]')
+        assert arrays['value'].dtype == numpy.float64
+        assert arrays['value'][0] == 279.455
+        assert arrays['streams'][0] == 128
+
+        df = c.results.get_test_metric_frame(r.id, 'perf_multi_4', 'bandwidth')
+        assert len(df) == 23
+        assert df['value'][0] == 279.455
+
+        with pytest.raises(CDRouterError, match='no such metric'):
+            c.results.get_test_metric_arrays(r.id, 'invalid', 'bandwidth')
+
     def test_get_test_metric_csv(self, c):
         import_all_from_file(c, 'tests/testdata/example3.gz')
 
@@ -0,0 +1,234 @@
+#
+# Copyright (c) 2026 by QA Cafe.
+# All Rights Reserved.
+#
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Thread
+
+import pytest
+import requests
+from requests.exceptions import ChunkedEncodingError, ConnectionError as RequestsConnectionError, ConnectTimeout, \
+    ReadTimeout, InvalidURL
+
+from cdrouter.cdrouter import CDRouter, CDRouterError
+from cdrouter.cdr_retry import RetryPolicy
+from cdrouter.instrumentation import Instrument
+
+def response(status, headers=None):
+    resp = requests.models.Response()
+    resp.status_code = status
+    resp.headers.update(headers or {})
+    return resp
+
+BODY = bytes(range(256)) * 64
+
+class Flaky(BaseHTTPRequestHandler):
+    # answers each request with the next of the server's script:
+    # a status code, (status code, headers), 'truncate' to send half
+    # of BODY and hang up, 'range' to honour a Range header,
+    # 'bad-range' to answer it from the wrong offset and
+    # 'range-truncate' to honour it but hang up halfway
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args): # pylint: disable=redefined-builtin
+        pass
+
+    def _answer(self):
+        self.rfile.read(int(self.headers.get('content-length') or 0))
+        self.server.seen.append((self.command, dict((k.lower(), v) for k, v in self.headers.items())))
+        action = self.server.script.pop(0)
+        status, headers, body = 200, {'etag': '"1"'}, BODY
+        if isinstance(action, int):
+            status, body = action, b'{"error": "busy"}' if action != 200 else b'{"data": "ok"}'
+        elif isinstance(action, tuple):
+            status, headers = action
+            body = b'{"error": "busy"}'
+        elif action in ('range', 'bad-range', 'range-truncate') and 'range' in self.headers:
+            start = int(self.headers['range'][len('bytes='):-1])
+            status, body = 206, BODY[start:]
+            if action == 'bad-range':
+                start = 0
+            headers = dict(headers, **{'content-range': 'bytes {}-{}/{}'.format(start, len(BODY)-1, len(BODY))})
+
+        self.send_response(status)
+        for k, v in headers.items():
+            self.send_header(k, v)
+        self.send_header('content-length', str(len(body)))
+        self.end_headers()
+        if action in ('truncate', 'range-truncate'):
+            self.wfile.write(body[:len(body)//2])
+            self.close_connection = True
+            return
+        self.wfile.write(body)
+
+    do_GET = do_POST = _answer
+
+@pytest.fixture
+def flaky():
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), Flaky)
+    httpd.daemon_threads = True
+    httpd.script = []
+    httpd.seen = []
+    Thread(target=httpd.serve_forever, daemon=True).start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+class Recorded(RetryPolicy):
+    # records the delays instead of sleeping
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.delays = []
+
+    def sleep(self, attempt, resp=None):
+        self.delays.append(self.delay(attempt, resp=resp))
+
+class Records(Instrument):
+    def __init__(self):
+        self.records = []
+
+    def after_request(self, record):
+        self.records.append(record)
+
+def client(httpd, **kwargs):
+    policy = Recorded(backoff=1, jitter=False, **kwargs)
+    records = Records()
+    c = CDRouter('http://127.0.0.1:{}'.format(httpd.server_address[1]), token='x',
+                 retry_policy=policy, instruments=[records])
+    return c, policy, records
+
+class TestRetry:
+    def test_idempotent(self):
+        p = RetryPolicy()
+        assert p.idempotent('GET')
+        assert p.idempotent('get', {'bulk': 'export'})
+        assert not p.idempotent('POST')
+        assert not p.idempotent('POST', {'bulk': 'delete'})
+        assert not p.idempotent('PATCH')
+
+        p = RetryPolicy(bulk=('edit', 'delete'))
+        assert p.idempotent('POST', {'bulk': 'delete'})
+        assert not p.idempotent('POST', {'bulk': 'copy'})
+        assert not p.idempotent('POST')
+
+    def test_should_retry(self):
+        p = RetryPolicy(total=2)
+        assert p.should_retry(0, 'GET', resp=response(503))
+        assert p.should_retry(1, 'GET', resp=response(502))
+        assert not p.should_retry(2, 'GET', resp=response(503))
+        assert not p.should_retry(0, 'GET', resp=response(500))
+        assert not p.should_retry(0, 'GET', resp=response(404))
+        assert not p.should_retry(0, 'GET', resp=response(200))
+        assert not p.should_retry(0, 'POST', resp=response(503))
+
+        assert p.should_retry(0, 'GET', error=RequestsConnectionError())
+        assert p.should_retry(0, 'GET', error=ReadTimeout())
+        assert not p.should_retry(0, 'GET', error=InvalidURL())
+        assert not p.should_retry(0, 'POST', error=RequestsConnectionError())
+        assert not p.should_retry(0, 'POST', error=ReadTimeout())
+        # never reached the CDRouter system
+        assert p.should_retry(0, 'POST', error=ConnectTimeout())
+
+        assert not RetryPolicy(total=0).should_retry(0, 'GET', resp=response(503))
+
+    def test_delay(self):
+        p = RetryPolicy(backoff=1, max_backoff=5, jitter=False)
+        assert [p.delay(n) for n in range(5)] == [1, 2, 4, 5, 5]
+
+        p = RetryPolicy(backoff=1, max_backoff=5)
+        for n in range(5):
+            assert 0 <= p.delay(n) <= min(2 ** n, 5)
+
+        assert p.delay(0, resp=response(503, {'retry-after': '3'})) == 3
+        assert p.delay(0, resp=response(503, {'retry-after': '120'})) == 5
+        assert p.delay(0, resp=response(503, {'retry-after': 'Wed, 21 Oct 2015 07:28:00 GMT'})) == 0
+        assert p.delay(0, resp=response(503, {'retry-after': 'soon'})) <= 1
+        assert RetryPolicy(backoff=1, jitter=False, retry_after=False).delay(0, resp=response(503, {'retry-after': '3'})) == 1
+
+    def test_send(self, flaky):
+        c, policy, records = client(flaky)
+        flaky.script = [503, 502, 200]
+        assert c.get('system/hostname/').status_code == 200
+        assert len(flaky.seen) == 3
+        assert policy.delays == [1, 2]
+        assert records.records[-1].retries == 2
+        assert records.records[-1].status == 200
+
+        flaky.script = [(503, {'retry-after': '3'}), 200]
+        assert c.get('system/hostname/').status_code == 200
+        assert policy.delays == [1, 2, 3]
+        assert records.records[-1].retries == 1
+
+    def test_send_gives_up(self, flaky):
+        c, policy, records = client(flaky, total=2)
+        flaky.script = [503, 503, 503]
+        with pytest.raises(CDRouterError):
+            c.get('system/hostname/')
+        assert len(flaky.seen) == 3
+        assert records.records[-1].retries == 2
+        assert records.records[-1].status == 503
+
+    def test_send_not_idempotent(self, flaky):
+        c, policy, records = client(flaky)
+        flaky.script = [503, 200]
+        with pytest.raises(CDRouterError):
+            c.post('configs/', json={})
+        assert [method for method, _ in flaky.seen] == ['POST']
+        assert policy.delays == []
+        assert records.records[-1].retries == 0
+
+    def test_resume(self, flaky):
+        c, policy, records = client(flaky)
+        flaky.script = ['truncate', 'range']
+        b, _ = c.download(c.get('results/1/', stream=True))
+        assert b.getvalue() == BODY
+        assert len(flaky.seen) == 2
+        assert flaky.seen[1][1]['range'] == 'bytes={}-'.format(len(BODY)//2)
+        assert flaky.seen[1][1]['if-range'] == '"1"'
+        assert policy.delays == [1]
+        # the resumed request is counted as a retry
+        assert records.records[-1].retries == 1
+
+    def test_resume_ignored(self, flaky):
+        # the whole body is sent again, with a 200
+        c, _, _ = client(flaky)
+        flaky.script = ['truncate', 'full']
+        b, _ = c.download(c.get('results/1/', stream=True))
+        assert b.getvalue() == BODY
+
+    def test_resume_fails(self, flaky):
+        c, _, _ = client(flaky)
+        flaky.script = ['truncate', 'bad-range']
+        with pytest.raises(ChunkedEncodingError):
+            c.download(c.get('results/1/', stream=True))
+
+        c, _, _ = client(flaky, total=1)
+        flaky.script = ['truncate', 'truncate']
+        with pytest.raises(ChunkedEncodingError):
+            c.download(c.get('results/1/', stream=True))
+
+        c, _, _ = client(flaky, resume=False)
+        flaky.script = ['truncate']
+        with pytest.raises(ChunkedEncodingError):
+            c.download(c.get('results/1/', stream=True))
+
+    def test_resume_ranged(self, flaky):
+        # resumed from the range's start plus what was written
+        c, _, _ = client(flaky)
+        flaky.script = ['range-truncate', 'range']
+        resp = c.get('results/1/', headers={'range': 'bytes=1000-'}, stream=True)
+        b, _ = c.download(resp)
+        assert b.getvalue() == BODY[1000:]
+        assert flaky.seen[1][1]['range'] == 'bytes={}-'.format(1000 + (len(BODY)-1000)//2)
+
+        # the whole file is never appended to a partial range
+        flaky.script = ['range-truncate', 'full']
+        resp = c.get('results/1/', headers={'range': 'bytes=1000-'}, stream=True)
+        with pytest.raises(ChunkedEncodingError):
+            c.download(resp)
+
+        flaky.script = ['range-truncate', 'bad-range']
+        resp = c.get('results/1/', headers={'range': 'bytes=1000-'}, stream=True)
+        with pytest.raises(ChunkedEncodingError):
+            c.download(resp)
@@ -3,6 +3,9 @@
 # All Rights Reserved.
 #
 
+from csv import DictReader
+from io import StringIO
+
 import pytest
 
 from cdrouter.cdrouter import CDRouterError
@@ -30,6 +33,17 @@ class TestTestResults:
         csv = c.tests.list_csv(20220821222306)
         assert 'cdrouter_app_14,' in csv
 
+    def test_iter_csv(self, c):
+        import_all_from_file(c, 'tests/testdata/example.gz')
+
+        rows = list(c.tests.iter_csv(20220821222306))
+        assert rows == list(DictReader(StringIO(c.tests.list_csv(20220821222306), newline='')))
+        assert any('cdrouter_app_14' in r.values() for r in rows)
+
+        rows = list(c.tests.iter_csv(20220821222306, typed=True))
+        assert len(rows) == len(list(c.tests.iter_list(20220821222306)))
+        assert any('cdrouter_app_14' in r for r in rows)
+
     def test_get(self, c):
         import_all_from_file(c, 'tests/testdata/example.gz')
 
@@ -145,6 +159,16 @@ class TestTestResults:
         assert lines[142].proto == 'ARP'
         assert lines[142].info == 'Who is 5.5.5.1, tell 5.5.5.1'
 
+        concurrent = list(c.tests.iter_list_log(20220821222306, 1, limit=10, concurrency=4))
+        assert [l.line for l in concurrent] == [l.line for l in lines]
+        assert concurrent[142].info == 'Who is 5.5.5.1, tell 5.5.5.1'
+
+        concurrent = list(c.tests.iter_list_log(20220821222306, 1, limit=10, offset=100, concurrency=4))
+        assert [l.line for l in concurrent] == [l.line for l in lines[100:]]
+
+        concurrent = list(c.tests.iter_list_log(20220821222306, 1, limit='none', concurrency=4))
+        assert [l.line for l in concurrent] == [l.line for l in lines]
+
     def test_get_log_plaintext(self, c):
         import_all_from_file(c, 'tests/testdata/example.gz')
 
@@ -243,6 +267,35 @@ class TestTestResults:
         with pytest.raises(ValueError, match='unknown metric invalid'):
             c.tests.get_test_metric(r.id, 2, 'invalid')
 
+    def test_get_test_metric_arrays(self, c):
+        import_all_from_file(c, 'tests/testdata/example5.gz')
+
+        r = c.results.get(20230310111705)
+
+        numpy = pytest.importorskip('numpy')
+        pytest.importorskip('pandas')
+
+        metrics = c.tests.get_test_metric(r.id, 2, 'bandwidth')
+        arrays = c.tests.get_test_metric_arrays(r.id, 2, 'bandwidth')
+        assert len(arrays['bandwidth']) == 10
+        assert arrays['timestamp'].dtype == numpy.dtype('datetime64[us]')
+        assert arrays['bandwidth'].dtype == numpy.float64
+        assert arrays['bandwidth'][0] == 9416.015
+        assert arrays['streams'][0] == 10
+        assert arrays['protocol'][0] == 'TCP'
+        assert list(arrays['bandwidth']) == [m.bandwidth for m in metrics]
+
+        arrays = c.tests.get_test_metric_arrays(r.id, 2, 'client_bandwidth')
+        assert arrays['rates'].shape == (33, 10)
+        assert arrays['rates'][0][0] == 941.608
+
+        df = c.tests.get_test_metric_frame(r.id, 2, 'bandwidth')
+        assert len(df) == 10
+        assert df['bandwidth'][0] == 9416.015
+
+        with pytest.raises(ValueError, match='unknown metric invalid'):
+            c.tests.get_test_metric_arrays(r.id, 2, 'invalid')
+
     def test_get_test_metric_csv(self, c):
         import_all_from_file(c, 'tests/testdata/example5.gz')
 
@@ -55,6 +55,42 @@ class TestTestsuites:
 
         c.testsuites.search('asdfasdfasdfaasflkjhasdflkjasdflk')
 
+    def test_catalog(self, c):
+        catalog = c.testsuites.catalog()
+        assert c.testsuites.catalog() is catalog
+        assert catalog.release == c.testsuites.info().release
+        assert catalog.refresh() is False
+
+        test = catalog.get_test('cdrouter_basic_1')
+        assert test.name == 'cdrouter_basic_1'
+        assert test.group == 'CDRouter'
+        assert test in catalog.tests_in_group(test.group)
+        assert test in catalog.tests_in_module(test.module)
+        assert catalog.get_module(test.module).name == test.module
+
+        testvar = catalog.get_testvar('lanIp')
+        assert testvar.name == 'lanip'
+        for name in test.testvars:
+            assert test in catalog.tests_using_testvar(name)
+
+        wan_mode = catalog.get_testvar('wanMode')
+        assert len(wan_mode.keywords) > 0
+        assert wan_mode in catalog.testvars_with_keyword(wan_mode.keywords[0])
+
+        tests = catalog.search('cdrouter_basic_')
+        assert len(tests) > 0
+        assert all(t.name.startswith('cdrouter_basic_') for t in tests)
+        assert [t.name for t in catalog.search(r'^cdrouter_basic_\d+$', regex=True)] == [t.name for t in tests]
+        assert len(catalog.search('CDROUTER_BASIC_', ignorecase=True)) == len(tests)
+        assert len(catalog.search('ipv6', kind='groups', ignorecase=True)) > 0
+
+        with pytest.raises(CDRouterError, match='no such test'):
+            catalog.get_test('foo')
+        with pytest.raises(ValueError, match='unknown kind'):
+            catalog.search('foo', kind='foo')
+
+        assert catalog.refresh(force=True) is True
+
     def test_update(self, c):
         c.testsuites.update()
 
@@ -0,0 +1,183 @@
+#
+# Copyright (c) 2026 by QA Cafe.
+# All Rights Reserved.
+#
+
+import io
+
+import requests
+from requests.exceptions import ConnectionError as RequestsConnectionError
+
+from cdrouter.cdrouter import CDRouterError
+from cdrouter.imports import Import, Request, Resource, Response
+from cdrouter.transfer import Transfer
+
+from .utils import my_cdrouter, my_c, import_all_from_file # pylint: disable=unused-import
+
+def error(status, message):
+    resp = requests.models.Response()
+    resp.status_code = status
+    return CDRouterError(message, response=resp)
+
+class Src:
+    # source system whose exports are the 6 bytes 'export'
+    base = 'http://src'
+    token = 'x'
+    insecure = False
+    CHUNK_SIZE = 4
+
+    def get(self, path, params=None, stream=None): # pylint: disable=unused-argument
+        resp = requests.models.Response()
+        resp.status_code = 200
+        resp.headers['content-length'] = '6'
+        resp.raw = io.BytesIO(b'export')
+        resp.url = path
+        return resp
+
+    def filename(self, resp, filename=None): # pylint: disable=unused-argument
+        return filename
+
+class Scripted(Transfer):
+    # transfer to a destination system which answers the streamed or
+    # URL imports in errors, keyed by ('stream' or 'url', id), with
+    # those errors
+    def __init__(self, errors, **kwargs):
+        super().__init__(Src(), None, **kwargs)
+        self.errors = errors
+        self.staged = []
+
+    def _exists(self, resource, id): # pylint: disable=redefined-builtin
+        return False
+
+    def _stage_url(self, resource, id): # pylint: disable=redefined-builtin
+        self.staged.append(('url', id))
+        if ('url', id) in self.errors:
+            raise self.errors[('url', id)]
+        return Import(id=len(self.staged))
+
+    def _stage_stream(self, body):
+        assert b'\r\n\r\nexport\r\n' in b''.join(body)
+        id = int(body.resp.url.split('/')[1]) # pylint: disable=redefined-builtin
+        self.staged.append(('stream', id))
+        if ('stream', id) in self.errors:
+            raise self.errors[('stream', id)]
+        return Import(id=len(self.staged))
+
+    def _commit(self, resource, staged, replace_existing, tags):
+        return True
+
+class Imports:
+    # destination system's imports, whose commit request has a result,
+    # a config already on the system and a new package
+    def __init__(self):
+        self.committed = None
+        self.deleted = []
+
+    def get_commit_request(self, id): # pylint: disable=redefined-builtin,unused-argument
+        return Request(results={'r1': Resource()},
+                       configs={'c1': Resource(existing_id=7)},
+                       packages={'p1': Resource()})
+
+    def commit(self, id, impreq): # pylint: disable=redefined-builtin,unused-argument
+        self.committed = impreq
+        for r in ('results', 'configs', 'packages'):
+            for x in getattr(impreq, r).values():
+                if x.should_import:
+                    x.response = Response(imported=True)
+        return impreq
+
+    def delete(self, id): # pylint: disable=redefined-builtin
+        self.deleted.append(id)
+
+class Dst:
+    def __init__(self):
+        self.imports = Imports()
+
+class TestTransfer:
+    def test_stream(self):
+        t = Scripted({('stream', 2): error(404, 'no such result')}, workers=1)
+        report = t.results([1, 2, 3])
+        assert [(r.id, r.method, r.nbytes) for r in report.imported] == [(1, 'stream', 6), (3, 'stream', 6)]
+        # refused by the destination system, so not retried by URL
+        assert [r.id for r in report.errors] == [2]
+        assert t.staged == [('stream', 1), ('stream', 2), ('stream', 3)]
+        assert report.nbytes == 12
+
+        t = Scripted({}, workers=1, via_url=True)
+        report = t.results([1])
+        assert [(r.id, r.method, r.nbytes) for r in report.imported] == [(1, 'url', 0)]
+        assert t.staged == [('url', 1)]
+
+    def test_url_fallback(self):
+        t = Scripted({('stream', 1): RequestsConnectionError('connection reset'),
+                      ('stream', 2): error(413, 'request entity too large')}, workers=1)
+        report = t.results([1, 2, 3])
+        assert [(r.id, r.method, r.nbytes) for r in report.imported] == [(1, 'url', 0), (2, 'url', 0), (3, 'stream', 6)]
+        assert t.staged == [('stream', 1), ('url', 1), ('stream', 2), ('url', 2), ('stream', 3)]
+
+        t = Scripted({('stream', 1): RequestsConnectionError('connection reset')}, workers=1, via_url=False)
+        report = t.results([1])
+        assert [r.id for r in report.errors] == [1]
+        assert t.staged == [('stream', 1)]
+
+        # a gateway error means the destination system cannot reach
+        # the source system, so there is no fallback for the rest of
+        # the call
+        t = Scripted({('stream', 1): RequestsConnectionError('connection reset'),
+                      ('url', 1): error(502, 'bad gateway'),
+                      ('stream', 2): RequestsConnectionError('connection reset')}, workers=1)
+        report = t.results([1, 2])
+        assert [r.id for r in report.errors] == [1, 2]
+        assert t.staged == [('stream', 1), ('url', 1), ('stream', 2)]
+
+        t.staged = []
+        t.results([2])
+        assert t.staged == [('stream', 2), ('url', 2)]
+
+    def test_commit(self):
+        t = Transfer(Src(), Dst())
+        assert t._commit('results', Import(id=1), False, ['x']) # pylint: disable=protected-access
+        impreq = t.dst.imports.committed
+        assert impreq.results['r1'].should_import
+        assert impreq.packages['p1'].should_import
+        # already on the destination system
+        assert not impreq.configs['c1'].should_import
+        assert impreq.tags == ['x']
+
+        assert t._commit('results', Import(id=1), True, None) # pylint: disable=protected-access
+        impreq = t.dst.imports.committed
+        assert impreq.configs['c1'].should_import
+        assert impreq.replace_existing
+
+    def test_results_via_url(self, c):
+        import_all_from_file(c, 'tests/testdata/example.gz')
+
+        report = Transfer(c, c, via_url=True).results([20220821222306], replace_existing=True)
+        assert report.errors == []
+        assert [(r.id, r.method) for r in report.imported] == [(20220821222306, 'url')]
+        assert report.nbytes == 0
+
+    def test_results(self, c):
+        import_all_from_file(c, 'tests/testdata/example.gz')
+
+        transferred = []
+        t = Transfer(c, c, workers=2, via_url=False)
+
+        report = t.results([20220821222306], progress=transferred.append)
+        assert [r.id for r in report.skipped] == [20220821222306]
+        assert report.imported == []
+        assert report.errors == []
+        assert transferred == report.results
+        assert report.results[0].method is None
+        assert report.nbytes == 0
+
+        report = t.results([20220821222306], replace_existing=True, tags=['transferred'])
+        assert [r.id for r in report.imported] == [20220821222306]
+        assert report.results[0].method == 'stream'
+        assert report.nbytes > 0
+        assert 'transferred' in c.results.get(20220821222306).tags
+
+        report = t.results([1, 20220821222306], replace_existing=True)
+        assert [r.id for r in report.errors] == [1]
+        assert isinstance(report.errors[0].error, CDRouterError)
+        assert [r.id for r in report.imported] == [20220821222306]
@@ -45,6 +45,7 @@ class TestUsers:
             c.users.create(u)
 
         assert len(list(c.users.iter_list(limit=1))) == 5
+        assert len(list(c.users.iter_list(limit=1, prefetch=2))) == 5
 
     def test_get(self, c):
         u = c.users.get(1)
@@ -0,0 +1,143 @@
+#
+# Copyright (c) 2026 by QA Cafe.
+# All Rights Reserved.
+#
+
+import asyncio
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Thread
+import time
+
+import pytest
+
+from cdrouter import AsyncCDRouter, CDRouter
+from cdrouter.cdr_error import CDRouterError
+from cdrouter.jobs import Job
+from cdrouter.results import Progress, Result
+from cdrouter.watcher import ResultWatcher, AsyncResultWatcher
+
+from .utils import my_cdrouter, my_c, import_all_from_file # pylint: disable=unused-import
+
+def launch(c):
+    import_all_from_file(c, 'tests/testdata/example2.gz')
+
+    package = c.packages.get_by_name('example')
+    j = c.jobs.launch(Job(package_id=package.id))
+
+    while j.result_id is None:
+        time.sleep(1)
+        j = c.jobs.get(j.id)
+    return j.result_id
+
+class Deleted(BaseHTTPRequestHandler):
+    # answers the first request with a body that is not JSON, then as
+    # if the result had been deleted
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args): # pylint: disable=redefined-builtin
+        pass
+
+    def do_GET(self): # pylint: disable=invalid-name
+        self.server.requests += 1
+        if self.server.requests == 1:
+            status, body = 200, b'garbage'
+        else:
+            status, body = 404, b'{"error": "no such result"}'
+        self.send_response(status)
+        self.send_header('content-type', 'application/json')
+        self.send_header('content-length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+@pytest.fixture
+def deleted():
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), Deleted)
+    httpd.daemon_threads = True
+    httpd.requests = 0
+    Thread(target=httpd.serve_forever, daemon=True).start()
+    yield 'http://127.0.0.1:{}'.format(httpd.server_address[1])
+    httpd.shutdown()
+    httpd.server_close()
+
+def assert_deleted(errors):
+    # the bad body is reported and polled again, the 404 ends the watch
+    assert len(errors) == 2
+    assert not isinstance(errors[0], CDRouterError)
+    assert isinstance(errors[1], CDRouterError)
+    assert errors[1].response.status_code == 404
+
+class TestResultWatcher:
+    def test_watch(self, c):
+        result_id = launch(c)
+
+        events = []
+        with ResultWatcher(c, workers=2) as w:
+            for event in w.EVENTS:
+                w.on(event, lambda id, obj, event=event: events.append((event, id, obj)))
+            w.watch(result_id)
+            assert w.watching == [result_id]
+            assert w.wait(timeout=300)
+
+        assert w.watching == []
+        assert ('error', result_id) not in [(e, id) for e, id, _ in events]
+        assert any(e == 'progress' and isinstance(obj, Progress) for e, _, obj in events)
+
+        (event, id, r) = events[-1]
+        assert event == 'complete'
+        assert id == result_id
+        assert isinstance(r, Result)
+        assert r.status == 'completed'
+
+    def test_deleted(self, deleted):
+        errors = []
+        with ResultWatcher(CDRouter(deleted, token='x'), workers=1, min_interval=0.01) as w:
+            w.on('error', lambda id, e: errors.append(e))
+            w.watch(1)
+            assert w.wait(timeout=10)
+        assert_deleted(errors)
+
+    def test_async_deleted(self, deleted):
+        pytest.importorskip('aiohttp')
+        errors = []
+
+        async def main():
+            async with AsyncCDRouter(deleted, token='x') as ac:
+                w = AsyncResultWatcher(ac, min_interval=0.01)
+                w.on('error', lambda id, e: errors.append(e))
+                w.watch(1)
+                await asyncio.wait_for(w.run(), 10)
+                return w.watching
+
+        assert asyncio.run(main()) == []
+        assert_deleted(errors)
+
+    def test_on(self, c):
+        w = ResultWatcher(c)
+
+        @w.on('complete')
+        def complete(id, r): # pylint: disable=unused-argument
+            pass
+
+        assert w.handlers['complete'] == [complete]
+
+        with pytest.raises(ValueError, match='unknown event'):
+            w.on('finished', complete)
+
+    def test_async(self, c):
+        result_id = launch(c)
+
+        events = []
+
+        async def complete(id, r):
+            events.append((id, r.status))
+
+        async def main():
+            async with AsyncCDRouter(c.base, insecure=c.insecure) as ac:
+                w = AsyncResultWatcher(ac)
+                w.on('complete', complete)
+                w.watch(result_id)
+                await asyncio.wait_for(w.run(), 300)
+                return w.watching
+
+        assert asyncio.run(main()) == []
+        assert events == [(result_id, 'completed')]